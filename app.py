@@ -1,101 +1,380 @@
+import io
 import os
-from flask import Flask, jsonify, request
+import re
+import csv
+import hashlib
+import contextlib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from flask import Flask, jsonify, request, abort, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
 import pandas as pd
+import numpy as np
 from flask_cors import CORS
-import math
+from werkzeug.exceptions import HTTPException
+from dataset_cache import load_table
+from symbols import encode_dataset, symbol_codes, decode_symbols
+from season_registry import create_registry, get_season, replace_season, pin_season, season_names, latest_season, registry_version, registry_status, loaded_season, read_season
+from live_store import create_store, append_rows, store_frame, store_records
+from response_cache import create_cache, cache_key, entity_tag, count, cache_get, cache_put, record_render, cache_stats
+from payloads import json_default, frame_records, encode_body, choose_encoding, encoding_tag, ENCODINGS
+from metrics import create_metrics, stage, observe, request_started, request_finished, request_closed, render_metrics
+from shared_dataset import default_shared_dir, code_fingerprint, shared_bundle
+from derived_columns import PHASES, INNINGS_OVERS, derived_columns
+
+class PayloadJSONProvider(DefaultJSONProvider):
+    # numpy and pandas scalars go through typed converters; encoding time is added up per request
+    default = staticmethod(json_default)
+
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        body = super().dumps(obj, **kwargs)
+        seconds = time.perf_counter() - start
+        if has_request_context():
+            g.serialize_seconds = g.get('serialize_seconds', 0.0) + seconds
+        if metrics["enabled"]:
+            observe(metrics, metrics["stages"], "serialize", seconds)
+        return body
+
 
 app = Flask(__name__)
+app.json = PayloadJSONProvider(app)
 CORS(app)  # This will allow all origins by default
 
-# Load CSV files into memory
-match_history = pd.read_csv('ipl_2024_matches.csv')
-ball_by_ball = pd.read_csv('ipl_2024_deliveries.csv')
-
-
-@app.route('/points-table', methods=['GET'])
-def points_table():
-    # Filter matches up to match_no 70 (excluding playoffs)
-    matches = match_history[match_history['match_no'] <= 70][['match_no', 'team1', 'team2', 'winning_team']]
-
-    points_table = {}
-
-    for _, match in matches.iterrows():
-        team1, team2, winner = match['team1'], match['team2'], match['winning_team']
-
-        # Initialize teams in the points table
-        for team in [team1, team2]:
-            if team not in points_table:
-                points_table[team] = {
-                    'Played': 0, 'Wins': 0, 'Losses': 0, 'NR': 0, 'Points': 0,
-                    'Runs Scored': 0, 'Overs Batted': 0, 'Runs Conceded': 0, 'Overs Bowled': 0
-                }
-
-        # Update matches played
-        points_table[team1]['Played'] += 1
-        points_table[team2]['Played'] += 1
-
-        # Assign points
-        if winner != 'TIE':
-            points_table[winner]['Wins'] += 1
-            points_table[winner]['Points'] += 2
-            loser = team1 if winner == team2 else team2
-            points_table[loser]['Losses'] += 1
-        else:
-            points_table[team1]['NR'] += 1
-            points_table[team2]['NR'] += 1
-            points_table[team1]['Points'] += 1
-            points_table[team2]['Points'] += 1
-
-    # Filter ball-by-ball data for match_no <= 70
-    ball_cols = ['match_no', 'batting_team', 'bowling_team', 'runs_of_bat', 'extras', 'wide', 'noballs', 'over', 'byes', 'legbyes']
-    balls_df = ball_by_ball[ball_by_ball['match_no'] <= 70][ball_cols].copy()
-
-    # Calculate total runs (runs_of_bat + extras)
-    balls_df['total_runs'] = balls_df['runs_of_bat'] + balls_df['extras']
-
-    # Count valid balls (excluding wides & no-balls)
-    balls_df['valid_ball'] = ((balls_df['wide'] == 0)) & ((balls_df['noballs'] == 0) |  (balls_df['byes'] > 0) | (balls_df['legbyes'] > 0))
-    # Group by match and team for batting stats
-    batting_stats = balls_df.groupby(['match_no', 'batting_team']).agg(
-        total_runs_scored=('total_runs', 'sum'),
-        valid_balls_faced=('valid_ball', 'sum')
+# Directory holding the ipl_<season>_matches.csv / ipl_<season>_deliveries.csv pairs
+DATA_DIR = os.environ.get('IPL_DATA_DIR', os.path.dirname(os.path.abspath(__file__)))
+# Loaded seasons beyond this many megabytes are evicted, least recently used first
+SEASON_MEMORY_MB = int(os.environ.get('IPL_SEASON_MEMORY_MB', 512))
+# Loaded seasons are published here once and memory-mapped read-only by every worker process;
+# IPL_SHARED_DIR= (empty) keeps a private copy per process instead
+SHARED_DIR = os.environ.get('IPL_SHARED_DIR', default_shared_dir())
+
+# ?season=all aggregates every season on disk
+ALL_SEASONS = 'all'
+
+# Rendered GET responses kept in memory, least recently used dropped first
+RESPONSE_CACHE_MB = int(os.environ.get('IPL_RESPONSE_CACHE_MB', 64))
+# /query results kept by normalized query, so differently written requests for the same totals share one
+QUERY_CACHE_MB = int(os.environ.get('IPL_QUERY_CACHE_MB', 16))
+# Clients may keep responses but must revalidate them; unchanged data costs a 304
+CACHE_CONTROL = 'public, no-cache'
+
+# Request latency histograms, stage timers and /metrics; IPL_METRICS=0 turns them off
+metrics = create_metrics(os.environ.get('IPL_METRICS', '1') != '0')
+
+
+def build_match_index(deliveries, matches):
+    # Row range [start, stop) of each match in the deliveries frame
+    match_nos = deliveries['match_no'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, match_nos[1:] != match_nos[:-1]]) if len(match_nos) else np.array([], dtype=int)
+    stops = np.r_[starts[1:], len(match_nos)]
+    ball_offsets = {int(match_nos[start]): (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+    # Row position of each match in match_history
+    match_rows = {int(match_no): row for row, match_no in enumerate(matches['match_no'])}
+    return ball_offsets, match_rows
+
+
+def get_match(season, match_no):
+    # Returns (general match info, deliveries of the match) or a 404 for unknown matches
+    if match_no not in season["match_rows"]:
+        abort(404, description=f"Match {match_no} not found in season {season['season']}")
+    start, stop = season["ball_offsets"].get(match_no, (0, 0))  # Washed out matches have no deliveries
+    return season["match_history"].iloc[season["match_rows"][match_no]], season["ball_by_ball"].iloc[start:stop]
+
+
+def requested_season(allow_all=True):
+    # ?season=<year> or ?season=all, defaulting to the latest season on disk
+    season = request.args.get('season')
+    if season is None:
+        return latest_season(registry)
+    if season == ALL_SEASONS:
+        if not allow_all:
+            abort(400, description="season=all is not supported by this route")
+        return ALL_SEASONS
+    if not season.isdigit() or int(season) not in registry["files"]:
+        abort(404, description=f"Season {season} not found")
+    return int(season)
+
+
+def season_data(allow_all=False):
+    # The loaded season named by ?season=, or ALL_SEASONS when allowed
+    season = requested_season(allow_all)
+    return season if season == ALL_SEASONS else published_season(season)
+
+
+def published_season(season):
+    # The loaded season including every delivery posted so far
+    data = get_season(registry, season)
+    live = live_deliveries.get(season)
+    if live is None or live["store"]["rows"] == len(data["ball_by_ball"]):
+        return data
+    with live["lock"]:
+        data = get_season(registry, season)
+        if live["store"]["rows"] > len(data["ball_by_ball"]):
+            data = apply_deliveries(data, live["store"], live["store"]["rows"])
+            replace_season(registry, season, data)
+        return data
+
+
+def published_seasons():
+    # Every season in order, loaded one at a time so cold seasons can be evicted along the way
+    for season in season_names(registry):
+        yield season, published_season(season)
+
+
+all_seasons = {"version": None, "payloads": {}}
+all_seasons_lock = threading.Lock()
+
+
+def all_seasons_payload(name, build):
+    # season=all payloads are built once and kept until a season file changes
+    with all_seasons_lock:
+        version = registry_version(registry)
+        if all_seasons["version"] != version:
+            all_seasons.update(version=version, payloads={})
+        if name not in all_seasons["payloads"]:
+            all_seasons["payloads"][name] = build()
+        return all_seasons["payloads"][name]
+
+
+@app.errorhandler(HTTPException)
+def http_error(error):
+    return jsonify({"error": error.description}), error.code
+
+
+if metrics["enabled"]:
+    # Registered ahead of the response cache so cache hits and 304s are timed too
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+        request_started(metrics)
+
+    @app.after_request
+    def record_request_time(response):
+        if 'request_start' in g:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            request_finished(metrics, route, request.method, response.status_code, time.perf_counter() - g.request_start)
+        return response
+
+    @app.teardown_request
+    def close_request_timer(error):
+        if 'request_start' in g:
+            request_closed(metrics)
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    if not metrics["enabled"]:
+        abort(404, description="Metrics are disabled (IPL_METRICS=0)")
+    cache = cache_stats(response_cache)
+    seasons = registry_status(registry)
+    gauges = [
+        ("ipl_response_cache_events_total", "Response cache lookups and evictions.", "counter",
+         [({"event": event}, cache[event]) for event in ["hits", "misses", "not_modified", "evictions", "too_large"]]),
+        ("ipl_response_cache_bytes", "Bytes held by the response cache.", "gauge", [({}, cache["bytes"])]),
+        ("ipl_seasons_loaded_bytes", "Memory of the frames of each loaded season.", "gauge",
+         [({"season": season}, size) for season, size in seasons["loaded"].items()]),
+    ]
+    return app.response_class(render_metrics(metrics, gauges), mimetype='text/plain; version=0.0.4')
+
+
+response_cache = create_cache(RESPONSE_CACHE_MB * 1024 * 1024)
+query_cache = create_cache(QUERY_CACHE_MB * 1024 * 1024)
+
+# Routes whose responses are not cached: streams, batches, exports, writes, metrics and the cache's own counters
+UNCACHED_ENDPOINTS = {'stream_match', 'batch_matches', 'export_seasons', 'post_deliveries', 'response_cache_stats', 'prometheus_metrics', 'static'}
+
+
+def request_version():
+    # Version of the data the response to this request is built from
+    season = requested_season(allow_all=True)
+    if season == ALL_SEASONS:
+        for live_season in list(live_deliveries):
+            published_season(live_season)
+        return registry_version(registry)
+    return published_season(season)["version"]
+
+
+@app.before_request
+def serve_cached_response():
+    if request.method not in ['GET', 'HEAD'] or request.endpoint is None or request.endpoint in UNCACHED_ENDPOINTS:
+        return None
+    g.cache_key = cache_key(request.path, request.args.items(multi=True), request_version())
+    g.etag = entity_tag(g.cache_key)
+
+    # The tags follow from the key, so a client holding the current version gets a 304 straight away.
+    # Only a concrete matching tag counts: "*" says nothing about whether the route would succeed.
+    for encoding in ENCODINGS:
+        if not request.if_none_match.star_tag and request.if_none_match.contains_weak(encoding_tag(g.etag, encoding)):
+            count(response_cache, "not_modified")
+            g.cache_hit = True
+            return cached_response(app.response_class(status=304), encoding)
+
+    entry = cache_get(response_cache, g.cache_key)
+    if entry is None:
+        return None
+    g.cache_hit = True
+    encoding = choose_encoding(request.accept_encodings, entry["bodies"])
+    response = app.response_class(entry["bodies"][encoding], mimetype=entry["mimetype"], headers=entry["headers"])
+    return cached_response(response, encoding)
+
+
+def cached_response(response, encoding):
+    # Validators and encoding headers shared by fresh, cached and 304 responses
+    response.set_etag(encoding_tag(g.etag, encoding))
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+@app.after_request
+def store_cached_response(response):
+    if 'cache_key' not in g or g.get('cache_hit') or response.status_code != 200 or response.is_streamed:
+        return response
+    # Rendered once per dataset version: the body and its compressed variants are kept together
+    with stage(metrics, "compress"):
+        bodies, compress_seconds = encode_body(response.get_data())
+    record_render(response_cache, request.endpoint, g.get('serialize_seconds', 0.0), compress_seconds, bodies)
+    cache_put(response_cache, g.cache_key, {
+        "bodies": bodies,
+        "mimetype": response.mimetype,
+        "headers": {key: value for key, value in response.headers.items() if key.startswith('X-')},
+    })
+    encoding = choose_encoding(request.accept_encodings, bodies)
+    response.set_data(bodies[encoding])
+    return cached_response(response, encoding)
+
+
+@app.route('/cache-stats', methods=['GET'])
+def response_cache_stats():
+    # Counters for sizing IPL_RESPONSE_CACHE_MB, and serialization time and payload sizes per route;
+    # "query_cache" holds the same counters for IPL_QUERY_CACHE_MB
+    return jsonify({**cache_stats(response_cache), "query_cache": cache_stats(query_cache)})
+
+
+# League stage size per season; later matches are playoffs and do not count towards the points table
+LEAGUE_MATCHES = {
+    2008: 56, 2009: 56, 2010: 56, 2011: 70, 2012: 72, 2013: 72, 2014: 56, 2015: 56, 2016: 56,
+    2017: 56, 2018: 56, 2019: 56, 2020: 56, 2021: 56, 2022: 70, 2023: 70, 2024: 70,
+}
+DEFAULT_LEAGUE_MATCHES = 70
+# An all-out side is charged its full quota of overs for net run rate
+FULL_INNINGS_BALLS = 120
+
+
+def innings_totals(deliveries):
+    # Runs, legal balls and wickets of every innings, one row per (match_no, innings)
+    return deliveries.assign(
+        wicket=deliveries['player_dismissed'].notna(),
+    ).groupby(['match_no', 'innings'], sort=False).agg(
+        batting_team=('batting_team', 'first'),
+        bowling_team=('bowling_team', 'first'),
+        runs=('total_runs', 'sum'),
+        balls=('legal_ball', 'sum'),
+        wickets=('wicket', 'sum'),
     ).reset_index()
 
-    # Group by match and team for bowling stats
-    bowling_stats = balls_df.groupby(['match_no', 'bowling_team']).agg(
-        total_runs_conceded=('total_runs', 'sum'),
-        valid_balls_bowled=('valid_ball', 'sum')
-    ).reset_index()
-
-    # Convert balls to overs
-    batting_stats['overs_batted'] = batting_stats['valid_balls_faced'] // 6 + (batting_stats['valid_balls_faced'] % 6) / 10
-    bowling_stats['overs_bowled'] = bowling_stats['valid_balls_bowled'] // 6 + (bowling_stats['valid_balls_bowled'] % 6) / 10
-
-    # Merge batting stats into points table
-    for _, row in batting_stats.iterrows():
-        team = row['batting_team']
-        points_table[team]['Runs Scored'] += row['total_runs_scored']
-        points_table[team]['Overs Batted'] += row['valid_balls_faced']
-
-    # Merge bowling stats into points table
-    for _, row in bowling_stats.iterrows():
-        team = row['bowling_team']
-        points_table[team]['Runs Conceded'] += row['total_runs_conceded']
-        points_table[team]['Overs Bowled'] += row['valid_balls_bowled']
-
-    # Calculate Net Run Rate (NRR)
-    for team, stats in points_table.items():
-        if stats['Overs Batted'] > 0 and stats['Overs Bowled'] > 0:
-            stats['NRR'] = (stats['Runs Scored'] / stats['Overs Batted']) - (stats['Runs Conceded'] / stats['Overs Bowled'])
-        else:
-            stats['NRR'] = 0.0  # Avoid division errors
-    
-    # SOMETHING IS WRONG HERE
-    points_table["CSK"]["NRR"] = 0.059
-    points_table["RCB"]["NRR"] = 0.06
 
+def match_result(match, totals):
+    # What a single match adds to the points table. totals holds the match's rows from innings_totals.
+    result = {
+        "match_no": int(match['match_no']),
+        "date": pd.Timestamp(pd.to_datetime(match['date'], format='%d-%m-%Y')).to_datetime64(),
+        "teams": [match['team1'], match['team2']],
+        "winner": match['winning_team'],
+        "innings": [],
+    }
+    for innings in totals.itertuples():
+        if innings.innings not in [1, 2]:
+            continue  # Super overs decide the winner but are left out of net run rate
+        balls = FULL_INNINGS_BALLS if innings.wickets >= 10 else int(innings.balls)
+        result["innings"].append((innings.batting_team, innings.bowling_team, int(innings.runs), balls))
+    return result
+
+
+def apply_match_result(table, result):
+    # Returns a new table so earlier snapshots stay untouched. Copies O(teams) entries.
+    table = {team: dict(stats) for team, stats in table.items()}
+    for team in result["teams"]:
+        table.setdefault(team, {
+            'Played': 0, 'Wins': 0, 'Losses': 0, 'NR': 0, 'Points': 0,
+            'Runs Scored': 0, 'Balls Batted': 0, 'Runs Conceded': 0, 'Balls Bowled': 0
+        })
+        table[team]['Played'] += 1
+
+    team1, team2 = result["teams"]
+    winner = result["winner"]
+    if winner != 'TIE':
+        loser = team1 if winner == team2 else team2
+        table[winner]['Wins'] += 1
+        table[winner]['Points'] += 2
+        table[loser]['Losses'] += 1
+    else:
+        for team in [team1, team2]:
+            table[team]['NR'] += 1
+            table[team]['Points'] += 1
+
+    for batting_team, bowling_team, runs, balls in result["innings"]:
+        table[batting_team]['Runs Scored'] += runs
+        table[batting_team]['Balls Batted'] += balls
+        table[bowling_team]['Runs Conceded'] += runs
+        table[bowling_team]['Balls Bowled'] += balls
+    return table
+
+
+def add_match_result(engine, result):
+    # Appends the snapshot after a new match. A result for an earlier match replays the snapshots after it.
+    position = np.searchsorted(engine["match_nos"], result["match_no"])
+    if position < len(engine["match_nos"]) and engine["match_nos"][position] == result["match_no"]:
+        engine["results"][position] = result
+    else:
+        engine["results"].insert(position, result)
+        engine["match_nos"].insert(position, result["match_no"])
+
+    del engine["tables"][position + 1:]
+    for replayed in engine["results"][position:]:
+        engine["tables"].append(apply_match_result(engine["tables"][-1], replayed))
+    # Dates only move forward with the match number, so the latest date seen so far is searchable
+    engine["dates"] = np.maximum.accumulate(np.array([r["date"] for r in engine["results"]], dtype='datetime64[ns]'))
+
+
+def build_points_engine(matches, deliveries):
+    engine = {"match_nos": [], "dates": np.array([], dtype='datetime64[ns]'), "results": [], "tables": [{}]}
+    league = matches[matches['league_stage']].sort_values('match_no')
+    totals = innings_totals(deliveries[deliveries['match_no'].isin(league['match_no'])])
+    totals_by_match = dict(list(totals.groupby('match_no')))
+    empty = totals.iloc[0:0]
+    for _, match in league.iterrows():
+        add_match_result(engine, match_result(match, totals_by_match.get(match['match_no'], empty)))
+    return engine
+
+
+def net_run_rate(stats):
+    if stats['Balls Batted'] > 0 and stats['Balls Bowled'] > 0:
+        return stats['Runs Scored'] * 6 / stats['Balls Batted'] - stats['Runs Conceded'] * 6 / stats['Balls Bowled']
+    return 0.0  # Avoid division errors
+
+
+def combine_tables(tables):
+    # Sums points tables of several seasons team by team
+    combined = {}
+    for table in tables:
+        for team, stats in table.items():
+            totals = combined.setdefault(team, dict.fromkeys(stats, 0))
+            for key, value in stats.items():
+                totals[key] += value
+    return combined
+
+
+def standings(table):
     # Sort by Points first, then NRR
-    sorted_teams = sorted(points_table.items(), key=lambda x: (x[1]['Points'], x[1]['NRR']), reverse=True)
+    sorted_teams = sorted(table.items(), key=lambda x: (x[1]['Points'], net_run_rate(x[1])), reverse=True)
 
     # Convert to JSON response format
     final_table = []
@@ -107,243 +386,325 @@ def points_table():
             "Wins": stats["Wins"],
             "Losses": stats["Losses"],
             "No Result (TIE)": stats["NR"],
-            "Net Run Rate": round(stats["NRR"], 3),
-            "Total Runs Scored / Total Overs Batted": f"{stats['Runs Scored']} / {round(stats['Overs Batted'], 1)}",
-            "Total Runs Conceded / Total Overs Bowled": f"{stats['Runs Conceded']} / {round(stats['Overs Bowled'], 1)}",
+            "Net Run Rate": round(net_run_rate(stats), 3),
+            "Total Runs Scored / Total Overs Batted": f"{stats['Runs Scored']} / {balls_to_overs(stats['Balls Batted'])}",
+            "Total Runs Conceded / Total Overs Bowled": f"{stats['Runs Conceded']} / {balls_to_overs(stats['Balls Bowled'])}",
             "Points": stats["Points"]
         })
+    return final_table
 
-    return jsonify(final_table)
 
+def points_snapshot(points_engine, as_of=None, date=None):
+    # Table after the last league match, or as of a match number / date
+    snapshot = len(points_engine["match_nos"])
+    if as_of is not None:
+        snapshot = int(np.searchsorted(points_engine["match_nos"], as_of, side='right'))
+    if date is not None:
+        snapshot = min(snapshot, int(np.searchsorted(points_engine["dates"], date, side='right')))
+    return points_engine["tables"][snapshot]
 
 
-@app.route('/matches', methods=['GET'])
-def matches():
-    # Select only the required columns
-    match_column = match_history[['match_no','date', 'venue', 'city', 'team1', 'team2', 'toss_winner', 'toss_decision', 'innings1_score', 'innings1_wickets', 'innings2_score', 'innings2_wickets', 'winning_team', 'margin', 'won_by', 'player_of_the_match']]
-    delivery_columns = ball_by_ball[['match_no', 'innings', 'over']]
-    # Convert to a list of dictionaries
-    result_match = match_column.to_dict(orient='records')
-    result_delivery = delivery_columns.to_dict(orient='records')
-
-    matches = []
-    balls = {}
-
-    for match in result_match:
-        if(match["winning_team"] != "TIE"):
-            match_item = {
-                "match_no" : match['match_no'],
-                "date" : match['date'],
-                "venue" : match['venue'],
-                "city" : match['city'],
-                "team1" : match['team1'],
-                "team2" : match['team2'],
-                "toss_winner" : match['toss_winner'],
-                "toss_decision" : match['toss_decision'],
-                "innings1_score" : match['innings1_score'],
-                "innings1_wickets" : match['innings1_wickets'],
-                "innings2_score" : match['innings2_score'],
-                "innings2_wickets" : match['innings2_wickets'],
-                "winning_team" : match['winning_team'],
-                "margin" : match['margin'],
-                "won_by" : match['won_by'],
-                "player_of_the_match" : match['player_of_the_match']
-            }
-            matches.append(match_item)
-
-    for ball in result_delivery:
-        match_no = ball['match_no']
-        innings = ball["innings"]
-        over = ball["over"]
-
-        if match_no not in balls:
-            balls[match_no] = {"innings1_overs": None, "innings2_overs": None}
-        
-        if innings == 1:
-            if balls[match_no]["innings1_overs"] is None or over > balls[match_no]["innings1_overs"]:
-                balls[match_no]["innings1_overs"] = over
-        elif innings == 2:
-            if balls[match_no]["innings2_overs"] is None or over > balls[match_no]["innings2_overs"]:
-                balls[match_no]["innings2_overs"] = over
-
-        for match in matches:
-            match_no = match["match_no"]
-            if match_no in balls:
-                match["innings1_overs"] = balls[match_no]["innings1_overs"]
-                match["innings2_overs"] = balls[match_no]["innings2_overs"]
-
-
-    return jsonify(matches)
+@app.route('/points-table', methods=['GET'])
+def points_table():
+    season = season_data(allow_all=True)
+    as_of = request.args.get('as_of')
+    if as_of is not None:
+        if not as_of.isdigit():
+            abort(400, description=f"Invalid as_of '{as_of}', expected a match number")
+        if season == ALL_SEASONS:
+            abort(400, description="as_of needs a single season, match numbers restart every season")
+        as_of = int(as_of)
+    date = parse_date_param('date')
+
+    if season == ALL_SEASONS:
+        # All-time table: every season's league table summed team by team
+        if date is None:
+            return jsonify(all_seasons_payload("points", lambda: standings(combine_tables(points_snapshot(data["points_engine"]) for _, data in published_seasons()))))
+        return jsonify(standings(combine_tables(points_snapshot(data["points_engine"], date=date) for _, data in published_seasons())))
+    return jsonify(standings(points_snapshot(season["points_engine"], as_of, date)))
+
+
+MATCH_COLUMNS = ['season', 'match_no','date', 'venue', 'city', 'team1', 'team2', 'toss_winner', 'toss_decision', 'innings1_score', 'innings1_wickets', 'innings2_score', 'innings2_wickets', 'winning_team', 'margin', 'won_by', 'player_of_the_match']
+
+
+def build_match_summary(deliveries, matches):
+    # One row per match: match_history columns joined with per-innings delivery totals
+    balls = deliveries[deliveries['innings'].isin([1, 2])]
+    per_innings = balls.groupby(['match_no', 'innings']).agg(
+        overs=('over', 'max'),
+        balls=('legal_ball', 'sum'),
+        runs=('total_runs', 'sum'),
+        extras=('extras', 'sum'),
+    )
+    per_innings['run_rate'] = (per_innings['runs'] * 6 / per_innings['balls']).round(2)
+    per_innings = per_innings.drop(columns='runs').unstack('innings')
+    per_innings.columns = [f"innings{innings}_{stat}" for stat, innings in per_innings.columns]
 
-@app.route('/players', methods=['GET'])
-def players():
-    # Select only the required columns
-    selected_columns = match_history[['team1', 'team2', 'team1_players', 'team2_players']]
-    # Convert to a list of dictionaries
-    result = selected_columns.to_dict(orient='records')
+    summary = matches[MATCH_COLUMNS].merge(per_innings, left_on='match_no', right_index=True, how='left')
+    for innings in [1, 2]:
+        for stat in ['balls', 'extras']:
+            column = f"innings{innings}_{stat}"
+            summary[column] = summary[column].fillna(0).astype(int) if column in summary else 0
+        for stat in ['overs', 'run_rate']:
+            column = f"innings{innings}_{stat}"
+            summary[column] = summary[column].astype(float) if column in summary else np.nan
+
+    # Washed out matches are not listed
+    return summary[summary['winning_team'] != 'TIE'].reset_index(drop=True)
+
+
+def build_match_summary_index(summary):
+    # Row positions by team, by venue and by date so filters never rescan the table
+    team_rows = {}
+    for column in ['team1', 'team2']:
+        for team, rows in summary.groupby(column).indices.items():
+            team_rows[team.upper()] = np.union1d(team_rows.get(team.upper(), []), rows).astype(int)
+
+    # Keyed by canonical venue id, so any spelling venue_id() maps to it finds the venue
+    venue_rows = {}
+    for venue, rows in summary.groupby(summary['venue'].map(venue_id)).indices.items():
+        venue_rows[venue] = rows
+
+    dates = pd.to_datetime(summary['date'], format='%d-%m-%Y').to_numpy()
+    date_order = np.argsort(dates, kind='stable')
+    return {"team": team_rows, "venue": venue_rows, "dates": dates[date_order], "date_order": date_order}
+
+
+ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+def parse_date_param(name):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    # Strictly YYYY-MM-DD: pandas would also take '' (as NaT) and words like 'now' or 'today'
+    try:
+        date = pd.to_datetime(value, format='%Y-%m-%d') if ISO_DATE.fullmatch(value) else pd.NaT
+    except ValueError:
+        date = pd.NaT
+    if pd.isna(date):
+        abort(400, description=f"Invalid {name} '{value}', expected YYYY-MM-DD")
+    return np.datetime64(date.to_datetime64())
+
+
+def filter_match_summary(index, team=None, venue=None, date_from=None, date_to=None):
+    rows = None
+    if team is not None:
+        rows = index["team"].get(team.upper(), np.array([], dtype=int))
+    if venue is not None:
+        venue_rows = index["venue"].get(venue_id(venue), np.array([], dtype=int))
+        rows = venue_rows if rows is None else np.intersect1d(rows, venue_rows)
+    if date_from is not None or date_to is not None:
+        lo = 0 if date_from is None else np.searchsorted(index["dates"], date_from, side='left')
+        hi = len(index["dates"]) if date_to is None else np.searchsorted(index["dates"], date_to, side='right')
+        date_rows = index["date_order"][lo:hi]
+        rows = date_rows if rows is None else np.intersect1d(rows, date_rows)
+    return np.sort(rows)
 
-    team_players = {}
 
-    for match in result:
-        team1 = match["team1"]
-        team2 = match["team2"]
+@app.route('/matches', methods=['GET'])
+def matches():
+    season = season_data(allow_all=True)
+    team = request.args.get('team')
+    venue = request.args.get('venue')
+    date_from = parse_date_param('date_from')
+    date_to = parse_date_param('date_to')
+    filtered = team is not None or venue is not None or date_from is not None or date_to is not None
+
+    if season == ALL_SEASONS:
+        # Each season is filtered through its own index and the results chained in season order
+        records = []
+        for _, data in published_seasons():
+            rows = filter_match_summary(data["match_summary_index"], team, venue, date_from, date_to) if filtered else range(len(data["match_summary_records"]))
+            records.extend(data["match_summary_records"][row] for row in rows)
+        return jsonify(records)
+
+    # The unfiltered list is serialized once when the season is loaded
+    if not filtered:
+        return app.response_class(season["match_summary_json"], mimetype='application/json')
+
+    rows = filter_match_summary(season["match_summary_index"], team, venue, date_from, date_to)
+    return jsonify([season["match_summary_records"][row] for row in rows])
+
+def squad_players(squads):
+    # Each team's players in order of first selection, from the squads parsed at load
+    squad = squads[squads['team'] != '-'].drop_duplicates(['team', 'player'])
+    return {team: players.tolist() for team, players in squad.groupby('team', sort=False, observed=True)['player']}
+
+
+def combine_players(rosters):
+    # Union of several seasons' squads, each team's players in order of first selection
+    combined = {}
+    for roster in rosters:
+        for team, names in roster.items():
+            combined.setdefault(team, {}).update(dict.fromkeys(names))
+    return {team: list(names) for team, names in combined.items()}
 
-        team1_players = match["team1_players"] #Excel Data
-        team2_players = match["team2_players"] #Excel Data
 
-        team1_players_list = team1_players.split(", ")  #List of Players On Game Day
-        team2_players_list = team2_players.split(", ")  #List Of Players On Game Day
+@app.route('/players', methods=['GET'])
+def players():
+    season = season_data(allow_all=True)
+    if season == ALL_SEASONS:
+        return jsonify(all_seasons_payload("players", lambda: combine_players(data["team_players"] for _, data in published_seasons())))
+    return jsonify(season["team_players"])
+
+
+def group_codes(innings, names):
+    # Factorize (innings, name code) pairs in order of first appearance
+    name_codes, name_uniques = pd.factorize(names)
+    width = max(len(name_uniques), 1)
+    pair_codes, pair_uniques = pd.factorize(innings * width + name_codes)
+    return pair_codes, pair_uniques // width, name_uniques.take(pair_uniques % width)
+
+
+def group_sum(codes, values, size):
+    return np.bincount(codes, weights=values, minlength=size).astype(int)
+
+
+def balls_to_overs(balls):
+    # Legal balls to cricket overs notation, e.g. 15 -> 2.3
+    return np.floor_divide(balls, 6) + np.remainder(balls, 6) / 10
+
+
+def build_scorecard(match_data):
+    innings_data = {innings: {"batting": [], "bowling": [], "extras": {"total": 0, "wides": 0, "no_balls": 0, "leg_byes": 0, "byes": 0}} for innings in [1, 2]}
+    if match_data.empty:
+        return innings_data
+
+    innings = match_data['innings'].to_numpy()
+    runs_of_bat = match_data['runs_of_bat'].to_numpy()
+    extras = match_data['extras'].to_numpy()
+    wides = match_data['wide'].to_numpy()
+    no_balls = match_data['noballs'].to_numpy()
+    leg_byes = match_data['legbyes'].to_numpy()
+    byes = match_data['byes'].to_numpy()
+    over_no = match_data['over_no'].to_numpy()
+    legal_ball = match_data['legal_ball'].to_numpy()
+    ball_faced = match_data['ball_faced'].to_numpy()
+    bowler_runs = match_data['bowler_runs'].to_numpy()
+    dismissed = match_data['player_dismissed'].notna().to_numpy()
+    wicket_rows = np.flatnonzero(dismissed)
+
+    # Names are only decoded for the rows that end up in the response
+    symbols = match_data['striker'].dtype
+    wicket_type_codes = symbol_codes(match_data['wicket_type'])
+    wicket_type = decode_symbols(symbols, wicket_type_codes[wicket_rows])
+    fielder = decode_symbols(symbols, symbol_codes(match_data['fielder'])[wicket_rows])
+    wicket_bowler = decode_symbols(symbols, symbol_codes(match_data['bowler'])[wicket_rows])
+
+    # Batting lines in order of appearance. Dismissed batters are included even if they
+    # never faced a ball (run out at the non-striker's end).
+    n = len(match_data)
+    position = np.r_[np.arange(n), wicket_rows]
+    order = np.argsort(position, kind='stable')
+    sorted_codes, batting_innings, batters = group_codes(
+        np.r_[innings, innings[wicket_rows]][order],
+        np.r_[symbol_codes(match_data['striker']), symbol_codes(match_data['player_dismissed'])[wicket_rows]][order],
+    )
+    batters = decode_symbols(symbols, batters)
+    codes = np.empty_like(sorted_codes)
+    codes[order] = sorted_codes
+    striker_codes, dismissed_codes = codes[:n], codes[n:]
+    size = len(batters)
+
+    batting_columns = {
+        "runs": group_sum(striker_codes, runs_of_bat, size),
+        "balls": group_sum(striker_codes, ball_faced, size),
+        "fours": group_sum(striker_codes, runs_of_bat == 4, size),
+        "sixes": group_sum(striker_codes, runs_of_bat == 6, size),
+        "dots": group_sum(striker_codes, runs_of_bat == 0, size),
+    }
+    dismissal = np.full(size, -1)
+    dismissal[dismissed_codes] = np.arange(len(wicket_rows))
+
+    for i, batter in enumerate(batters):
+        if batting_innings[i] not in innings_data:
+            continue
+        line = {"batter": batter, **{key: int(values[i]) for key, values in batting_columns.items()}, "wicket_type": None, "fielder": None}
+        wicket = dismissal[i]
+        if wicket >= 0:
+            line["wicket_type"] = wicket_type[wicket] if wicket_type[wicket] is not None else "not out"
+            line["fielder"] = fielder[wicket] if fielder[wicket] is not None else ""
+            line["bowler"] = wicket_bowler[wicket] if wicket_bowler[wicket] is not None else ""
+        innings_data[batting_innings[i]]["batting"].append(line)
+
+    # Bowling lines in order of first over bowled
+    bowler_codes, bowling_innings, bowlers = group_codes(innings, symbol_codes(match_data['bowler']))
+    bowlers = decode_symbols(symbols, bowlers)
+    size = len(bowlers)
+    legal_balls = group_sum(bowler_codes, legal_ball, size)
+
+    # A maiden is a completed over by one bowler with no runs charged to the bowler
+    over_width = int(over_no.max()) + 1
+    over_codes, over_uniques = pd.factorize(bowler_codes * over_width + over_no)
+    over_legal = np.bincount(over_codes, weights=legal_ball)
+    over_runs = np.bincount(over_codes, weights=bowler_runs)
+    maiden_overs = (over_legal == 6) & (over_runs == 0)
+
+    bowling_columns = {
+        "runs": group_sum(bowler_codes, bowler_runs, size),
+        "maidens": group_sum(over_uniques // over_width, maiden_overs, size),
+        "fours": group_sum(bowler_codes, runs_of_bat == 4, size),
+        "sixes": group_sum(bowler_codes, runs_of_bat == 6, size),
+        "wides": group_sum(bowler_codes, wides, size),
+        "no_balls": group_sum(bowler_codes, no_balls, size),
+        "dots": group_sum(bowler_codes, (runs_of_bat == 0) & (extras == 0), size),
+        "wickets": group_sum(bowler_codes, match_data['is_bowler_wicket'].to_numpy(), size),
+    }
+    overs = balls_to_overs(legal_balls)
+
+    for i, name in enumerate(bowlers):
+        if bowling_innings[i] not in innings_data:
+            continue
+        innings_data[bowling_innings[i]]["bowling"].append({
+            "bowler": name,
+            "overs": float(overs[i]),
+            **{key: int(values[i]) for key, values in bowling_columns.items()},
+        })
 
-        if team1 != '-' or team2 != '-':
-            if team1 not in team_players:
-                team_players[team1] = []
+    # Extras breakdown per innings
+    innings_codes = innings - 1
+    extras_columns = {
+        "total": extras,
+        "wides": extras * (wides == 1),
+        "no_balls": no_balls,
+        "leg_byes": (extras - no_balls) * (leg_byes == 1),
+        "byes": (extras - no_balls) * (byes == 1),
+    }
+    for key, values in extras_columns.items():
+        totals = group_sum(innings_codes, values, 2)
+        for index in [0, 1]:
+            innings_data[index + 1]["extras"][key] = int(totals[index])
 
-            if team2 not in team_players:
-                team_players[team2] = []
+    return innings_data
 
-            for player1 in team1_players_list:
-                if player1 not in team_players[team1]:
-                    team_players[team1].append(player1)
 
-            for player2 in team2_players_list:
-                if player2 not in team_players[team2]:
-                    team_players[team2].append(player2)
+@app.route('/get-scorecard/<int:match_no>', methods=['GET'])
+def getScorecardFromMatchNo(match_no):
+    return jsonify(scorecard_payload(season_data(), match_no))
 
-    
-    return jsonify(team_players)
 
+def scorecard_payload(season, match_no):
+    #Get match detail from the match index
+    with stage(metrics, "scorecard.filter"):
+        general_match_info, match_data = get_match(season, match_no)
 
-@app.route('/get-scorecard/<match_no>', methods=['GET'])
-def getScorecardFromMatchNo(match_no):
-    data= ball_by_ball[['match_no', 'date','venue', 'batting_team','bowling_team', 'innings', 'over', 'striker', 'non_striker', 'bowler', 'runs_of_bat', 'extras', 'wide', 'legbyes', 'byes', 'noballs', 'wicket_type', 'player_dismissed', 'fielder']]
-    match = match_history[ ['match_no', 'team1', 'team2', 'innings1_score','innings2_score', 'innings1_wickets','innings2_wickets', 'venue','date','won_by','margin','winning_team']]
-
-    #Convert parameter from URL to integer
-    match_no = int(match_no)
-
-    #Get match detail from data
-    match_data = data[data['match_no'] == match_no]
-    general_match_info = match[match['match_no'] == match_no].iloc[0]
-
-
-    innings_data = {1: {"batting":{}, "bowling": {}, "extras" : {"total":0, "wides" : 0, "no_balls":0,"leg_byes":0,"byes":0}}, 2: {"batting":{}, "bowling":{}, "extras" : {"total":0, "wides" : 0, "no_balls":0,"leg_byes":0,"byes":0}}}
-
-    for _,ball in match_data.iterrows():
-        innings = ball['innings']
-        batting_team = ball['batting_team']
-        bowling_team = ball['bowling_team']
-        striker = ball['striker']
-        non_striker = ball['non_striker']
-        bowler = ball['bowler']
-        fielder = ball['fielder']
-        player_dismissed = ball['player_dismissed']
-        wicket_type = ball['wicket_type']
-        runs_of_bat = ball['runs_of_bat']
-        extras = ball['extras']
-        wides = ball['wide']
-        no_balls = ball['noballs']
-        leg_byes = ball['legbyes']
-        byes = ball['byes']
-        over = ball['over']
-
-        if striker not in innings_data[innings]["batting"]:
-            innings_data[innings]["batting"][striker] = {
-                "batter": striker,
-                "runs": 0,
-                "balls": 0,
-                "fours": 0,
-                "sixes": 0,
-                "dots": 0,
-                "wicket_type": None,
-                "fielder": None,
-            }
-        
-        innings_data[innings]["batting"][striker]["runs"] += runs_of_bat
-        if no_balls != 1 and wides != 1:
-            innings_data[innings]["batting"][striker]["balls"] +=1
-
-        if runs_of_bat == 0:
-            innings_data[innings]["batting"][striker]["dots"] +=1
-        if runs_of_bat == 4:
-            innings_data[innings]["batting"][striker]["fours"] +=1
-        if runs_of_bat == 6:
-            innings_data[innings]["batting"][striker]["sixes"] +=1
-        
-        if not pd.isna(player_dismissed):
-            innings_data[innings]["batting"][player_dismissed]["wicket_type"] = (
-                wicket_type if not (isinstance(wicket_type, float) and math.isnan(wicket_type)) else "not out"
-            )
-            innings_data[innings]["batting"][player_dismissed]["fielder"] = (
-                fielder if not (isinstance(fielder, float) and math.isnan(fielder)) else ""
-            )
-            innings_data[innings]["batting"][player_dismissed]["bowler"] = (
-                bowler if not (isinstance(bowler, float) and math.isnan(bowler)) else ""
-            )
-
-        #Bowling Stats
-        if bowler not in innings_data[innings]["bowling"]:
-            innings_data[innings]["bowling"][bowler] = {
-                "bowler": bowler,
-                "runs": 0,
-                "overs": 0.0,
-                "maidens": 0,
-                "fours": 0,
-                "sixes": 0,
-                "wides": 0,
-                "no_balls": 0,
-                "dots" : 0,
-                "wickets" : 0,
-            }
-
-        innings_data[innings]["bowling"][bowler]["runs"] += runs_of_bat + extras - (leg_byes + byes)
-        innings_data[innings]["bowling"][bowler]["wides"] += wides
-        innings_data[innings]["bowling"][bowler]["no_balls"] += no_balls
-
-        if runs_of_bat == 0 and extras == 0:
-            innings_data[innings]["bowling"][bowler]["dots"] += 1
-        if runs_of_bat == 4:
-            innings_data[innings]["bowling"][bowler]["fours"] += 1
-        if runs_of_bat == 6:
-            innings_data[innings]["bowling"][bowler]["sixes"] += 1
-        
-        # Calculate inning extras
-        innings_data[innings]["extras"]["total"] += extras
-        if wides == 1:
-            innings_data[innings]["extras"]["wides"] += extras
-
-        innings_data[innings]["extras"]["no_balls"] += no_balls
-
-        if leg_byes == 1:
-            innings_data[innings]["extras"]["leg_byes"] += extras - no_balls
-
-        if byes == 1:    
-            innings_data[innings]["extras"]["byes"] += extras - no_balls
-
-
-        # Calculate overs bowled
-        if no_balls != 1 and wides != 1:
-            current_overs = innings_data[innings]["bowling"][bowler]["overs"]
-            balls_bowled = math.floor(current_overs) * 6 + (current_overs - math.floor(current_overs)) * 10
-            balls_bowled += 1
-            innings_data[innings]["bowling"][bowler]["overs"] = math.floor(balls_bowled / 6) + (balls_bowled % 6) / 10
-        
-        # Get Wickets
-        if wicket_type == "caught" or wicket_type == "bowled":
-            innings_data[innings]["bowling"][bowler]["wickets"] += 1
+    with stage(metrics, "scorecard.aggregate"):
+        innings_data = build_scorecard(match_data)
 
      # Convert to list for JSON response
     response = {
         "innings1": {
-            "batting": list(innings_data[1]["batting"].values()),
-            "bowling": list(innings_data[1]["bowling"].values()),
+            "batting": innings_data[1]["batting"],
+            "bowling": innings_data[1]["bowling"],
             "score" : general_match_info["innings1_score"],
             "wickets" : general_match_info["innings1_wickets"],
             "team" : general_match_info["team1"],
             "extras" : innings_data[1]["extras"]
         },
         "innings2": {
-            "batting": list(innings_data[2]["batting"].values()),
-            "bowling": list(innings_data[2]["bowling"].values()),
+            "batting": innings_data[2]["batting"],
+            "bowling": innings_data[2]["bowling"],
             "score" : general_match_info["innings2_score"],
             "wickets" : general_match_info["innings2_wickets"],
             "team" : general_match_info["team2"],
@@ -358,96 +719,86 @@ def getScorecardFromMatchNo(match_no):
             "won_by" : general_match_info["won_by"],
         }
     }
-    return jsonify(response)
+    return response
+
+def empty_worm_innings():
+    return {"runs": [], "fall_of_wickets": [], "run_per_over": [], "batting_team": None, "bowling_team": None}
+
+
+def build_worm(match_data):
+    # Cumulative runs per ball, fall of wickets and runs per over for every innings in one pass
+    worm = {innings: empty_worm_innings() for innings in [1, 2]}
+    if match_data.empty:
+        return worm
+
+    innings = match_data['innings'].to_numpy()
+    total = match_data['total_runs'].to_numpy().astype(int)
+    dismissed = symbol_codes(match_data['player_dismissed'])
+
+    # 0.1 -> ball 1, 1.1 -> ball 7 (wides and no-balls share the number of the ball that is re-bowled)
+    over_no = match_data['over_no'].to_numpy().astype(int)
+    ball_number = over_no * 6 + match_data['ball_in_over'].to_numpy()
+
+    # Running total restarted at the first ball of every innings
+    cumulative = np.cumsum(total)
+    innings_start = np.flatnonzero(np.r_[True, innings[1:] != innings[:-1]])
+    cumulative -= np.repeat(cumulative[innings_start] - total[innings_start], np.diff(np.r_[innings_start, len(innings)]))
+
+    # One worm point per ball number holding the total after its last delivery
+    ball_width = int(ball_number.max()) + 1
+    ball_codes, ball_keys = pd.factorize(innings * ball_width + ball_number)
+    last_row = np.full(len(ball_keys), -1)
+    np.maximum.at(last_row, ball_codes, np.arange(len(innings)))
+
+    # Runs per over
+    over_width = int(over_no.max()) + 1
+    over_keys, over_codes = np.unique(innings * over_width + over_no, return_inverse=True)
+    over_runs = np.bincount(over_codes, weights=total).astype(int)
+
+    # Super overs show up as extra innings
+    first_rows = match_data.iloc[innings_start]
+    for value, batting_team, bowling_team in zip(first_rows['innings'].tolist(), first_rows['batting_team'], first_rows['bowling_team']):
+        worm.setdefault(value, empty_worm_innings())
+        if worm[value]["batting_team"] is None:
+            worm[value]["batting_team"] = batting_team
+            worm[value]["bowling_team"] = bowling_team
+
+    for key, row in zip((ball_keys // ball_width).tolist(), last_row.tolist()):
+        worm[key]["runs"].append({"ball": int(ball_number[row]), "runs": int(cumulative[row])})
+
+    wicket_rows = np.flatnonzero(dismissed >= 0)
+    for row, player in zip(wicket_rows.tolist(), decode_symbols(match_data['player_dismissed'].dtype, dismissed[wicket_rows])):
+        worm[int(innings[row])]["fall_of_wickets"].append({
+            "ball": int(ball_number[row]),
+            "runs_at_wicket_fall": int(cumulative[row]),
+            "player_dismissed": player,
+        })
+
+    for key, runs in zip(over_keys.tolist(), over_runs.tolist()):
+        worm[key // over_width]["run_per_over"].append({"over": f"{key % over_width + 1}", "runs": runs})
 
-@app.route('/get-fow/<match_no>', methods=['GET'])
+    return worm
+
+
+@app.route('/get-fow/<int:match_no>', methods=['GET'])
 def getFallOfWicketsFromMatchNo(match_no):
-    data = ball_by_ball[['match_no', 'batting_team', 'bowling_team', 'innings', 'over', 'runs_of_bat', 'extras', 'player_dismissed']]
-    match = match_history[ ['match_no', 'team1', 'team2', 'innings1_score','innings2_score', 'innings1_wickets','innings2_wickets', 'venue','date','won_by','margin','winning_team']]
-    # Convert parameter from URL to integer
-    match_no = int(match_no)
-
-    # Get match detail from data
-    match_data = data[data['match_no'] == match_no]
-    general_match_info = match[match['match_no'] == match_no].iloc[0]
-
-    ball_by_ball_runs = {1: [], 2: []}
-    fall_of_wickets = {1: [], 2: []}
-    total_runs = {1: 0, 2: 0}  # Running total for each innings per ball
-    run_per_over = {1: {}, 2: {}}  # To track runs per over (0.1 -> 1, 1.1 -> 2...)
-    team = {1: {"batting_team": None, "bowling_team": None}, 2: {"batting_team": None, "bowling_team": None}}
-
-    for _, ball in match_data.iterrows():
-        over = ball["over"]
-        innings = ball["innings"]
-        runs_of_bat = ball['runs_of_bat']
-        extras = ball['extras']
-        player_dismissed = ball['player_dismissed']
-        batting_team = ball["batting_team"]
-        bowling_team = ball["bowling_team"]
-
-        if team[innings]["batting_team"] is None:  # Only assign if not already set
-            team[innings]["batting_team"] = batting_team
-        if team[innings]["bowling_team"] is None:  # Only assign if not already set
-            team[innings]["bowling_team"] = bowling_team
-
-        # Calculate the ball number (e.g., 0.1 -> 1, 1.1 -> 7, etc.)
-        ball_number = int(over) * 6 + int(str(over).split('.')[1])  # ball_number starts from 1, 2, 3...
-
-        # Cumulative runs calculation for each ball
-        total_runs[innings] += (runs_of_bat + extras)
-
-        # Update ball-by-ball runs (cumulative runs at each ball)
-        found = False
-        for idx, ball_data in enumerate(ball_by_ball_runs[innings]):
-            if ball_data['ball'] == ball_number:
-                ball_by_ball_runs[innings][idx] = {
-                    "ball": ball_number,
-                    "runs": total_runs[innings]
-                }
-                found = True
-                break
-
-        # If no existing ball number found, append new ball data
-        if not found:
-            ball_by_ball_runs[innings].append({
-                "ball": ball_number,
-                "runs": total_runs[innings]
-            })
+    return jsonify(fow_payload(season_data(), match_no))
 
-        # Capture fall of wickets (player dismissal)
-        if isinstance(player_dismissed, str):  # If player was dismissed
-            fall_of_wickets[innings].append({
-                "ball": ball_number,
-                "runs_at_wicket_fall": total_runs[innings],
-                "player_dismissed": player_dismissed
-            })
 
-        # Track runs per over (for creating run per over stats)
-        over_key = int(str(over).split(".")[0])  # Extract the over number (e.g., 0.1 -> 0, 1.1 -> 1)
-        if over_key not in run_per_over[innings]:
-            run_per_over[innings][over_key] = 0
-        
-        run_per_over[innings][over_key] += runs_of_bat + extras
+def fow_payload(season, match_no):
+    # Get match detail from the match index
+    with stage(metrics, "fow.filter"):
+        general_match_info, match_data = get_match(season, match_no)
+
+    with stage(metrics, "fow.aggregate"):
+        worm = build_worm(match_data)
 
     # Create the response structure
     response = {
-        "runs": {
-            "innings1": ball_by_ball_runs[1],
-            "innings2": ball_by_ball_runs[2]
-        },
-        "FallOfWickets": {
-            "innings1": fall_of_wickets[1],
-            "innings2": fall_of_wickets[2]
-        },
-        "runPerOver": {
-            "innings1": [{"over": f"{k+1}", "runs": v} for k, v in sorted(run_per_over[1].items())],
-            "innings2": [{"over": f"{k+1}", "runs": v} for k, v in sorted(run_per_over[2].items())]
-        },
-         "teams": {
-            "innings1": [{"batting": team[1]["batting_team"], "bowling": team[1]["bowling_team"]}],
-            "innings2": [{"batting": team[2]["batting_team"], "bowling": team[2]["bowling_team"]}],
-        },
+        "runs": {f"innings{innings}": data["runs"] for innings, data in worm.items()},
+        "FallOfWickets": {f"innings{innings}": data["fall_of_wickets"] for innings, data in worm.items()},
+        "runPerOver": {f"innings{innings}": data["run_per_over"] for innings, data in worm.items()},
+        "teams": {f"innings{innings}": [{"batting": data["batting_team"], "bowling": data["bowling_team"]}] for innings, data in worm.items()},
         "header": {
             "matchNo" : match_no,
             "venue" : general_match_info["venue"],
@@ -458,136 +809,162 @@ def getFallOfWicketsFromMatchNo(match_no):
         }
     }
 
-    return jsonify(response)
+    return response
 
-@app.route('/get-overs/<match_no>',methods=['GET'])
+@app.route('/get-overs/<int:match_no>',methods=['GET'])
 def getOverAnalysisFromMatchNo(match_no):
-    data = ball_by_ball[['match_no', 'batting_team', 'bowling_team', 'innings', 'over', 'runs_of_bat', 'extras', 'player_dismissed', "striker", "bowler", "wide", "noballs","byes","legbyes", "wicket_type"]]
-    match = match_history[ ['match_no', 'team1', 'team2', 'innings1_score','innings2_score', 'innings1_wickets','innings2_wickets', 'venue','date','won_by','margin','winning_team']]
-
-    # Convert match_no parameter from URL to integer
-    match_no = int(match_no)
-
-    # Filter data for the specific match
-    filtered_data = data[data['match_no'] == match_no]
-    general_match_info = match[match['match_no'] == match_no].iloc[0]
+    return jsonify(overs_payload(season_data(), match_no))
+
+
+def group_rows(*keys):
+    # Codes of the distinct combinations of integer key columns, numbered in order of first
+    # appearance, and the first row of each combination
+    combined = np.zeros(len(keys[0]), dtype=np.int64)
+    for key in keys:
+        low, high = (int(key.min()), int(key.max())) if len(key) else (0, 0)
+        combined = combined * (high - low + 1) + (key - low)
+    codes, uniques = pd.factorize(combined)
+    # Codes are numbered in order of first appearance, so a combination's first row is where the
+    # running maximum of the codes goes up
+    return codes, np.flatnonzero(codes > np.maximum.accumulate(np.r_[-1, codes[:-1]]))
+
+
+def phase_cube(deliveries):
+    # Phase totals of deliveries (one match or a whole season, each innings' rows contiguous) as
+    # {"batting", "bowling", "innings"} tables of arrays, names as symbol codes:
+    #   batting: one entry per (match_no, innings, phase, batter), runs and balls faced, fours, sixes, outs
+    #   bowling: one entry per (match_no, innings, phase, bowler), runs charged, legal balls, wickets, fours, sixes
+    #   innings: one entry per (match_no, innings, phase), runs, legal balls and wickets of the side
+    # Entries are in order of first appearance.
+    n = len(deliveries)
+    match_nos = deliveries['match_no'].to_numpy()
+    innings = deliveries['innings'].to_numpy()
+    phase = deliveries['phase'].to_numpy()
+    batting_team = symbol_codes(deliveries['batting_team'])
+    bowling_team = symbol_codes(deliveries['bowling_team'])
+    striker = symbol_codes(deliveries['striker'])
+    dismissed = symbol_codes(deliveries['player_dismissed'])
+    runs_of_bat = deliveries['runs_of_bat'].to_numpy()
+    legal_ball = deliveries['legal_ball'].to_numpy()
+    four = runs_of_bat == 4
+    six = runs_of_bat == 6
+
+    def entries(rows, first_rows):
+        # Keys and teams of each entry, from the first row in rows it covers
+        return {
+            "match_no": match_nos[rows[first_rows]],
+            "innings": innings[rows[first_rows]],
+            "phase": phase[rows[first_rows]],
+            "batting_team": batting_team[rows[first_rows]],
+            "bowling_team": bowling_team[rows[first_rows]],
+        }
 
-    # Convert the filtered DataFrame to a dictionary
-    result = filtered_data.to_dict(orient='records')
+    # Batters: every ball on strike, plus every dismissal (a batter can be run out at the
+    # non-striker's end without facing in the phase) right after the ball it fell on
+    wicket_rows = np.flatnonzero(dismissed >= 0)
+    position = np.r_[np.arange(n), wicket_rows]
+    order = np.argsort(position, kind='stable')
+    rows = position[order]
+    on_strike = np.r_[np.ones(n, dtype=bool), np.zeros(len(wicket_rows), dtype=bool)][order]
+    batters = np.r_[striker, dismissed[wicket_rows]][order]
+    codes, first_rows = group_rows(match_nos[rows], innings[rows], phase[rows], batters)
+    count = len(first_rows)
+    batting = {
+        **entries(rows, first_rows),
+        "batter": batters[first_rows],
+        "runs": group_sum(codes, runs_of_bat[rows] * on_strike, count),
+        "balls": group_sum(codes, deliveries['ball_faced'].to_numpy()[rows] & on_strike, count),
+        "fours": group_sum(codes, four[rows] & on_strike, count),
+        "sixes": group_sum(codes, six[rows] & on_strike, count),
+        "outs": group_sum(codes, ~on_strike, count),
+    }
 
-    run_per_over = {1: {}, 2: {}}  # To track runs per over (0.1 -> 1, 1.1 -> 2...)
-    fow = {1: {}, 2: {}}  # Dictionary to store the count of wickets per over
-    team = {1: {"batting_team": None, "bowling_team": None}, 2: {"batting_team": None, "bowling_team": None}}
+    rows = np.arange(n)
+    bowler = symbol_codes(deliveries['bowler'])
+    codes, first_rows = group_rows(match_nos, innings, phase, bowler)
+    count = len(first_rows)
+    bowling = {
+        **entries(rows, first_rows),
+        "bowler": bowler[first_rows],
+        "runs": group_sum(codes, deliveries['bowler_runs'].to_numpy(), count),
+        "balls": group_sum(codes, legal_ball, count),
+        "wickets": group_sum(codes, deliveries['is_bowler_wicket'].to_numpy(), count),
+        "fours": group_sum(codes, four, count),
+        "sixes": group_sum(codes, six, count),
+    }
 
-    over_analysis = {
-        1: {  # Innings 1
-            "pp": {"batting": {}, "bowling": {}, "total":0, "wickets":0},
-            "middle": {"batting": {}, "bowling": {}, "total":0, "wickets":0},
-            "death": {"batting": {}, "bowling": {}, "total":0, "wickets":0}
-        },
-        2: {  # Innings 2
-            "pp": {"batting": {}, "bowling": {}, "total":0, "wickets":0},
-            "middle": {"batting": {}, "bowling": {}, "total":0, "wickets":0},
-            "death": {"batting": {}, "bowling": {}, "total":0, "wickets":0}
-        }
+    codes, first_rows = group_rows(match_nos, innings, phase)
+    count = len(first_rows)
+    totals = {
+        **entries(rows, first_rows),
+        "runs": group_sum(codes, deliveries['total_runs'].to_numpy(), count),
+        "balls": group_sum(codes, legal_ball, count),
+        "wickets": group_sum(codes, dismissed >= 0, count),
     }
+    return {"batting": batting, "bowling": bowling, "innings": totals}
+
+
+def top_performers(cube, batter_names, bowler_names, innings, phase):
+    # Top batter (most runs, first to get there on a tie) and top bowler (most wickets, then fewest
+    # runs) of one phase of an innings, from a match's phase_cube and its decoded player names
+    batting, bowling, totals = cube["batting"], cube["bowling"], cube["innings"]
+    batters = np.flatnonzero((batting["innings"] == innings) & (batting["phase"] == phase))
+    bowlers = np.flatnonzero((bowling["innings"] == innings) & (bowling["phase"] == phase))
+    phase_totals = (totals["innings"] == innings) & (totals["phase"] == phase)
+
+    top_batter = top_bowler = None
+    if len(batters):
+        i = batters[np.argmax(batting["runs"][batters])]
+        top_batter = {"player": batter_names[i], "runs": int(batting["runs"][i]), "balls": int(batting["balls"][i])}
+    if len(bowlers):
+        i = bowlers[np.lexsort((bowling["runs"][bowlers], -bowling["wickets"][bowlers]))[0]]
+        top_bowler = {"player": bowler_names[i], "balls": int(bowling["balls"][i]),
+                      "runs_conceded": int(bowling["runs"][i]), "wickets": int(bowling["wickets"][i])}
+    return {
+        "top_batter": top_batter,
+        "top_bowler": top_bowler,
+        "total": int(totals["runs"][phase_totals].sum()),
+        "wickets": int(totals["wickets"][phase_totals].sum()),
+    }
+
 
-    for ball in result:
-        over = ball["over"]
-        innings = ball["innings"]
-        runs_of_bat = ball["runs_of_bat"]
-        extras = ball["extras"]
-        player_dismissed = ball["player_dismissed"]
-        batting_team = ball["batting_team"]
-        bowling_team = ball["bowling_team"]
-        batter = ball["striker"]
-        bowler = ball["bowler"]
-        wides = ball['wide']
-        no_balls = ball['noballs']
-        wicket_type = ball['wicket_type']
-        leg_byes = ball['legbyes']
-        byes = ball['byes']
-
-        if team[innings]["batting_team"] is None:  # Only assign if not already set
-            team[innings]["batting_team"] = batting_team
-        if team[innings]["bowling_team"] is None:  # Only assign if not already set
-            team[innings]["bowling_team"] = bowling_team
-
-        # Track runs per over (for creating run per over stats)
-        over_key = int(str(over).split(".")[0])  # Extract the over number (0.1 -> 0, 1.1 -> 1)
-
-        if over_key not in run_per_over[innings]:
-            run_per_over[innings][over_key] = 0
-
-        run_per_over[innings][over_key] += runs_of_bat + extras
-
-        # Count wickets per over
-        if isinstance(player_dismissed, str):  # If a player was dismissed
-            if over_key not in fow[innings]:
-                fow[innings][over_key] = 0  # Initialize wicket count for the over
-            fow[innings][over_key] += 1  # Increment wicket count
-
-        # Over Analysis for PP, Middle and Death
-        phase = get_phase(over)
-
-        over_analysis[innings][phase]["total"] += (runs_of_bat+extras)
-        if isinstance(player_dismissed, str):  # If a player was dismissed
-            over_analysis[innings][phase]["wickets"] += 1
-
-        if batter not in over_analysis[innings][phase]["batting"]:
-            over_analysis[innings][phase]["batting"][batter] = {"runs": 0, "balls": 0}
-        over_analysis[innings][phase]["batting"][batter]["runs"] += runs_of_bat
-        if wides != 1 or no_balls != 1:
-            over_analysis[innings][phase]["batting"][batter]["balls"] += 1
-
-        if bowler not in over_analysis[innings][phase]["bowling"]:
-            over_analysis[innings][phase]["bowling"][bowler] = {"balls": 0, "runs_conceded": 0, "wickets": 0}
-
-        over_analysis[innings][phase]["bowling"][bowler]["runs_conceded"] += runs_of_bat
-        if wides==1:
-            over_analysis[innings][phase]["bowling"][bowler]["runs_conceded"] += extras
-        if no_balls ==1:
-            over_analysis[innings][phase]["bowling"][bowler]["runs_conceded"] += 1
-
-        if wides == 0 and no_balls == 0:
-            over_analysis[innings][phase]["bowling"][bowler]["balls"] += 1
-
-        if isinstance(player_dismissed,str):
-            if wicket_type != "" and wicket_type != "runout":
-                over_analysis[innings][phase]["bowling"][bowler]["wickets"] += 1
-
-    top_performers = {1: {}, 2: {}}  # Store top batters & bowlers for each innings and phase
-
-    for innings in [1, 2]:  # Loop through both innings
-        for phase in ["pp", "middle", "death"]:  # Loop through all three phases
-            top_batter = get_top_batter(over_analysis[innings][phase]["batting"])
-            top_bowler = get_top_bowler(over_analysis[innings][phase]["bowling"])
-
-            top_performers[innings][phase] = {
-                "top_batter": {"player": top_batter[0], **top_batter[1]} if top_batter else None,
-                "top_bowler": {"player": top_bowler[0], **top_bowler[1]} if top_bowler else None
-            }
-            top_performers[innings][phase]["total"] = over_analysis[innings][phase]["total"]
-            top_performers[innings][phase]["wickets"] = over_analysis[innings][phase]["wickets"]
+def overs_payload(season, match_no):
+    with stage(metrics, "overs.filter"):
+        # Get the deliveries of the specific match from the match index
+        general_match_info, filtered_data = get_match(season, match_no)
+
+    symbols = filtered_data['striker'].dtype
+    innings = filtered_data['innings'].to_numpy()
+    over_no = filtered_data['over_no'].to_numpy()
+    total_runs = filtered_data['total_runs'].to_numpy()
+    wicket = filtered_data['player_dismissed'].notna().to_numpy()
+    batting_teams = decode_symbols(symbols, symbol_codes(filtered_data['batting_team']))
+    bowling_teams = decode_symbols(symbols, symbol_codes(filtered_data['bowling_team']))
+
+    run_per_over, wicket_over, teams, performers = {}, {}, {}, {}
+    with stage(metrics, "overs.aggregate"):
+        cube = phase_cube(filtered_data)
+        batter_names = decode_symbols(symbols, cube["batting"]["batter"])
+        bowler_names = decode_symbols(symbols, cube["bowling"]["bowler"])
+        for number in [1, 2]:
+            rows = np.flatnonzero(innings == number)
+            # Runs per over (0.1 -> over 1) and wickets per over, for the overs that have them
+            balls = np.bincount(over_no[rows])
+            runs = np.bincount(over_no[rows], weights=total_runs[rows]).astype(int)
+            wickets = np.bincount(over_no[rows], weights=wicket[rows]).astype(int)
+            run_per_over[number] = [{"over": f"{over + 1}", "runs": int(runs[over])} for over in np.flatnonzero(balls).tolist()]
+            wicket_over[number] = [{"over": f"{over + 1}", "wickets": int(wickets[over])} for over in np.flatnonzero(wickets).tolist()]
+            teams[number] = [{"batting": batting_teams[rows[0]] if len(rows) else None,
+                              "bowling": bowling_teams[rows[0]] if len(rows) else None}]
+            # Top performers and totals of PP, Middle and Death
+            performers[number] = {name: top_performers(cube, batter_names, bowler_names, number, phase) for phase, name in enumerate(PHASES)}
 
     # Create the response structure
     response = {
-        "runPerOver": {
-            "innings1": [{"over": f"{k+1}", "runs": v} for k, v in sorted(run_per_over[1].items())],
-            "innings2": [{"over": f"{k+1}", "runs": v} for k, v in sorted(run_per_over[2].items())]
-        },
-        "wicketOver": {
-            "innings1": [{"over": f"{k+1}", "wickets": v} for k, v in sorted(fow[1].items())],
-            "innings2": [{"over": f"{k+1}", "wickets": v} for k, v in sorted(fow[2].items())]
-        },
-        "teams": {
-            "innings1": [{"batting": team[1]["batting_team"], "bowling": team[1]["bowling_team"]}],
-            "innings2": [{"batting": team[2]["batting_team"], "bowling": team[2]["bowling_team"]}],
-        },
-        "topPerformers": {
-            "innings1": top_performers[1],
-            "innings2": top_performers[2]
-        },
+        "runPerOver": {f"innings{number}": overs for number, overs in run_per_over.items()},
+        "wicketOver": {f"innings{number}": overs for number, overs in wicket_over.items()},
+        "teams": {f"innings{number}": sides for number, sides in teams.items()},
+        "topPerformers": {f"innings{number}": phases for number, phases in performers.items()},
         "header": {
             "matchNo" : match_no,
             "venue" : general_match_info["venue"],
@@ -598,133 +975,111 @@ def getOverAnalysisFromMatchNo(match_no):
         }
     }
 
-    return jsonify(response)
-
-def get_phase(ball):
-    if 0.1 <= ball <= 5.6:
-        return "pp"
-    elif 6.1 <= ball <= 14.6:
-        return "middle"
-    elif 15.1 <= ball <= 19.6:
-        return "death"
-    return None
-
-def get_top_batter(batting_data):
-    if not batting_data:
-        return None  # Return None if no batters in this phase
-    return max(batting_data.items(), key=lambda x: x[1]["runs"])
-
-# Helper function to find the top bowler based on wickets and runs conceded
-def get_top_bowler(bowling_data):
-    if not bowling_data:
-        return None  # Return None if no bowlers in this phase
-    return min(
-        bowling_data.items(),
-        key=lambda x: (-x[1]["wickets"], x[1]["runs_conceded"])  # Sort by wickets desc, runs asc
-    )
+    return response
+
 
-@app.route('/get-partnerships/<match_no>',methods=['GET'])
+@app.route('/get-partnerships/<int:match_no>',methods=['GET'])
 def getPartnershipFromMatchNo(match_no):
-    data = ball_by_ball[['match_no', 'batting_team', 'bowling_team', 'innings', 'over', 'runs_of_bat', 'extras', 'player_dismissed', 'striker', 'non_striker', 'wide', 'noballs']]
-    match = match_history[ ['match_no', 'team1', 'team2', 'innings1_score','innings2_score', 'innings1_wickets','innings2_wickets', 'venue','date','won_by','margin','winning_team']]
-
-    match_no = int(match_no)
-    filtered_data = data[data['match_no'] == match_no]
-    general_match_info = match[match['match_no'] == match_no].iloc[0]
-    result = filtered_data.to_dict(orient='records')
-
-    partnerships = {1: [], 2: []}  # Store partnerships for both innings
-    current_partnerships = {}  # Track ongoing partnerships
-    innings1batting = ""
-    innings2batting = ""
-
-    for i, ball in enumerate(result):
-        innings = ball["innings"]
-        striker = ball["striker"]
-        non_striker = ball["non_striker"]
-        runs_of_bat = ball["runs_of_bat"]
-        extras = ball["extras"]
-        player_dismissed = ball["player_dismissed"]
-        wide = ball["wide"]
-        noball = ball["noballs"]
-
-        if innings == 1:
-            innings1batting = ball["batting_team"]
-        if innings == 2:
-            innings2batting = ball["batting_team"]
-
-        # Initialize partnership if not exists
-        if innings not in current_partnerships:
-            current_partnerships[innings] = {
-                "batter1": striker,
-                "runs1": 0,
-                "balls1": 0,
-                "contribution1": 0,
-                "batter2": non_striker,
-                "runs2": 0,
-                "balls2": 0,
-                "contribution2": 0,
-                "extras": 0,
-                "balls": 0,
-                "runs": 0
-            }
-
-        # Track the current partnership
-        partnership = current_partnerships[innings]
-
-        # Update balls faced (excluding wide and no-ball)
-        if wide != 1 and noball != 1:
-            partnership["balls"] += 1  # Total partnership balls
-
-            if striker == partnership["batter1"]:
-                partnership["balls1"] += 1
-            else:
-                partnership["balls2"] += 1
+    return jsonify(partnerships_payload(season_data(), match_no))
+
+
+# Partnership columns in the order /get-partnerships lists them
+PARTNERSHIP_FIELDS = ['batter1', 'runs1', 'balls1', 'contribution1', 'batter2', 'runs2', 'balls2', 'contribution2', 'extras', 'balls', 'runs']
+
+
+def partnership_columns(deliveries):
+    # One entry per partnership of every innings in deliveries (one match or a whole season, each
+    # match's rows contiguous and in ball order), as arrays with names as symbol codes. A
+    # partnership runs from the start of an innings or the ball after a wicket up to the next
+    # wicket; the last one of an innings may be unbroken.
+    match_nos = deliveries['match_no'].to_numpy()
+    innings = deliveries['innings'].to_numpy()
+    striker = symbol_codes(deliveries['striker'])
+    non_striker = symbol_codes(deliveries['non_striker'])
+    dismissed = symbol_codes(deliveries['player_dismissed'])
+    runs_of_bat = deliveries['runs_of_bat'].to_numpy()
+    extras = deliveries['extras'].to_numpy()
+    faced = deliveries['ball_faced'].to_numpy()
+    wicket = dismissed >= 0
+
+    # Partnership id per delivery: a new one starts with every innings and after every wicket
+    # (sliced so a match without deliveries gives empty columns)
+    innings_start = np.r_[True, (match_nos[1:] != match_nos[:-1]) | (innings[1:] != innings[:-1])][:len(innings)]
+    starts = innings_start | np.r_[False, wicket[:-1]][:len(innings)]
+    partnership = np.cumsum(starts) - 1
+    first_rows = np.flatnonzero(starts)
+    last_rows = np.r_[first_rows[1:], len(starts)][:len(first_rows)] - 1
+    count = len(first_rows)
+
+    # Opening stands are the first ball's striker and non-striker. Later ones pair the batter who
+    # survived the wicket with whichever batter at the next ball is not them.
+    batter1 = striker[first_rows].copy()
+    batter2 = non_striker[first_rows].copy()
+    after_wicket = ~innings_start[first_rows]
+    wicket_rows = first_rows[after_wicket] - 1
+    survivor = np.where(dismissed[wicket_rows] == striker[wicket_rows], non_striker[wicket_rows], striker[wicket_rows])
+    batter1[after_wicket] = survivor
+    batter2[after_wicket] = np.where(survivor == non_striker[first_rows[after_wicket]], striker[first_rows[after_wicket]], non_striker[first_rows[after_wicket]])
+
+    # Each delivery counts for batter1 when they are on strike and for batter2 otherwise
+    on_strike1 = striker == batter1[partnership]
+    runs1 = group_sum(partnership, runs_of_bat * on_strike1, count)
+    runs2 = group_sum(partnership, runs_of_bat * ~on_strike1, count)
+    balls = group_sum(partnership, faced, count)
+    balls1 = group_sum(partnership, faced & on_strike1, count)
+    innings_of_partnership = np.cumsum(innings_start[first_rows]) - 1
+
+    return {
+        "match_no": match_nos[first_rows],
+        "innings": innings[first_rows],
+        "wicket": np.arange(count) - np.flatnonzero(innings_start[first_rows])[innings_of_partnership] + 1,
+        "batting_team": symbol_codes(deliveries['batting_team'])[first_rows],
+        "batter1": batter1,
+        "runs1": runs1,
+        "balls1": balls1,
+        "contribution1": runs1,
+        "batter2": batter2,
+        "runs2": runs2,
+        "balls2": balls - balls1,
+        "contribution2": runs2,
+        "extras": group_sum(partnership, extras, count),
+        "balls": balls,
+        "runs": group_sum(partnership, deliveries['total_runs'].to_numpy(), count),
+        "unbroken": ~wicket[last_rows],
+    }
+
+
+# Partnership columns holding symbol codes
+PARTNERSHIP_NAMES = ['batting_team', 'batter1', 'batter2']
+
+
+def build_partnerships(deliveries):
+    # partnership_columns as a frame, names decoded to the symbol dtype
+    symbols = deliveries['striker'].dtype
+    columns = partnership_columns(deliveries)
+    for name in PARTNERSHIP_NAMES:
+        columns[name] = pd.Categorical.from_codes(columns[name], dtype=symbols)
+    return pd.DataFrame(columns)
+
+
+def partnerships_payload(season, match_no):
+    general_match_info, filtered_data = get_match(season, match_no)
+    columns = partnership_columns(filtered_data)
+    symbols = filtered_data['striker'].dtype
+    fields = ['wicket', *PARTNERSHIP_FIELDS, 'unbroken']
+    values = [decode_symbols(symbols, columns[field]).tolist() if field in PARTNERSHIP_NAMES else columns[field].tolist() for field in fields]
+
+    # Both innings are always listed; super overs add further innings
+    partnerships = {1: [], 2: []}
+    batting = {1: "", 2: ""}
+    for innings, batting_team, row in zip(columns["innings"].tolist(), decode_symbols(symbols, columns["batting_team"]).tolist(), zip(*values)):
+        partnerships.setdefault(innings, []).append(dict(zip(fields, row)))
+        batting[innings] = batting_team
 
-        # Update runs & contribution
-        partnership["runs"] += runs_of_bat + extras  # Total partnership runs
-        if striker == partnership["batter1"]:
-            partnership["contribution1"] += runs_of_bat
-            partnership["runs1"] += runs_of_bat
-        else:
-            partnership["contribution2"] += runs_of_bat
-            partnership["runs2"] += runs_of_bat
-
-        # Add extras
-        partnership["extras"] += extras
-
-        # Handle player dismissal
-        if isinstance(player_dismissed, str):  
-            # Save completed partnership
-            partnerships[innings].append(partnership)
-
-            # Track last dismissed batter
-            last_batter_out = player_dismissed  
-
-            # Determine the next batter (look ahead to next ball)
-            if i + 1 < len(result):
-                next_ball = result[i + 1]
-                saved_batter = non_striker if player_dismissed == striker else striker
-                new_batter = next_ball["striker"] if saved_batter == next_ball["non_striker"] else next_ball["non_striker"]  # The new incoming batter
-
-                # Start a new partnership
-                current_partnerships[innings] = {
-                    "batter1": saved_batter,  # The surviving batter
-                    "runs1": 0,
-                    "balls1": 0,
-                    "contribution1": 0,
-                    "batter2": new_batter,  # New batter coming in
-                    "runs2": 0,
-                    "balls2": 0,
-                    "contribution2": 0,
-                    "extras": 0,
-                    "balls": 0,
-                    "runs": 0
-                }
     response = {
         "partnership": partnerships,
-        "innings1batting": innings1batting,
-        "innings2batting" : innings2batting,
+        "innings1batting": batting[1],
+        "innings2batting" : batting[2],
         "header": {
             "matchNo" : match_no,
             "venue" : general_match_info["venue"],
@@ -734,421 +1089,1199 @@ def getPartnershipFromMatchNo(match_no):
             "won_by" : general_match_info["won_by"],
         }
     }
-    return jsonify(response)
+    return response
+
+
+# Stands listed per wicket by /partnership-stats unless ?limit= says otherwise
+PARTNERSHIP_RECORDS = 10
+MAX_PARTNERSHIP_RECORDS = 100
+
+
+def partnership_records(partnerships, limit):
+    # Highest stands for each wicket: most runs, then fewest balls, then the earliest match.
+    # Super over stands are left out.
+    stands = partnerships[partnerships['innings'].isin([1, 2])]
+    ranked = stands.sort_values(['wicket', 'runs', 'balls', 'season', 'match_no'], ascending=[True, False, True, True, True], kind='stable')
+    top = ranked.groupby('wicket', sort=True).head(limit)
+    return {str(wicket): frame_records(rows.drop(columns='wicket')) for wicket, rows in top.groupby('wicket', sort=True)}
+
+
+@app.route('/partnership-stats', methods=['GET'])
+def partnership_stats():
+    # {"1": highest opening stands, "2": highest for the second wicket, ...}
+    season = season_data(allow_all=True)
+    limit = request.args.get('limit', str(PARTNERSHIP_RECORDS))
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_PARTNERSHIP_RECORDS:
+        abort(400, description=f"Invalid limit '{limit}', expected 1 to {MAX_PARTNERSHIP_RECORDS}")
+    limit = int(limit)
+    if season == ALL_SEASONS:
+        return jsonify(all_seasons_payload(f"partnerships:{limit}", lambda: partnership_records(
+            pd.concat([season_table(data, "partnerships") for _, data in published_seasons()], ignore_index=True), limit)))
+    return jsonify(partnership_records(season_table(season, "partnerships"), limit))
+
+
+# Players per leaderboard on /phase-stats unless ?limit= says otherwise, and the balls in the phase
+# a player needs to qualify for the strike rate and economy leaderboards unless ?min_balls= does
+PHASE_LEADERS = 10
+MAX_PHASE_LEADERS = 100
+PHASE_MIN_BALLS = 30
+
+
+def phase_tables(season):
+    # The phase cube frames of a loaded season or of every season
+    if season == ALL_SEASONS:
+        return all_seasons_payload("phases", lambda: combine_phase_tables(published_seasons()))
+    return season_table(season, "phases")
+
+
+def combine_phase_tables(seasons):
+    tables = [season_table(data, "phases") for _, data in seasons]
+    return {kind: pd.concat([table[kind] for table in tables], ignore_index=True) for kind in ["batting", "bowling", "innings"]}
+
+
+def phase_rows(frame, phase, team_column, team=None, venue=None, innings=None):
+    rows = frame['phase'] == phase
+    if innings is not None:
+        rows &= frame['innings'] == innings
+    if venue is not None:
+        rows &= frame['venue_id'] == venue
+    if team is not None:
+        # Compared once per distinct name rather than once per row
+        codes, names = pd.factorize(frame[team_column])
+        rows &= np.isin(codes, [code for code, name in enumerate(names) if name.upper() == team.upper()])
+    return frame[rows]
+
+
+def player_totals(frame, player_column, team_column, fields):
+    # {column: array} of fields summed per (player, team), with the innings they played in
+    player_codes, players = pd.factorize(frame[player_column])
+    team_codes, teams = pd.factorize(frame[team_column])
+    codes, first_rows = group_rows(player_codes, team_codes)
+    count = len(first_rows)
+    totals = {
+        "player": np.asarray(players, dtype=object)[player_codes[first_rows]],
+        "team": np.asarray(teams, dtype=object)[team_codes[first_rows]],
+        "innings": np.bincount(codes, minlength=count),
+    }
+    for field in fields:
+        totals[field] = group_sum(codes, frame[field].to_numpy(), count)
+    return totals
+
+
+def rate(numerator, denominator, default):
+    # numerator / denominator rounded to 2 places, default where the denominator is 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, np.round(numerator / np.maximum(denominator, 1), 2), default)
+
+
+def round_tenths(values):
+    # round(value, 1) of every value. np.round rounds value * 10, which can land exactly on a
+    # half when the value itself is just below or above one; those few go through round().
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 1)
+    ties = np.flatnonzero(values * 10 % 1 == 0.5)
+    rounded[ties] = [round(value, 1) for value in values[ties].tolist()]
+    return rounded
+
+
+def leaders(totals, keys, limit, rows=None):
+    # Records of the first limit players ordered by keys ((column, descending) pairs, the
+    # first one most significant); ties go to the player whose name sorts first
+    rows = np.arange(len(totals["player"])) if rows is None else np.flatnonzero(rows)
+    name_rank = np.argsort(np.argsort(totals["player"][rows], kind='stable'), kind='stable')
+    order = np.lexsort([name_rank, *[-totals[column][rows] if descending else totals[column][rows] for column, descending in reversed(keys)]])
+    top = rows[order[:limit]]
+    columns = {column: values[top].tolist() for column, values in totals.items()}
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def phase_leaderboards(cube, phase, limit, min_balls, team=None, venue=None, innings=None):
+    # Batters by runs and by strike rate, bowlers by wickets and by economy, over one phase of the
+    # innings matching the filters. Players are counted per team they played for.
+    batting = player_totals(phase_rows(cube["batting"], phase, 'batting_team', team, venue, innings), 'batter', 'batting_team',
+                            ['runs', 'balls', 'outs', 'fours', 'sixes'])
+    batting["strike_rate"] = rate(batting["runs"] * 100, batting["balls"], 0.0)
+    batting["average"] = rate(batting["runs"], batting["outs"], batting["runs"])
+
+    bowling = player_totals(phase_rows(cube["bowling"], phase, 'bowling_team', team, venue, innings), 'bowler', 'bowling_team',
+                            ['balls', 'runs', 'wickets', 'fours', 'sixes'])
+    bowling["overs"] = balls_to_overs(bowling["balls"]).astype(float)
+    bowling["economy"] = rate(bowling["runs"] * 6, bowling["balls"], 0.0)
+    bowling["average"] = rate(bowling["runs"], bowling["wickets"], 0.0)
+    bowling["strike_rate"] = rate(bowling["balls"], bowling["wickets"], 0.0)
 
-@app.route('/get-teams/<team_name>', methods=['GET'])
-def get_partnership_from_match_no(team_name):
+    return {
+        "batting": {
+            "runs": leaders(batting, [("runs", True), ("balls", False)], limit),
+            "strike_rate": leaders(batting, [("strike_rate", True), ("runs", True)], limit, batting["balls"] >= min_balls),
+        },
+        "bowling": {
+            "wickets": leaders(bowling, [("wickets", True), ("runs", False)], limit),
+            "economy": leaders(bowling, [("economy", False), ("balls", True)], limit, bowling["balls"] >= min_balls),
+        },
+    }
+
+
+@app.route('/phase-stats', methods=['GET'])
+def phase_stats():
+    # {"pp": {"batting": {"runs": [...], "strike_rate": [...]}, "bowling": {"wickets": [...], "economy": [...]}}, "middle": ..., "death": ...}
+    # ?phase= picks one phase; ?team=, ?venue= (name or id, as /get-venue) and ?innings= narrow the innings counted
+    season = season_data(allow_all=True)
+    phase = request.args.get('phase')
+    if phase is not None and phase not in PHASES:
+        abort(400, description=f"Invalid phase '{phase}', expected one of {', '.join(PHASES)}")
+    innings = request.args.get('innings')
+    if innings is not None and innings not in ['1', '2']:
+        abort(400, description=f"Invalid innings '{innings}', expected 1 or 2")
+    limit = request.args.get('limit', str(PHASE_LEADERS))
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_PHASE_LEADERS:
+        abort(400, description=f"Invalid limit '{limit}', expected 1 to {MAX_PHASE_LEADERS}")
+    min_balls = request.args.get('min_balls', str(PHASE_MIN_BALLS))
+    if not min_balls.isdigit():
+        abort(400, description=f"Invalid min_balls '{min_balls}', expected a whole number")
+    venue = request.args.get('venue')
+
+    cube = phase_tables(season)
+    phases = [phase] if phase is not None else PHASES
+    return jsonify({name: phase_leaderboards(cube, PHASES.index(name), int(limit), int(min_balls), team=request.args.get('team'),
+                                             venue=venue_id(venue) if venue is not None else None,
+                                             innings=int(innings) if innings is not None else None) for name in phases})
+
+
+# /query groups deliveries by any of these dimensions and reports these metrics per group. Counts
+# are summed per group; the rest follow from them.
+QUERY_DIMENSIONS = ['batter', 'bowler', 'team', 'venue', 'match', 'phase', 'over']
+QUERY_SIDES = ['batting', 'bowling']
+QUERY_COUNTS = ['runs', 'balls', 'wickets', 'dots', 'fours', 'sixes']
+QUERY_METRICS = QUERY_COUNTS + ['boundaries', 'strike_rate', 'economy', 'average']
+# Groups returned unless ?limit= says otherwise
+QUERY_ROWS = 100
+MAX_QUERY_ROWS = 5000
+
+
+def query_list(name, allowed, default):
+    # Comma separated ?name= values, each one of allowed, repeats dropped
+    value = request.args.get(name)
+    if value is None:
+        return default
+    items = list(dict.fromkeys(item.strip() for item in value.split(',')))
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        abort(400, description=f"Unknown {name} {', '.join(unknown)}; expected some of {', '.join(allowed)}")
+    return items
+
+
+def query_number(name, low, high=None, default=None):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    if not value.isdigit() or int(value) < low or (high is not None and int(value) > high):
+        expected = f"{low} to {high}" if high is not None else f"a whole number from {low}"
+        abort(400, description=f"Invalid {name} '{value}', expected {expected}")
+    return int(value)
+
+
+def parse_query():
+    # The /query request with every default filled in and names in canonical form (teams upper
+    # case, venues as ids, lists in a fixed order), so equivalent requests share one cached result
+    group = query_list('group', QUERY_DIMENSIONS, None)
+    if group is None:
+        abort(400, description=f"group= is required, some of {', '.join(QUERY_DIMENSIONS)}")
+    # Bowlers are looked at from the bowling side unless batters are grouped too
+    side = request.args.get('side', 'bowling' if 'bowler' in group and 'batter' not in group else 'batting')
+    if side not in QUERY_SIDES:
+        abort(400, description=f"Invalid side '{side}', expected one of {', '.join(QUERY_SIDES)}")
+    fields = query_list('metrics', QUERY_METRICS, QUERY_METRICS)
+    sort = request.args.get('sort', 'wickets' if side == 'bowling' else 'runs')
+    if sort not in QUERY_METRICS:
+        abort(400, description=f"Invalid sort '{sort}', expected one of {', '.join(QUERY_METRICS)}")
+    order = request.args.get('order', 'desc')
+    if order not in ['asc', 'desc']:
+        abort(400, description=f"Invalid order '{order}', expected asc or desc")
+    over_from = query_number('over_from', 1)
+    over_to = query_number('over_to', 1)
+    if over_from is not None and over_to is not None and over_from > over_to:
+        abort(400, description=f"over_from {over_from} is after over_to {over_to}")
+    date_from = parse_date_param('date_from')
+    date_to = parse_date_param('date_to')
+    team = request.args.get('team')
+    opponent = request.args.get('opponent')
+    venue = request.args.get('venue')
+    return {
+        "season": requested_season(allow_all=True),
+        "group": group,
+        "side": side,
+        "metrics": [field for field in QUERY_METRICS if field in fields],
+        "team": team.upper() if team is not None else None,
+        "opponent": opponent.upper() if opponent is not None else None,
+        "venue": venue_id(venue) if venue is not None else None,
+        "innings": query_number('innings', 1, 2),
+        "phase": [phase for phase in PHASES if phase in query_list('phase', PHASES, [])],
+        "over_from": over_from,
+        "over_to": over_to,
+        "date_from": pd.Timestamp(date_from).isoformat() if date_from is not None else None,
+        "date_to": pd.Timestamp(date_to).isoformat() if date_to is not None else None,
+        "sort": sort,
+        "order": order,
+        "limit": query_number('limit', 1, MAX_QUERY_ROWS, QUERY_ROWS),
+        "min_balls": query_number('min_balls', 0, default=0),
+    }
+
+
+def query_matches(data, query):
+    # Match numbers of the season passing the match level filters, found through the /matches index
+    # (team, opponent, venue, dates); None when there are no such filters
+    index = data["match_summary_index"]
+    if query["team"] is None and query["opponent"] is None and query["venue"] is None and query["date_from"] is None and query["date_to"] is None:
+        return None
+    rows = np.arange(len(index["date_order"]))
+    if query["date_from"] is not None or query["date_to"] is not None:
+        rows = filter_match_summary(index, date_from=np.datetime64(query["date_from"]) if query["date_from"] else None,
+                                    date_to=np.datetime64(query["date_to"]) if query["date_to"] else None)
+    for team in [query["team"], query["opponent"]]:
+        if team is not None:
+            rows = np.intersect1d(rows, index["team"].get(team, []))
+    if query["venue"] is not None:
+        # Every spelling of the venue on record
+        names = [name for name in index["venue"] if venue_id(name) == query["venue"]]
+        rows = np.intersect1d(rows, np.concatenate([index["venue"][name] for name in names] + [[]]))
+    return data["match_summary"]['match_no'].to_numpy()[rows.astype(int)]
+
+
+def match_row_ranges(data, match_nos):
+    # Delivery rows of the given matches, from their [start, stop) ranges in the match index
+    offsets = np.array([data["ball_offsets"][match_no] for match_no in match_nos.tolist() if match_no in data["ball_offsets"]], dtype=np.int64).reshape(-1, 2)
+    lengths = offsets[:, 1] - offsets[:, 0]
+    return np.repeat(offsets[:, 0] - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+
+def selected(deliveries, name, rows):
+    # One column as an array (symbol codes for names) at rows, or whole when rows is None
+    values = deliveries[name]
+    values = symbol_codes(values) if isinstance(values.dtype, pd.CategoricalDtype) else values.to_numpy()
+    return values if rows is None else values[rows]
+
+
+def team_codes(symbols, team):
+    return np.flatnonzero(pd.Index(symbols.categories).str.upper() == team)
+
+
+def query_rows(data, query):
+    # Rows of the season's deliveries the query covers, or None for all of them. Matches are narrowed
+    # through the index first, so the row filters only scan the deliveries of candidate matches.
+    deliveries = data["ball_by_ball"]
+    symbols = deliveries['striker'].dtype
+    match_nos = query_matches(data, query)
+    rows = match_row_ranges(data, match_nos) if match_nos is not None else None
+
+    team_column, opponent_column = ('batting_team', 'bowling_team') if query["side"] == 'batting' else ('bowling_team', 'batting_team')
+    conditions = []
+    if query["team"] is not None:
+        conditions.append(np.isin(selected(deliveries, team_column, rows), team_codes(symbols, query["team"])))
+    if query["opponent"] is not None:
+        conditions.append(np.isin(selected(deliveries, opponent_column, rows), team_codes(symbols, query["opponent"])))
+    if query["innings"] is not None:
+        conditions.append(selected(deliveries, 'innings', rows) == query["innings"])
+    if query["phase"]:
+        conditions.append(np.isin(selected(deliveries, 'phase', rows), [PHASES.index(phase) for phase in query["phase"]]))
+    if query["over_from"] is not None or query["over_to"] is not None:
+        over_no = selected(deliveries, 'over_no', rows)
+        conditions.append((over_no >= (query["over_from"] or 1) - 1) & (over_no <= (query["over_to"] or INNINGS_OVERS) - 1))
+    if not conditions:
+        return rows
+    keep = np.logical_and.reduce(conditions)
+    return np.flatnonzero(keep) if rows is None else rows[keep]
+
+
+def query_totals(season, data, query, rows):
+    # QUERY_COUNTS per group of the given rows as {column: array}, keys decoded. With a batter or a
+    # bowler grouped, the batting side counts runs off the bat, balls faced and dismissals of the
+    # batter, the bowling side runs charged to the bowler, legal balls and the bowler's wickets;
+    # otherwise whole-side totals: every run, legal balls and every dismissal.
+    deliveries = data["ball_by_ball"]
+    symbols = deliveries['striker'].dtype
+    runs_of_bat = selected(deliveries, 'runs_of_bat', rows)
+    dismissed = selected(deliveries, 'player_dismissed', rows)
+    players = 'batter' in query["group"] or 'bowler' in query["group"]
+    if players and query["side"] == 'batting':
+        runs, balls = runs_of_bat, selected(deliveries, 'ball_faced', rows)
+        wickets = dismissed >= 0
+    elif players:
+        runs, balls = selected(deliveries, 'bowler_runs', rows), selected(deliveries, 'legal_ball', rows)
+        wickets = selected(deliveries, 'is_bowler_wicket', rows)
+    else:
+        runs, balls = selected(deliveries, 'total_runs', rows), selected(deliveries, 'legal_ball', rows)
+        wickets = dismissed >= 0
+    counts = {"runs": runs, "balls": balls, "wickets": wickets, "dots": balls & (runs == 0), "fours": runs_of_bat == 4, "sixes": runs_of_bat == 6}
+
+    keys = {}
+    for dimension in query["group"]:
+        if dimension == 'batter':
+            keys['batter'] = selected(deliveries, 'striker', rows)
+        elif dimension == 'bowler':
+            keys['bowler'] = selected(deliveries, 'bowler', rows)
+        elif dimension == 'team':
+            keys['team'] = selected(deliveries, 'batting_team' if query["side"] == 'batting' else 'bowling_team', rows)
+        elif dimension == 'venue':
+            # Venue ids rather than names, so every spelling of a ground is one group
+            names = deliveries['venue'].cat.categories
+            id_codes, ids = pd.factorize(np.array([venue_id(name) for name in names], dtype=object))
+            keys['venue'] = np.append(id_codes, -1)[selected(deliveries, 'venue', rows)]
+        elif dimension == 'match':
+            keys['match_no'] = selected(deliveries, 'match_no', rows)
+        elif dimension == 'phase':
+            keys['phase'] = selected(deliveries, 'phase', rows)
+        else:
+            keys['over'] = selected(deliveries, 'over_no', rows)
+
+    if 'batter' in keys and query["side"] == 'batting':
+        # Dismissals go to the batter who was out, who may be the non-striker: one more entry per
+        # wicket right after the ball it fell on carries it
+        wicket_rows = np.flatnonzero(dismissed >= 0)
+        keys = {name: np.r_[key, key[wicket_rows]] for name, key in keys.items()}
+        keys['batter'][len(runs):] = dismissed[wicket_rows]
+        counts = {name: np.r_[values * (name != 'wickets'), np.zeros(len(wicket_rows), dtype=values.dtype)] for name, values in counts.items()}
+        counts['wickets'][len(runs):] = True
+
+    codes, first_rows = group_rows(*keys.values())
+    totals = {}
+    for name, key in keys.items():
+        key = key[first_rows]
+        if name in ['batter', 'bowler', 'team']:
+            totals[name] = decode_symbols(symbols, key)
+        elif name == 'venue':
+            totals[name] = np.append(np.asarray(ids, dtype=object), None)[key]
+        elif name == 'match_no':
+            totals['season'] = np.full(len(key), season)
+            totals[name] = key
+        elif name == 'phase':
+            totals[name] = np.append(np.array(PHASES, dtype=object), None)[key]  # -1: past the 20th over
+        else:
+            totals[name] = key + 1
+    for name, values in counts.items():
+        totals[name] = group_sum(codes, values, len(first_rows))
+    return totals
+
+
+def combine_query_totals(parts):
+    # Totals of several seasons regrouped by their decoded keys
+    if len(parts) == 1:
+        return parts[0]
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    keys = [name for name in columns if name not in QUERY_COUNTS]
+    codes, first_rows = group_rows(*[pd.factorize(columns[name])[0] for name in keys])
+    totals = {name: columns[name][first_rows] for name in keys}
+    for name in QUERY_COUNTS:
+        totals[name] = group_sum(codes, columns[name], len(first_rows))
+    return totals
+
+
+def query_results(totals, query):
+    # Groups with at least min_balls balls ordered by the sort metric (ties in key order), the first limit as records
+    batting = query["side"] == 'batting'
+    totals["boundaries"] = totals["fours"] + totals["sixes"]
+    totals["strike_rate"] = rate(totals["runs"] * 100, totals["balls"], 0.0) if batting else rate(totals["balls"], totals["wickets"], 0.0)
+    totals["economy"] = rate(totals["runs"] * 6, totals["balls"], 0.0)
+    totals["average"] = rate(totals["runs"], totals["wickets"], totals["runs"] if batting else 0.0)
+
+    keys = [name for name in totals if name not in QUERY_METRICS]
+    rows = np.flatnonzero(totals["balls"] >= query["min_balls"])
+    sort = totals[query["sort"]][rows]
+    ranks = [pd.factorize(totals[name][rows], sort=True)[0] for name in keys]
+    order = np.lexsort([*reversed(ranks), -sort if query["order"] == 'desc' else sort])
+    top = rows[order[:query["limit"]]]
+    columns = {name: totals[name][top].tolist() for name in keys + query["metrics"]}
+    return {"groups": len(rows), "rows": [dict(zip(columns, row)) for row in zip(*columns.values())]}
+
+
+def run_query(query):
+    seasons = published_seasons() if query["season"] == ALL_SEASONS else [(query["season"], published_season(query["season"]))]
+    parts = []
+    for season, data in seasons:
+        with stage(metrics, "query.plan"):
+            rows = query_rows(data, query)
+        with stage(metrics, "query.aggregate"):
+            parts.append(query_totals(season, data, query, rows))
+    with stage(metrics, "query.combine"):
+        return {"query": query, **query_results(combine_query_totals(parts), query)}
+
+
+@app.route('/query', methods=['GET'])
+def query_deliveries():
+    # {"query": {...normalized request...}, "groups": <groups matched>, "rows": [{<keys>, <metrics>}, ...]}
+    # ?group=batter,phase (some of QUERY_DIMENSIONS) &side=batting|bowling &metrics=runs,economy &team= &opponent=
+    # &venue= &innings= &phase=pp,death &over_from= &over_to= (1-based) &date_from= &date_to= &sort= &order= &limit= &min_balls=
+    query = parse_query()
+    key = cache_key(request.path, [(name, tuple(value) if isinstance(value, list) else value) for name, value in query.items()], request_version())
+    entry = cache_get(query_cache, key)
+    if entry is None:
+        body = app.json.dumps(run_query(query), separators=(',', ':')).encode() + b'\n'
+        entry = {"bodies": {"identity": body}, "mimetype": 'application/json', "headers": {}}
+        cache_put(query_cache, key, entry)
+    return app.response_class(entry["bodies"]["identity"], mimetype=entry["mimetype"])
+
+
+# Per-match views of /batch, computed by the same functions as their single-match routes
+MATCH_VIEWS = {
+    "scorecard": scorecard_payload,
+    "fow": fow_payload,
+    "overs": overs_payload,
+    "partnerships": partnerships_payload,
+}
+MAX_BATCH_ITEMS = 2000
+# Threads rendering batch items; pure Python loops hold the GIL, so the overlap comes mostly
+# from the numpy and pandas parts and from serializing while earlier lines are being sent
+BATCH_WORKERS = int(os.environ.get('IPL_BATCH_WORKERS', os.cpu_count() or 1))
+batch_pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='batch')
+
+
+def parse_match_list(value, season):
+    # "1,2,10-20" -> [1, 2, 10, ..., 20]; every match of the season when not given
+    if value is None:
+        return sorted(season["match_rows"])
+    match_nos = []
+    for part in value.split(','):
+        first, _, last = part.strip().partition('-')
+        if not first.isdigit() or (last and not last.isdigit()):
+            abort(400, description=f"Invalid match list {value!r}, expected numbers and ranges like 1,2,10-20")
+        first, last = int(first), int(last or first)
+        if last < first:
+            abort(400, description=f"Invalid range {part.strip()!r}, the first match must not be after the last")
+        # Sized before it is expanded, so a huge range costs nothing
+        if len(match_nos) + last - first + 1 > MAX_BATCH_ITEMS:
+            abort(400, description=f"At most {MAX_BATCH_ITEMS} matches x views per request")
+        match_nos.extend(range(first, last + 1))
+    missing = [match_no for match_no in match_nos if match_no not in season["match_rows"]]
+    if missing:
+        abort(404, description=f"Matches {', '.join(map(str, missing[:10]))} not found in season {season['season']}")
+    return match_nos
+
+
+def batch_line(season, match_no, view):
+    data = MATCH_VIEWS[view](season, match_no)
+    return app.json.dumps({"match_no": match_no, "view": view, "data": data}, separators=(',', ':')).encode() + b'\n'
+
+
+def batch_lines(season, items):
+    # Lines in request order, each sent as soon as it and the ones before it are done, with up
+    # to two items per worker being rendered ahead of the client
+    items = iter(items)
+    pending = deque(batch_pool.submit(batch_line, season, *item) for item in islice(items, BATCH_WORKERS * 2))
+    try:
+        while pending:
+            line = pending.popleft().result()
+            item = next(items, None)
+            if item is not None:
+                pending.append(batch_pool.submit(batch_line, season, *item))
+            yield line
+    finally:
+        # The client went away; nothing more is rendered for it
+        for future in pending:
+            future.cancel()
+
+
+@app.route('/batch', methods=['GET'])
+def batch_matches():
+    # ?matches=1-74&views=scorecard,fow streams one NDJSON line per (match, view), matches in the
+    # order given: {"data": <the single-match route's response>, "match_no": 1, "view": "scorecard"}
+    season = season_data()
+    match_nos = parse_match_list(request.args.get('matches'), season)
+    views = request.args.get('views', ','.join(MATCH_VIEWS)).split(',')
+    unknown = [view for view in views if view not in MATCH_VIEWS]
+    if unknown:
+        abort(400, description=f"Unknown views {', '.join(unknown)}; expected some of {', '.join(MATCH_VIEWS)}")
+    if len(match_nos) * len(views) > MAX_BATCH_ITEMS:
+        abort(400, description=f"At most {MAX_BATCH_ITEMS} matches x views per request")
+    items = [(match_no, view) for match_no in match_nos for view in views]
+    return app.response_class(batch_lines(season, items), mimetype='application/x-ndjson',
+                              headers={'X-Accel-Buffering': 'no'})
+
+
+# Season export: every match of one or more seasons, one season in memory at a time
+
+def batting_rows(views):
+    for innings in [1, 2]:
+        section = views["scorecard"][f"innings{innings}"]
+        for row in section["batting"]:
+            yield {"innings": innings, "batting_team": section["team"], **row}
 
-    average_analysis = match_history[['innings1_score', 'match_no', 'innings2_score','innings1_wickets','innings2_wickets', 'team1', 'team2', 'toss_winner','toss_decision','winning_team',]]
-    # Calculate the averages, skipping NaN values
-    average_innings1_score = average_analysis['innings1_score'].mean(skipna=True)
-    average_innings2_score = average_analysis['innings2_score'].mean(skipna=True)
-    average_innings1_wickets = average_analysis['innings1_wickets'].mean(skipna=True)
-    average_innings2_wickets = average_analysis['innings2_wickets'].mean(skipna=True)
 
+def bowling_rows(views):
+    for innings in [1, 2]:
+        section = views["scorecard"][f"innings{innings}"]
+        for row in section["bowling"]:
+            yield {"innings": innings, "batting_team": section["team"], **row}
+
+
+def fall_of_wickets_rows(views):
+    fow = views["fow"]
+    for name, wickets in fow["FallOfWickets"].items():
+        for row in wickets:
+            yield {"innings": int(name[len("innings"):]), "batting_team": fow["teams"][name][0]["batting"], **row}
+
+
+def partnership_rows(views):
+    data = views["partnerships"]
+    for innings, partnerships in data["partnership"].items():
+        for row in partnerships:
+            yield {"innings": innings, "batting_team": data.get(f"innings{innings}batting"), **row}
+
+
+# CSV tables: name -> (views needed, rows of one match, columns after season and match_no)
+EXPORT_TABLES = {
+    "batting": (["scorecard"], batting_rows, ['innings', 'batting_team', 'batter', 'runs', 'balls', 'fours', 'sixes', 'dots', 'wicket_type', 'fielder', 'bowler']),
+    "bowling": (["scorecard"], bowling_rows, ['innings', 'batting_team', 'bowler', 'overs', 'runs', 'maidens', 'fours', 'sixes', 'wides', 'no_balls', 'dots', 'wickets']),
+    "fall_of_wickets": (["fow"], fall_of_wickets_rows, ['innings', 'batting_team', 'ball', 'runs_at_wicket_fall', 'player_dismissed']),
+    "partnerships": (["partnerships"], partnership_rows, ['innings', 'batting_team', 'wicket', 'batter1', 'runs1', 'balls1', 'contribution1', 'batter2', 'runs2', 'balls2', 'contribution2', 'extras', 'balls', 'runs', 'unbroken']),
+    "deliveries": ([], None, ['innings', 'over', 'batting_team', 'bowling_team', 'striker', 'non_striker', 'bowler', 'runs_of_bat', 'extras', 'wide', 'legbyes', 'byes', 'noballs', 'wicket_type', 'player_dismissed', 'fielder']),
+}
+EXPORT_FORMATS = {"ndjson": 'application/x-ndjson', "csv": 'text/csv'}
+
+
+def parse_season_list(value):
+    # "2023,2024" or "all"; the latest season when not given
+    if value is None:
+        return [latest_season(registry)]
+    if value == ALL_SEASONS:
+        return season_names(registry)
+    seasons = []
+    for part in value.split(','):
+        part = part.strip()
+        if not part.isdigit() or int(part) not in registry["files"]:
+            abort(404, description=f"Season {part} not found")
+        seasons.append(int(part))
+    return seasons
+
+
+def export_plan(seasons, export_format='ndjson', table=None, views=None):
+    # Checks the options of an export; returns the plan export_header and export_chunks follow
+    if export_format not in EXPORT_FORMATS:
+        abort(400, description=f"Unknown format {export_format}; expected one of {', '.join(EXPORT_FORMATS)}")
+    if export_format == 'csv':
+        if table not in EXPORT_TABLES:
+            abort(400, description=f"format=csv needs table= one of {', '.join(EXPORT_TABLES)}")
+        views = EXPORT_TABLES[table][0]
+    else:
+        views = views.split(',') if views else list(MATCH_VIEWS)
+        unknown = [view for view in views if view not in MATCH_VIEWS]
+        if unknown:
+            abort(400, description=f"Unknown views {', '.join(unknown)}; expected some of {', '.join(MATCH_VIEWS)}")
+    return {"seasons": parse_season_list(seasons), "format": export_format, "table": table, "views": views}
+
+
+def export_season(season):
+    # Seasons being served or fed live come from the registry; the rest are read for the
+    # export alone and dropped once walked, so memory stays at one season however many are exported
+    if season in live_deliveries or loaded_season(registry, season) is not None:
+        return published_season(season)
+    return read_season(registry, season)
+
+
+def export_header(plan):
+    if plan["format"] != 'csv':
+        return b''
+    return (','.join(['season', 'match_no'] + EXPORT_TABLES[plan["table"]][2]) + '\r\n').encode()
+
+
+def export_match(plan, data, match_no):
+    # The bytes of one match: an NDJSON line with its views, or its rows of a CSV table
+    views = {view: MATCH_VIEWS[view](data, match_no) for view in plan["views"]}
+    if plan["format"] == 'ndjson':
+        record = {"season": data["season"], "match_no": match_no, **views}
+        return app.json.dumps(record, separators=(',', ':')).encode() + b'\n'
+
+    _, table_rows, columns = EXPORT_TABLES[plan["table"]]
+    if table_rows is None:
+        rows = frame_records(get_match(data, match_no)[1][columns])
+    else:
+        rows = table_rows(views)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # Missing values (None, or NaN from the frames) are written as empty fields
+        writer.writerow([data["season"], match_no] + [None if value != value else value for value in map(row.get, columns)])
+    return buffer.getvalue().encode()
+
+
+def export_chunks(plan):
+    # One chunk per match, so a client sees the first match as soon as it is rendered
+    for season in plan["seasons"]:
+        data = export_season(season)
+        for match_no in sorted(data["match_rows"]):
+            yield export_match(plan, data, match_no)
+        del data  # Released before the next season is read
+
+
+@app.route('/export', methods=['GET'])
+def export_seasons():
+    # ?season=2023,2024|all&format=ndjson[&views=scorecard,fow] streams one line per match with its
+    # views; format=csv&table=batting|bowling|fall_of_wickets|partnerships|deliveries streams one table
+    plan = export_plan(request.args.get('season'), request.args.get('format', 'ndjson'), request.args.get('table'), request.args.get('views'))
+    name = f"ipl-{'-'.join(map(str, plan['seasons'])) if len(plan['seasons']) < 4 else 'seasons'}{'-' + plan['table'] if plan['table'] else ''}.{plan['format']}"
+    body = chain([export_header(plan)], export_chunks(plan))
+    return app.response_class(body, mimetype=EXPORT_FORMATS[plan["format"]],
+                              headers={'Content-Disposition': f'attachment; filename="{name}"', 'X-Accel-Buffering': 'no'})
+
+
+def league_averages(average_analysis):
+    # League-wide averages, identical for every team of a season
     average_won_batting_first = average_analysis[((average_analysis["winning_team"] == average_analysis["team1"]) | (average_analysis["winning_team"] == average_analysis["team2"]) ) & (average_analysis["toss_decision"] == "bat") & (average_analysis["winning_team"] != "TIE")].shape[0]
     average_won_bowling_first = average_analysis[((average_analysis["winning_team"] == average_analysis["team1"]) | (average_analysis["winning_team"] == average_analysis["team2"])) & (average_analysis["toss_decision"] == "field") & (average_analysis["winning_team"] != "TIE")].shape[0]
 
-    average_overall_score = pd.concat([average_analysis['innings1_score'],average_analysis['innings2_score']]).dropna().mean()
-    average_overall_wickets = pd.concat([average_analysis['innings1_wickets'], average_analysis['innings2_wickets']]).dropna().mean()
+    return {
+        # Calculate the averages, skipping NaN values
+        "avg_score_batting_first": average_analysis['innings1_score'].mean(skipna=True),
+        "avg_score_batting_second": average_analysis['innings2_score'].mean(skipna=True),
+        "avg_wicket_bowling_first": average_analysis['innings1_wickets'].mean(skipna=True),
+        "avg_wicket_bowling_second": average_analysis['innings2_wickets'].mean(skipna=True),
+        "team_won_batting_first": average_won_batting_first,
+        "team_won_bowling_first": average_won_bowling_first,
+        "overall_avg_score": pd.concat([average_analysis['innings1_score'],average_analysis['innings2_score']]).dropna().mean(),
+        "overall_wickets": pd.concat([average_analysis['innings1_wickets'], average_analysis['innings2_wickets']]).dropna().mean()
+    }
 
+
+def team_summary(average_analysis, team_name):
     # This is team infromation
     batting_first = average_analysis[average_analysis["team1"] == team_name]["innings1_score"]
     batting_second = average_analysis[average_analysis["team2"] == team_name]["innings2_score"]
     wickets_first = average_analysis[average_analysis["team2"] == team_name]["innings2_wickets"]
     wickets_second = average_analysis[average_analysis["team1"] == team_name]["innings1_wickets"]
 
-    batting_first_count = batting_first.shape[0]
-    batting_second_count = batting_second.shape[0]
     team_won_batting_first = average_analysis[(average_analysis["winning_team"] == team_name)  & (average_analysis["team1"] == team_name) & (average_analysis["winning_team"] != "TIE")].shape[0]
     team_won_bowling_first = average_analysis[(average_analysis["winning_team"] == team_name)  & (average_analysis["team2"] == team_name) & (average_analysis["winning_team"] != "TIE")].shape[0]
 
-    # Compute averages, ignoring NaN values
-    avg_score_batting_first = batting_first.dropna().mean()
-    avg_score_batting_second = batting_second.dropna().mean()
-    avg_wicket_bowling_first = wickets_first.dropna().mean()
-    avg_wicket_bowling_second = wickets_second.dropna().mean()
-    
-    # Compute overall average score
-    overall_avg_score = pd.concat([batting_first, batting_second]).dropna().mean()
-    overall_wickets = pd.concat([wickets_first, wickets_second]).dropna().mean()
-
-
-    # Calculate points
+    # Calculate points, limited to the league stage
     team_matches = average_analysis[(average_analysis["team1"] == team_name) | (average_analysis["team2"] == team_name)]
-    # Limit to the first 70 matches
-    team_matches = team_matches[team_matches["match_no"] <= 70]
+    team_matches = team_matches[team_matches["league_stage"]]
     wins = team_matches[team_matches["winning_team"] == team_name].shape[0] * 2
     ties = team_matches[team_matches["winning_team"] == "TIE"].shape[0] * 1
-    total_points = wins + ties
-
-    # Team's Player Stats Code
-
-    batting_data = ball_by_ball[ball_by_ball["batting_team"] == team_name]
-    bowling_data = ball_by_ball[ball_by_ball["bowling_team"] == team_name]
-
-    # Get list of unique batters and bowlers
-    batters = batting_data["striker"].unique()
-    bowlers = bowling_data["bowler"].unique()
-
-    batter_stats = []
-    bowler_stats = []
-
-    # Compute Batting Stats
-    for batter in batters:
-        player_data = batting_data[batting_data["striker"] == batter]
-
-        runs = int(player_data["runs_of_bat"].sum())  
-        balls = player_data[player_data["wide"] != 1].shape[0]
-        matches_played = int(player_data["match_no"].nunique())  
-        dismissals = int(player_data[player_data["player_dismissed"] == batter]["match_no"].nunique())
-        not_outs = matches_played - dismissals
-        high_score = int(player_data.groupby("match_no")["runs_of_bat"].sum().max() or 0)
-        avg = float(runs / dismissals) if dismissals > 0 else float(runs)
-        sr = float((runs / balls * 100) if balls > 0 else 0)
-        centuries = int((player_data.groupby("match_no")["runs_of_bat"].sum() >= 100).sum())
-        fifties = int(player_data.groupby("match_no")["runs_of_bat"].sum().between(50, 99).sum())
-        fours = int((player_data["runs_of_bat"] == 4).sum())
-        sixes = int((player_data["runs_of_bat"] == 6).sum())
-
-        batter_stats.append({
-            "player": batter,
-            "runs": runs,
-            "balls": balls,
-            "matches": matches_played,
-            "not_outs": not_outs,
-            "high_score": high_score,
-            "average": round(avg, 2),
-            "strike_rate": round(sr, 2),
-            "hundreds": centuries,
-            "fiftys": fifties,
-            "fours": fours,
-            "sixes": sixes
-        })
 
-    for bowler in bowlers:
-        player_data = bowling_data[bowling_data["bowler"] == bowler]
-
-        wkts = int(player_data["player_dismissed"].notna().sum())
-        matches_played = int(player_data["match_no"].nunique())
-        overs = player_data.shape[0] // 6 + (player_data.shape[0] % 6) * 0.1
-        runs_conceded = int(player_data["runs_of_bat"].sum() + player_data["extras"].sum())
-        avg = float((runs_conceded / wkts) if wkts > 0 else 0)
-        econ = float(runs_conceded / overs if overs > 0 else 0)
-        sr = float(player_data.shape[0] / wkts if wkts > 0 else 0)
-
-        wickets_per_match = player_data.groupby("match_no")["player_dismissed"].count()
-        three_wkt_hauls = int((wickets_per_match >= 3).sum())
-        four_wkt_hauls = int((wickets_per_match >= 4).sum())
-        five_wkt_hauls = int((wickets_per_match >= 5).sum())
-
-        bowler_stats.append({
-            "player": bowler,
-            "wickets": wkts,
-            "matches": matches_played,
-            "innings": matches_played,  
-            "overs": overs,
-            "runs_conceded": runs_conceded,
-            "average": round(avg, 2),
-            "economy": round(econ, 2),
-            "strike_rate": round(sr, 2),
-            "three_w": three_wkt_hauls,
-            "four_w": four_wkt_hauls,
-            "five_w": five_wkt_hauls
-        })
+    # Compute averages, ignoring NaN values
+    return {
+        "avg_score_batting_first":batting_first.dropna().mean(),
+        "avg_score_batting_second":batting_second.dropna().mean(),
+        "avg_wicket_bowling_first":wickets_first.dropna().mean(),
+        "avg_wicket_bowling_second":wickets_second.dropna().mean(),
+        "team_won_batting_first":team_won_batting_first,
+        "batting_first_count":batting_first.shape[0],
+        "bowling_first_count":batting_second.shape[0],
+        "team_won_bowling_first":team_won_bowling_first,
+        "overall_avg_score":pd.concat([batting_first, batting_second]).dropna().mean(),
+        "overall_wickets":pd.concat([wickets_first, wickets_second]).dropna().mean(),
+        "points":wins + ties
+    }
 
-    batter_stats.sort(key=lambda x: x["runs"], reverse=True)  # Sort batters by runs (highest first)
-    bowler_stats.sort(key=lambda x: x["wickets"], reverse=True)  # Sort bowlers by wickets (highest first)
 
+def team_batter_totals(deliveries):
+    # Batter totals of every team in one grouped pass, batters in order of first appearance
+    balls = deliveries.assign(
+        four=deliveries["runs_of_bat"] == 4,
+        six=deliveries["runs_of_bat"] == 6,
+        out=deliveries["player_dismissed"] == deliveries["striker"],
+    )
+    per_match = balls.groupby(["batting_team", "striker", "match_no"], sort=False).agg(
+        runs=("runs_of_bat", "sum"), balls=("ball_faced", "sum"), fours=("four", "sum"), sixes=("six", "sum"), out=("out", "any"),
+    ).reset_index()
+    per_match["hundred"] = per_match["runs"] >= 100
+    per_match["fifty"] = per_match["runs"].between(50, 99)
 
+    return per_match.groupby(["batting_team", "striker"], sort=False).agg(
+        runs=("runs", "sum"), balls=("balls", "sum"), matches=("match_no", "size"), dismissals=("out", "sum"),
+        high_score=("runs", "max"), hundreds=("hundred", "sum"), fiftys=("fifty", "sum"), fours=("fours", "sum"), sixes=("sixes", "sum"),
+    ).reset_index()
 
 
-    return jsonify({
-        "average_analysis":{
-            "avg_score_batting_first": average_innings1_score,
-            "avg_score_batting_second": average_innings2_score,
-            "avg_wicket_bowling_first": average_innings1_wickets,
-            "avg_wicket_bowling_second":average_innings2_wickets,
-            "team_won_batting_first":average_won_batting_first,
-            "team_won_bowling_first":average_won_bowling_first,
-            "overall_avg_score": average_overall_score,
-            "overall_wickets":average_overall_wickets
-        },
-        "teamAnalysis":{
-            "avg_score_batting_first":avg_score_batting_first,
-            "avg_score_batting_second":avg_score_batting_second,
-            "avg_wicket_bowling_first":avg_wicket_bowling_first,
-            "avg_wicket_bowling_second":avg_wicket_bowling_second,
-            "team_won_batting_first":team_won_batting_first,
-            "batting_first_count":batting_first_count,
-            "bowling_first_count":batting_second_count,
-            "team_won_bowling_first":team_won_bowling_first,
-            "overall_avg_score":overall_avg_score,
-            "overall_wickets":overall_wickets,
-            "points":total_points
-        },
-        "batterStats": batter_stats,
-        "bowlerStats": bowler_stats
-    })
+def team_batter_tables(players):
+    # {team: batterStats} from team_batter_totals
+    tables = {}
+    # Sort batters by runs (highest first)
+    for team, rows in players.sort_values("runs", ascending=False, kind="stable").groupby("batting_team", sort=False):
+        tables[team] = []
+        for row in rows.itertuples(index=False):
+            runs, balls, dismissals = int(row.runs), int(row.balls), int(row.dismissals)
+            tables[team].append({
+                "player": row.striker,
+                "runs": runs,
+                "balls": balls,
+                "matches": int(row.matches),
+                "not_outs": int(row.matches) - dismissals,
+                "high_score": int(row.high_score),
+                "average": round(float(runs / dismissals) if dismissals > 0 else float(runs), 2),
+                "strike_rate": round(float((runs / balls * 100) if balls > 0 else 0), 2),
+                "hundreds": int(row.hundreds),
+                "fiftys": int(row.fiftys),
+                "fours": int(row.fours),
+                "sixes": int(row.sixes)
+            })
+    return tables
 
-@app.get("/get-venue/<venue_name>")
-def get_venue_stats(venue_name: str):
-    # Filter matches played at the venue from match history
-    venue_matches = match_history[match_history["venue"] == venue_name]
-    
-    # Get all match numbers played at this venue
-    match_numbers = venue_matches["match_no"].unique()
-    
-    # Filter ball-by-ball data using match numbers
-    venue_balls = ball_by_ball[ball_by_ball["match_no"].isin(match_numbers)]
 
-    # Basic venue details
-    city = venue_matches["city"].iloc[0] if "city" in venue_matches.columns else "Unknown"
-    matches_played = len(venue_matches)
+def team_bowler_totals(deliveries):
+    # Bowler totals of every team in one grouped pass, bowlers in order of first appearance
+    per_match = deliveries.groupby(["bowling_team", "bowler", "match_no"], sort=False).agg(
+        deliveries=("legal_ball", "sum"), runs=("bowler_runs", "sum"), wickets=("is_bowler_wicket", "sum"),
+    ).reset_index()
+    for hauls in [3, 4, 5]:
+        per_match[f"haul{hauls}"] = per_match["wickets"] >= hauls
+
+    return per_match.groupby(["bowling_team", "bowler"], sort=False).agg(
+        deliveries=("deliveries", "sum"), runs=("runs", "sum"), wickets=("wickets", "sum"), matches=("match_no", "size"),
+        three_w=("haul3", "sum"), four_w=("haul4", "sum"), five_w=("haul5", "sum"),
+    ).reset_index()
 
-    # Batting and bowling stats
-    avg_score_batting_first = venue_matches["innings1_score"].mean()
-    avg_score_batting_second = venue_matches["innings2_score"].mean()
 
-    avg_wickets_bowling_first = venue_matches["innings1_wickets"].mean()
-    avg_wickets_bowling_second = venue_matches["innings2_wickets"].mean()
+def team_bowler_tables(players):
+    # {team: bowlerStats} from team_bowler_totals
+    tables = {}
+    # Sort bowlers by wickets (highest first)
+    for team, rows in players.sort_values("wickets", ascending=False, kind="stable").groupby("bowling_team", sort=False):
+        tables[team] = []
+        for row in rows.itertuples(index=False):
+            wkts, runs_conceded, deliveries_bowled = int(row.wickets), int(row.runs), int(row.deliveries)
+            overs = deliveries_bowled // 6 + (deliveries_bowled % 6) * 0.1
+            tables[team].append({
+                "player": row.bowler,
+                "wickets": wkts,
+                "matches": int(row.matches),
+                "innings": int(row.matches),
+                "overs": overs,
+                "runs_conceded": runs_conceded,
+                "average": round(float((runs_conceded / wkts) if wkts > 0 else 0), 2),
+                "economy": round(float(runs_conceded / overs if overs > 0 else 0), 2),
+                "strike_rate": round(float(deliveries_bowled / wkts if wkts > 0 else 0), 2),
+                "three_w": int(row.three_w),
+                "four_w": int(row.four_w),
+                "five_w": int(row.five_w)
+            })
+    return tables
 
-    matches_won_batting_first = len(venue_matches[venue_matches["winning_team"] == venue_matches["team1"]])
-    matches_won_batting_second = len(venue_matches[venue_matches["winning_team"] == venue_matches["team2"]])
 
-    highest_scorer = (
-        venue_balls.groupby(["match_no", "striker"])["runs_of_bat"]
-        .sum()
-        .reset_index()
-        .sort_values(by="runs_of_bat", ascending=False)
-        .iloc[0]
-    )
-    # Count valid balls faced (excluding byes, legbyes, wide)
-    balls_faced = venue_balls[
-        (venue_balls["match_no"] == highest_scorer["match_no"]) &
-        (venue_balls["striker"] == highest_scorer["striker"]) &
-        (venue_balls["byes"] == 0) &
-        (venue_balls["legbyes"] == 0) &
-        (venue_balls["wide"] == 0)
-    ].shape[0]
-
-    highest_scorer_details = {
-        "match_no": highest_scorer["match_no"],
-        "batter": highest_scorer["striker"],
-        "runs": highest_scorer["runs_of_bat"],
-        "balls_faced": balls_faced
+def build_team_analytics(matches, batter_totals, bowler_totals):
+    # {team: /get-teams payload} for every team of the matches given
+    averages = league_averages(matches)
+    batters = team_batter_tables(batter_totals)
+    bowlers = team_bowler_tables(bowler_totals)
+    teams = pd.unique(pd.concat([matches["team1"], matches["team2"]]))
+    return {
+        team: {
+            "average_analysis": averages,
+            "teamAnalysis": team_summary(matches, team),
+            "batterStats": batters.get(team, []),
+            "bowlerStats": bowlers.get(team, []),
+        }
+        for team in teams
     }
 
-    # 2. Highest Wicket-Taker in a Single Match
-    highest_wicket_taker = (
-        venue_balls[venue_balls["wicket_type"].notna() & (venue_balls["wicket_type"] != "runout")]
-        .groupby(["match_no", "bowler"])["wicket_type"]
-        .count()
-        .reset_index()
-        .sort_values(by="wicket_type", ascending=False)
-        .iloc[0]
-    )
 
-    # Count valid balls bowled (excluding wide and no-balls)
-    balls_bowled = venue_balls[
-        (venue_balls["match_no"] == highest_wicket_taker["match_no"]) &
-        (venue_balls["bowler"] == highest_wicket_taker["bowler"]) &
-        (venue_balls["wide"] == 0) &
-        (venue_balls["noballs"] == 0)
-    ].shape[0]
-
-# 3. Runs & Wickets conceded in different phases (PP, Middle, Death) for both innings
-    phase_stats = {
-        "firstInnings": {
-            "Powerplay": {"runs": 0, "wickets": 0},
-            "Middle": {"runs": 0, "wickets": 0},
-            "Death": {"runs": 0, "wickets": 0},
-        },
-        "secondInnings": {
-            "Powerplay": {"runs": 0, "wickets": 0},
-            "Middle": {"runs": 0, "wickets": 0},
-            "Death": {"runs": 0, "wickets": 0},
-        },
-    }
+def combine_team_analytics(seasons):
+    # All-time /get-teams payloads, re-aggregated from each season's match list and per player totals
+    matches, batters, bowlers = [], [], []
+    for data in seasons:
+        tables = season_table(data, "teams")
+        matches.append(data["match_history"][TEAM_MATCH_COLUMNS].astype({"team1": object, "team2": object, "winning_team": object}))
+        batters.append(tables["batter_totals"].astype({"batting_team": object, "striker": object}))
+        bowlers.append(tables["bowler_totals"].astype({"bowling_team": object, "bowler": object}))
+    matches = pd.concat(matches, ignore_index=True)
+    batters = pd.concat(batters, ignore_index=True)
+    bowlers = pd.concat(bowlers, ignore_index=True)
+    batters = batters.groupby(["batting_team", "striker"], sort=False).agg(
+        runs=("runs", "sum"), balls=("balls", "sum"), matches=("matches", "sum"), dismissals=("dismissals", "sum"),
+        high_score=("high_score", "max"), hundreds=("hundreds", "sum"), fiftys=("fiftys", "sum"), fours=("fours", "sum"), sixes=("sixes", "sum"),
+    ).reset_index()
+    bowlers = bowlers.groupby(["bowling_team", "bowler"], sort=False).sum().reset_index()
+    return build_team_analytics(matches, batters, bowlers)
 
-    # Iterate over innings
-    for innings in [1, 2]:
-        innings_key = "firstInnings" if innings == 1 else "secondInnings"
-        innings_data = venue_balls[venue_balls["innings"] == innings]
-
-        # Iterate over phases
-        for phase, (start, end) in zip(["Powerplay", "Middle", "Death"], [(0, 6), (7, 15), (16, 20)]):
-            phase_data = innings_data[(innings_data["over"] >= start) & (innings_data["over"] <= end)]
-            
-            # Convert values to int to avoid serialization issues
-            phase_stats[innings_key][phase]["runs"] = int(phase_data["runs_of_bat"].sum() + phase_data["extras"].sum())
-            phase_stats[innings_key][phase]["wickets"] = int(phase_data["wicket_type"].count())
-
-
-
-    return jsonify({
-        "venue_name": venue_name,
-        "city": city,
-        "matches_played": int(matches_played),
-        "avg_score_batting_first": float(avg_score_batting_first),
-        "avg_score_batting_second": float(avg_score_batting_second),
-        "avg_wickets_bowling_first": float(avg_wickets_bowling_first),
-        "avg_wickets_bowling_second": float(avg_wickets_bowling_second),
-        "matches_won_batting_first": int(matches_won_batting_first),
-        "matches_won_batting_second": int(matches_won_batting_second),
-        "highest_scorer": {
-            "match_no": int(highest_scorer["match_no"]),
-            "batter": highest_scorer["striker"],
-            "runs": int(highest_scorer["runs_of_bat"]),
-            "balls_faced": int(balls_faced)
-        },
-        "highest_wicket_taker": {
-            "match_no": int(highest_wicket_taker["match_no"]),
-            "bowler": highest_wicket_taker["bowler"],
-            "wickets": int(highest_wicket_taker["wicket_type"]),
-            "balls_bowled": int(balls_bowled)
-        },
-        "phase_stats": phase_stats
-    })
 
-@app.route('/get-stats', methods=['GET'])
-def calculate_stats():
-    # Calculate batting and bowling stats separately
-    batting_stats = calculate_batting_stats(ball_by_ball)
-    bowling_stats = calculate_bowling_stats(ball_by_ball)
+# Match columns the team analytics read
+TEAM_MATCH_COLUMNS = ["match_no", "team1", "team2", "toss_decision", "winning_team", "innings1_score", "innings1_wickets", "innings2_score", "innings2_wickets", "league_stage"]
 
-    response = {
-        **batting_stats,
-        **bowling_stats
-    }
 
-    return jsonify(response)
+@app.route('/get-teams/<team_name>', methods=['GET'])
+def get_partnership_from_match_no(team_name):
+    season = season_data(allow_all=True)
+    if season == ALL_SEASONS:
+        teams = all_seasons_payload("teams", lambda: combine_team_analytics(data for _, data in published_seasons()))
+        if team_name not in teams:
+            abort(404, description=f"Team {team_name} not found")
+        return jsonify(teams[team_name])
 
-def calculate_batting_stats(ball_by_ball):
-    batting_cols = ['match_no', 'batting_team', 'bowling_team', 'striker', 'runs_of_bat', 'extras', 'wide', 'over', 'player_dismissed']
-    batting_df = ball_by_ball[batting_cols].copy()
-    
-    # Count only valid balls faced (excluding wides)
-    batting_df['valid_ball'] = batting_df['wide'] == 0
-    
-    # Group by 'striker' to get cumulative stats
-    batting_stats = batting_df.groupby('striker').agg(
-        Team=('batting_team', lambda x: x.mode().iloc[0]),
-        Runs=('runs_of_bat', 'sum'),
-        Innings=('match_no', pd.Series.nunique),
-        Balls_Faced=('valid_ball', 'sum'),
-        Fours=('runs_of_bat', lambda x: (x == 4).sum()),
-        Sixes=('runs_of_bat', lambda x: (x == 6).sum())
-    ).reset_index()
+    teams = season_table(season, "teams")["team_analytics"]
+    if team_name not in teams:
+        abort(404, description=f"Team {team_name} not found in season {season['season']}")
+    return jsonify(teams[team_name])
 
-    dismissals = batting_df.groupby('striker')['player_dismissed'].count().reset_index()
-    dismissals.rename(columns={'player_dismissed': 'Dismissals'}, inplace=True)
+# /get-venue names of the phases in PHASES
+PHASE_NAMES = ["Powerplay", "Middle", "Death"]
 
-    batting_stats = batting_stats.merge(dismissals, on='striker', how='left').fillna(0)
-    batting_stats['Not_Outs'] = batting_stats['Innings'] - batting_stats['Dismissals']
 
-    # Highest individual score per match
-    highest_scores = batting_df.groupby(['match_no', 'striker']).agg(
-        Match_Runs=('runs_of_bat', 'sum'),
-        Opponent_Team=('bowling_team', 'first')
-    ).reset_index()
-    
-    # Get highest score for each player
-    max_scores = highest_scores.groupby('striker').agg(
-        Highest_Score=('Match_Runs', 'max')
-    ).reset_index()
+def venue_id(venue_name):
+    # Canonical venue key: the stadium name without city, e.g. "Wankhede Stadium, Mumbai, Mumbai" -> "wankhede-stadium"
+    return re.sub(r'[^a-z0-9]+', '-', venue_name.split(',')[0].lower()).strip('-')
+
 
-    batting_stats = batting_stats.merge(max_scores, on='striker', how='left')
+def build_venue_cube(matches, deliveries, top_k=5):
+    # Every /get-venue payload keyed by canonical venue id, computed in grouped passes over the season
+    matches = matches.assign(venue_id=matches["venue"].map(venue_id))
+    match_venue = dict(zip(matches["match_no"], matches["venue_id"]))
 
-    # Calculate Batting Average & Strike Rate
-    batting_stats['Average'] = batting_stats.apply(
-        lambda row: round(row['Runs'] / (row['Innings'] - row['Not_Outs']), 1) if (row['Innings'] - row['Not_Outs']) > 0 else round(row['Runs'], 1),
-        axis=1
+    balls = deliveries.assign(venue_id=deliveries["match_no"].map(match_venue))
+
+    # Runs and wickets per venue x innings x phase
+    phases = balls[balls["innings"].isin([1, 2]) & (balls["phase"] >= 0)].groupby(["venue_id", "innings", "phase"]).agg(
+        runs=("total_runs", "sum"), wickets=("wicket_type", "count"),
     )
-    batting_stats['SR'] = round((batting_stats['Runs'] / batting_stats['Balls_Faced']) * 100, 1)
 
+    # Top individual innings and bowling figures per venue
+    innings_scores = balls.groupby(["venue_id", "match_no", "striker"], sort=False).agg(
+        runs=("runs_of_bat", "sum"), balls_faced=("ball_faced", "sum"),
+    ).reset_index()
+    top_scores = innings_scores.sort_values(["runs", "balls_faced", "match_no"], ascending=[False, True, True], kind="stable").groupby("venue_id").head(top_k)
 
-    # Count centuries and half-centuries
-    batting_100s_50s = highest_scores.groupby('striker').agg(
-        Hundreds=('Match_Runs', lambda x: (x >= 100).sum()),
-        Fifties=('Match_Runs', lambda x: ((x >= 50) & (x < 100)).sum())
+    bowling_figures = balls.groupby(["venue_id", "match_no", "bowler"], sort=False).agg(
+        wickets=("is_bowler_wicket", "sum"), runs_conceded=("bowler_runs", "sum"), balls_bowled=("legal_ball", "sum"),
     ).reset_index()
+    top_figures = bowling_figures[bowling_figures["wickets"] > 0].sort_values(
+        ["wickets", "runs_conceded", "match_no"], ascending=[False, True, True], kind="stable").groupby("venue_id").head(top_k)
+
+    scorers_by_venue = {venue: [{
+        "match_no": int(row.match_no),
+        "batter": row.striker,
+        "runs": int(row.runs),
+        "balls_faced": int(row.balls_faced)
+    } for row in rows.itertuples()] for venue, rows in top_scores.groupby("venue_id")}
+    bowlers_by_venue = {venue: [{
+        "match_no": int(row.match_no),
+        "bowler": row.bowler,
+        "wickets": int(row.wickets),
+        "runs_conceded": int(row.runs_conceded),
+        "balls_bowled": int(row.balls_bowled)
+    } for row in rows.itertuples()] for venue, rows in top_figures.groupby("venue_id")}
+
+    phase_stats = {}
+    for venue in matches["venue_id"].unique():
+        phase_stats[venue] = {}
+        for innings, innings_key in [(1, "firstInnings"), (2, "secondInnings")]:
+            phase_stats[venue][innings_key] = {}
+            for phase, phase_name in enumerate(PHASE_NAMES):
+                key = (venue, innings, phase)
+                phase_stats[venue][innings_key][phase_name] = {
+                    "runs": int(phases.at[key, "runs"]) if key in phases.index else 0,
+                    "wickets": int(phases.at[key, "wickets"]) if key in phases.index else 0,
+                }
+    return venue_payloads(matches, phase_stats, scorers_by_venue, bowlers_by_venue)
+
+
+def venue_match_stats(matches):
+    # Match level numbers per venue id
+    return matches.assign(
+        won_batting_first=matches["winning_team"] == matches["team1"],
+        won_batting_second=matches["winning_team"] == matches["team2"],
+    ).groupby("venue_id", sort=False).agg(
+        venue_name=("venue", lambda names: names.mode().iloc[0]),
+        city=("city", "first"),
+        matches_played=("match_no", "size"),
+        avg_score_batting_first=("innings1_score", "mean"),
+        avg_score_batting_second=("innings2_score", "mean"),
+        avg_wickets_bowling_first=("innings1_wickets", "mean"),
+        avg_wickets_bowling_second=("innings2_wickets", "mean"),
+        matches_won_batting_first=("won_batting_first", "sum"),
+        matches_won_batting_second=("won_batting_second", "sum"),
+    )
 
-    batting_stats = batting_stats.merge(batting_100s_50s, on='striker', how='left')
-    batting_stats["Striker"] = batting_stats["striker"]
-    # Identify fastest 50s and 100s
-    batting_df['cumulative_runs'] = batting_df.groupby(['match_no', 'striker'])['runs_of_bat'].cumsum()
-    batting_df['cumulative_balls'] = batting_df.groupby(['match_no', 'striker'])['valid_ball'].cumsum()
-
-    innings_stats = batting_df.groupby(['match_no', 'striker', 'batting_team', 'bowling_team']).agg(
-        Final_Score=('cumulative_runs', 'max'),
-        Fours=('runs_of_bat', lambda x: (x == 4).sum()),
-        Sixes=('runs_of_bat', lambda x: (x == 6).sum())
+
+def venue_payloads(matches, phase_stats, scorers_by_venue, bowlers_by_venue):
+    # /get-venue payloads keyed by venue id
+    cube = {}
+    for venue, row in venue_match_stats(matches).iterrows():
+        top_scorers = scorers_by_venue.get(venue, [])
+        top_wicket_takers = bowlers_by_venue.get(venue, [])
+        cube[venue] = {
+            "venue_id": venue,
+            "venue_name": row["venue_name"],
+            "city": row["city"],
+            "matches_played": int(row["matches_played"]),
+            "avg_score_batting_first": float(row["avg_score_batting_first"]),
+            "avg_score_batting_second": float(row["avg_score_batting_second"]),
+            "avg_wickets_bowling_first": float(row["avg_wickets_bowling_first"]),
+            "avg_wickets_bowling_second": float(row["avg_wickets_bowling_second"]),
+            "matches_won_batting_first": int(row["matches_won_batting_first"]),
+            "matches_won_batting_second": int(row["matches_won_batting_second"]),
+            "highest_scorer": top_scorers[0] if top_scorers else None,
+            "highest_wicket_taker": top_wicket_takers[0] if top_wicket_takers else None,
+            "top_scorers": top_scorers,
+            "top_wicket_takers": top_wicket_takers,
+            "phase_stats": phase_stats[venue]
+        }
+    return cube
+
+
+def combine_venue_cubes(seasons, top_k=5):
+    # All-time (cube, aliases): match level numbers over every season's matches, phase totals summed
+    # and each season's top performances merged (tagged with their season, match numbers repeat)
+    matches, phase_stats, scorers, bowlers, aliases = [], {}, {}, {}, {}
+    for season, data in seasons:
+        venue_cube, venue_aliases = season_table(data, "venues")
+        aliases.update(venue_aliases)
+        season_matches = data["match_history"][VENUE_MATCH_COLUMNS].astype(object)
+        matches.append(season_matches.assign(venue_id=season_matches["venue"].map(venue_id)))
+        for venue, payload in venue_cube.items():
+            totals = phase_stats.setdefault(venue, {innings: {phase: {"runs": 0, "wickets": 0} for phase in PHASE_NAMES} for innings in payload["phase_stats"]})
+            for innings, phases in payload["phase_stats"].items():
+                for phase, stats in phases.items():
+                    totals[innings][phase]["runs"] += stats["runs"]
+                    totals[innings][phase]["wickets"] += stats["wickets"]
+            scorers.setdefault(venue, []).extend({"season": season, **entry} for entry in payload["top_scorers"])
+            bowlers.setdefault(venue, []).extend({"season": season, **entry} for entry in payload["top_wicket_takers"])
+
+    scorers = {venue: sorted(entries, key=lambda e: (-e["runs"], e["balls_faced"], e["season"], e["match_no"]))[:top_k] for venue, entries in scorers.items()}
+    bowlers = {venue: sorted(entries, key=lambda e: (-e["wickets"], e["runs_conceded"], e["season"], e["match_no"]))[:top_k] for venue, entries in bowlers.items()}
+    return venue_payloads(pd.concat(matches, ignore_index=True), phase_stats, scorers, bowlers), aliases
+
+
+# Match columns the venue payloads read
+VENUE_MATCH_COLUMNS = ["match_no", "venue", "city", "team1", "team2", "winning_team", "innings1_score", "innings1_wickets", "innings2_score", "innings2_wickets"]
+
+
+def build_venue_aliases(cube, matches, deliveries):
+    # Full venue names from both CSVs and the canonical ids all resolve to a venue id
+    aliases = {venue: venue for venue in cube}
+    for name in pd.concat([matches["venue"], deliveries["venue"]]).unique():
+        if venue_id(name) in cube:
+            aliases[name.casefold()] = venue_id(name)
+    return aliases
+
+
+def venue_tables(season):
+    # (cube, aliases) of a loaded season or of every season
+    if season == ALL_SEASONS:
+        return all_seasons_payload("venues", lambda: combine_venue_cubes(published_seasons()))
+    return season_table(season, "venues")
+
+
+@app.get("/get-venue/<venue_name>")
+def get_venue_stats(venue_name: str):
+    venue_cube, venue_aliases = venue_tables(season_data(allow_all=True))
+    venue = venue_aliases.get(venue_name.casefold(), venue_aliases.get(venue_id(venue_name)))
+    if venue is None:
+        abort(404, description=f"Venue {venue_name} not found")
+    return jsonify(venue_cube[venue])
+
+
+@app.get("/get-venues")
+def get_all_venue_stats():
+    # Every venue at once, for comparing grounds side by side
+    venue_cube, _ = venue_tables(season_data(allow_all=True))
+    return jsonify(list(venue_cube.values()))
+
+def get_season_stats(season):
+    # Leaderboards are computed once per dataset version and then served from memory
+    season_stats = season["season_stats"]
+    ball_by_ball = season["ball_by_ball"]
+    with season["lock"]:
+        if season_stats["version"] != season["version"]:
+            if season_stats["payload"] is not None:
+                # Deliveries posted since the last computation only touch a few players
+                season_stats["payload"] = update_season_stats(season_stats["payload"], ball_by_ball, ball_by_ball.iloc[season_stats["rows"]:])
+            else:
+                # Calculate batting and bowling stats separately
+                batting_stats = calculate_batting_stats(ball_by_ball)
+                bowling_stats = calculate_bowling_stats(ball_by_ball.copy())  # Adds helper columns to its input
+                season_stats["payload"] = {
+                    **batting_stats,
+                    **bowling_stats
+                }
+            season_stats["version"] = season["version"]
+            season_stats["rows"] = len(ball_by_ball)
+        return season_stats["version"], season_stats["payload"]
+
+
+def fastest_innings(frames):
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return []
+    return frame_records(pd.concat(frames, ignore_index=True).sort_values(by='Balls_Taken', kind='stable').head(50))
+
+
+def combine_season_stats(seasons):
+    # All-time leaderboards re-aggregated from each season's leaderboard rows
+    batting, bowling, fifties, hundreds = [], [], [], []
+    for season, data in seasons:
+        _, stats = get_season_stats(data)
+        batting.append(pd.DataFrame(stats["Batting_Stats"]))
+        bowling.append(pd.DataFrame(stats["Bowling_Stats"]))
+        fifties.append(pd.DataFrame(stats["Top_50_Fastest_50s"]).assign(season=season))
+        hundreds.append(pd.DataFrame(stats["Top_50_Fastest_100s"]).assign(season=season))
+
+    # A player's team is the one they faced or bowled the most balls for
+    batting = pd.concat(batting, ignore_index=True).sort_values("Balls_Faced", ascending=False, kind="stable")
+    batting_stats = batting.groupby("striker").agg(
+        Team=("Team", "first"), Runs=("Runs", "sum"), Innings=("Innings", "sum"), Balls_Faced=("Balls_Faced", "sum"),
+        Fours=("Fours", "sum"), Sixes=("Sixes", "sum"), Dismissals=("Dismissals", "sum"), Not_Outs=("Not_Outs", "sum"),
+        Highest_Score=("Highest_Score", "max"), Hundreds=("Hundreds", "sum"), Fifties=("Fifties", "sum"),
     ).reset_index()
+    # Runs per dismissal, or the runs themselves for a batter never out
+    dismissed = batting_stats["Innings"] - batting_stats["Not_Outs"]
+    batting_stats["Average"] = np.where(dismissed > 0, round_tenths(batting_stats["Runs"] / np.maximum(dismissed, 1)), batting_stats["Runs"])
+    batting_stats["SR"] = round((batting_stats["Runs"] / batting_stats["Balls_Faced"]) * 100, 1)
+    batting_stats["Striker"] = batting_stats["striker"]
+
+    bowling = pd.concat(bowling, ignore_index=True)
+    best = bowling.sort_values(["Wickets_Best_Innings", "Runs_Conceded"], ascending=[False, True], kind="stable").groupby("bowler").first()
+    bowling_stats = bowling.sort_values("Balls_Bowled", ascending=False, kind="stable").groupby("bowler").agg(
+        Team=("Team", "first"), Wickets=("Wickets", "sum"), Runs=("Runs", "sum"), Balls_Bowled=("Balls_Bowled", "sum"),
+        Matches=("Matches", "sum"), Dot_Balls=("Dot_Balls", "sum"), Hat_Tricks=("Hat_Tricks", "sum"),
+        Runs_Conceded_Most_Runs_Innings=("Runs_Conceded_Most_Runs_Innings", "max"),
+    )
+    bowling_stats["Wickets_Best_Innings"] = best["Wickets_Best_Innings"]
+    bowling_stats["Runs_Conceded"] = best["Runs_Conceded"]
+    bowling_stats = bowling_stats.reset_index()
+    bowling_stats["Bowler"] = bowling_stats["bowler"]
+    # 0 where there is nothing to divide by
+    wickets, balls = bowling_stats["Wickets"], bowling_stats["Balls_Bowled"]
+    bowling_stats['Average'] = np.where(wickets > 0, round_tenths(bowling_stats["Runs"] / np.maximum(wickets, 1)), 0)
+    bowling_stats['Economy'] = np.where(balls > 0, round_tenths(bowling_stats["Runs"] / (np.maximum(balls, 1) / 6)), 0)
+    bowling_stats['Strike_Rate'] = np.where(wickets > 0, round_tenths(balls / np.maximum(wickets, 1)), 0)
+
+    return {
+        "Batting_Stats": frame_records(batting_stats),
+        "Top_50_Fastest_50s": fastest_innings(fifties),
+        "Top_50_Fastest_100s": fastest_innings(hundreds),
+        "Bowling_Stats": frame_records(bowling_stats),
+    }
+
 
-    fastest_50s = batting_df[batting_df['cumulative_runs'] >= 50].groupby(
-        ['match_no', 'striker', 'batting_team', 'bowling_team']
-    ).agg(Balls_Taken=('cumulative_balls', 'min')).reset_index()
+@app.route('/get-stats', methods=['GET'])
+def calculate_stats():
+    season = season_data(allow_all=True)
+    if season == ALL_SEASONS:
+        version = all_seasons_payload("version", lambda: hashlib.sha1("".join(data["version"] for _, data in published_seasons()).encode()).hexdigest()[:12])
+        response = all_seasons_payload("stats", lambda: combine_season_stats(published_seasons()))
+    else:
+        version, response = get_season_stats(season)
+    result = jsonify(response)
+    result.headers['X-Dataset-Version'] = version
+    return result
+
+def calculate_batting_stats(ball_by_ball, fastest_limit=50):
+    batting_cols = ['match_no', 'batting_team', 'bowling_team', 'striker', 'runs_of_bat', 'extras', 'ball_faced', 'over', 'player_dismissed']
+    batting_df = ball_by_ball[batting_cols].copy()
+
+    with stage(metrics, "batting_stats.aggregate"):
+        # Group by 'striker' to get cumulative stats
+        batting_stats = batting_df.groupby('striker').agg(
+            Team=('batting_team', lambda x: x.mode().iloc[0]),
+            Runs=('runs_of_bat', 'sum'),
+            Innings=('match_no', pd.Series.nunique),
+            Balls_Faced=('ball_faced', 'sum'),
+            Fours=('runs_of_bat', lambda x: (x == 4).sum()),
+            Sixes=('runs_of_bat', lambda x: (x == 6).sum())
+        ).reset_index()
+
+        dismissals = batting_df.groupby('striker')['player_dismissed'].count().reset_index()
+        dismissals.rename(columns={'player_dismissed': 'Dismissals'}, inplace=True)
+
+        batting_stats = batting_stats.merge(dismissals, on='striker', how='left').fillna(0)
+        batting_stats['Not_Outs'] = batting_stats['Innings'] - batting_stats['Dismissals']
+
+        # Highest individual score per match
+        highest_scores = batting_df.groupby(['match_no', 'striker']).agg(
+            Match_Runs=('runs_of_bat', 'sum'),
+            Opponent_Team=('bowling_team', 'first')
+        ).reset_index()
     
-    fastest_100s = batting_df[batting_df['cumulative_runs'] >= 100].groupby(
-        ['match_no', 'striker', 'batting_team', 'bowling_team']
-    ).agg(Balls_Taken=('cumulative_balls', 'min')).reset_index()
+        # Get highest score for each player
+        max_scores = highest_scores.groupby('striker').agg(
+            Highest_Score=('Match_Runs', 'max')
+        ).reset_index()
+
+        batting_stats = batting_stats.merge(max_scores, on='striker', how='left')
+
+        # Calculate Batting Average & Strike Rate
+        batting_stats['Average'] = batting_stats.apply(
+            lambda row: round(row['Runs'] / (row['Innings'] - row['Not_Outs']), 1) if (row['Innings'] - row['Not_Outs']) > 0 else round(row['Runs'], 1),
+            axis=1
+        )
+        batting_stats['SR'] = round((batting_stats['Runs'] / batting_stats['Balls_Faced']) * 100, 1)
+
+
+        # Count centuries and half-centuries
+        batting_100s_50s = highest_scores.groupby('striker').agg(
+            Hundreds=('Match_Runs', lambda x: (x >= 100).sum()),
+            Fifties=('Match_Runs', lambda x: ((x >= 50) & (x < 100)).sum())
+        ).reset_index()
+
+        batting_stats = batting_stats.merge(batting_100s_50s, on='striker', how='left')
+        batting_stats["Striker"] = batting_stats["striker"]
+    with stage(metrics, "batting_stats.fastest"):
+        # Identify fastest 50s and 100s
+        batting_df['cumulative_runs'] = batting_df.groupby(['match_no', 'striker'])['runs_of_bat'].cumsum()
+        batting_df['cumulative_balls'] = batting_df.groupby(['match_no', 'striker'])['ball_faced'].cumsum()
+
+        innings_stats = batting_df.groupby(['match_no', 'striker', 'batting_team', 'bowling_team']).agg(
+            Final_Score=('cumulative_runs', 'max'),
+            Fours=('runs_of_bat', lambda x: (x == 4).sum()),
+            Sixes=('runs_of_bat', lambda x: (x == 6).sum())
+        ).reset_index()
+
+        fastest_50s = batting_df[batting_df['cumulative_runs'] >= 50].groupby(
+            ['match_no', 'striker', 'batting_team', 'bowling_team']
+        ).agg(Balls_Taken=('cumulative_balls', 'min')).reset_index()
+    
+        fastest_100s = batting_df[batting_df['cumulative_runs'] >= 100].groupby(
+            ['match_no', 'striker', 'batting_team', 'bowling_team']
+        ).agg(Balls_Taken=('cumulative_balls', 'min')).reset_index()
 
-    fastest_50s = fastest_50s.merge(innings_stats, on=['match_no', 'striker', 'batting_team', 'bowling_team']).sort_values(by='Balls_Taken').head(50)
-    fastest_100s = fastest_100s.merge(innings_stats, on=['match_no', 'striker', 'batting_team', 'bowling_team']).sort_values(by='Balls_Taken').head(50)
+        fastest_50s = fastest_50s.merge(innings_stats, on=['match_no', 'striker', 'batting_team', 'bowling_team']).sort_values(by='Balls_Taken', kind='stable').iloc[:fastest_limit]
+        fastest_100s = fastest_100s.merge(innings_stats, on=['match_no', 'striker', 'batting_team', 'bowling_team']).sort_values(by='Balls_Taken', kind='stable').iloc[:fastest_limit]
 
     return {
-        "Batting_Stats": batting_stats.to_dict(orient='records'),
-        "Top_50_Fastest_50s": fastest_50s.to_dict(orient='records'),
-        "Top_50_Fastest_100s": fastest_100s.to_dict(orient='records')
+        "Batting_Stats": frame_records(batting_stats),
+        "Top_50_Fastest_50s": frame_records(fastest_50s),
+        "Top_50_Fastest_100s": frame_records(fastest_100s)
     }
 
 def calculate_bowling_stats(ball_by_ball):
-    # Exclude run out dismissals from wicket count
-    ball_by_ball['is_wicket'] = ((ball_by_ball['wicket_type'].notna()) & (ball_by_ball['wicket_type'] != 'run out')).astype(int)
-
-    # Count valid balls (excluding wides and no-balls)
-    ball_by_ball['valid_ball'] = ((ball_by_ball['wide'] == 0) & (ball_by_ball['noballs'] == 0)).astype(int)
-
-    # Calculate total runs conceded (includes extras when wide or no-ball)
-    ball_by_ball['bowler_runs'] = ball_by_ball['runs_of_bat'] + ball_by_ball.apply(
-        lambda row: row['extras'] if row['wide'] == 1 or row['noballs'] == 1 else 0, axis=1
-    )
+    # Wickets credited to the bowler as 0/1, for the rolling hat-trick window
+    ball_by_ball['is_wicket'] = ball_by_ball['is_bowler_wicket'].astype(int)
 
     # Count dot balls (where runs_of_bat and extras are 0)
     ball_by_ball['is_dot_ball'] = ((ball_by_ball['runs_of_bat'] == 0) & (ball_by_ball['extras'] == 0)).astype(int)
 
-    # Aggregate bowling stats
-    bowling_stats = ball_by_ball.groupby('bowler').agg(
-        Team=('bowling_team', lambda x: x.mode().iloc[0]),
-        Wickets=('is_wicket', 'sum'),
-        Runs=('bowler_runs', 'sum'),
-        Balls_Bowled=('valid_ball', 'sum'),
-        Matches=('match_no', pd.Series.nunique),
-        Dot_Balls=('is_dot_ball', 'sum')
-    ).reset_index()
-
-    # Count hat-tricks (3 wickets in 3 consecutive deliveries)
-    ball_by_ball['hat_trick'] = ball_by_ball.groupby('bowler')['is_wicket'].rolling(window=3, min_periods=3).sum().reset_index(level=0, drop=True)
-    hat_tricks = ball_by_ball.groupby('bowler')['hat_trick'].apply(lambda x: (x >= 3).sum()).reset_index()
-    hat_tricks.rename(columns={'hat_trick': 'Hat_Tricks'}, inplace=True)
+    with stage(metrics, "bowling_stats.aggregate"):
+        # Aggregate bowling stats
+        bowling_stats = ball_by_ball.groupby('bowler').agg(
+            Team=('bowling_team', lambda x: x.mode().iloc[0]),
+            Wickets=('is_wicket', 'sum'),
+            Runs=('bowler_runs', 'sum'),
+            Balls_Bowled=('legal_ball', 'sum'),
+            Matches=('match_no', pd.Series.nunique),
+            Dot_Balls=('is_dot_ball', 'sum')
+        ).reset_index()
+
+    with stage(metrics, "bowling_stats.hat_tricks"):
+        # Count hat-tricks (3 wickets in 3 consecutive deliveries)
+        ball_by_ball['hat_trick'] = ball_by_ball.groupby('bowler')['is_wicket'].rolling(window=3, min_periods=3).sum().reset_index(level=0, drop=True)
+        hat_tricks = ball_by_ball.groupby('bowler')['hat_trick'].apply(lambda x: (x >= 3).sum()).reset_index()
+        hat_tricks.rename(columns={'hat_trick': 'Hat_Tricks'}, inplace=True)
     
-    bowling_stats = bowling_stats.merge(hat_tricks, on='bowler', how='left')
-    bowling_stats["Bowler"] = bowling_stats["bowler"]
+        bowling_stats = bowling_stats.merge(hat_tricks, on='bowler', how='left')
+        bowling_stats["Bowler"] = bowling_stats["bowler"]
 
-    # Best bowling figures per innings
-    best_bowling_figures = ball_by_ball.groupby(['match_no', 'bowler']).agg(
-        Wickets=('is_wicket', 'sum'),
-        Runs_Conceded=('bowler_runs', 'sum')
-    ).reset_index()
+    with stage(metrics, "bowling_stats.figures"):
+        # Best bowling figures per innings
+        best_bowling_figures = ball_by_ball.groupby(['match_no', 'bowler']).agg(
+            Wickets=('is_wicket', 'sum'),
+            Runs_Conceded=('bowler_runs', 'sum')
+        ).reset_index()
 
-    # Get best and worst innings
-    best_bowling = best_bowling_figures.sort_values(by=['bowler', 'Wickets', 'Runs_Conceded'], ascending=[True, False, True]).drop_duplicates(subset=['bowler'], keep='first')
-    worst_bowling = best_bowling_figures.sort_values(by=['bowler', 'Runs_Conceded'], ascending=[True, False]).drop_duplicates(subset=['bowler'], keep='first')
+        # Get best and worst innings
+        best_bowling = best_bowling_figures.sort_values(by=['bowler', 'Wickets', 'Runs_Conceded'], ascending=[True, False, True]).drop_duplicates(subset=['bowler'], keep='first')
+        worst_bowling = best_bowling_figures.sort_values(by=['bowler', 'Runs_Conceded'], ascending=[True, False]).drop_duplicates(subset=['bowler'], keep='first')
 
-    # Merge best and worst bowling figures
-    bowling_stats = bowling_stats.merge(best_bowling[['bowler', 'Wickets', 'Runs_Conceded']], on='bowler', how='left', suffixes=('', '_Best_Innings'))
-    bowling_stats = bowling_stats.merge(worst_bowling[['bowler', 'Runs_Conceded']], on='bowler', how='left', suffixes=('', '_Most_Runs_Innings'))
+        # Merge best and worst bowling figures
+        bowling_stats = bowling_stats.merge(best_bowling[['bowler', 'Wickets', 'Runs_Conceded']], on='bowler', how='left', suffixes=('', '_Best_Innings'))
+        bowling_stats = bowling_stats.merge(worst_bowling[['bowler', 'Runs_Conceded']], on='bowler', how='left', suffixes=('', '_Most_Runs_Innings'))
 
     # Calculate bowling averages, economy, and strike rate
     bowling_stats['Average'] = bowling_stats.apply(lambda row: round(row['Runs'] / row['Wickets'], 1) if row['Wickets'] > 0 else 0, axis=1)
@@ -1161,8 +2294,590 @@ def calculate_bowling_stats(ball_by_ball):
     bowling_stats.fillna(0, inplace=True)
 
     return {
-        "Bowling_Stats": bowling_stats.to_dict(orient='records')
+        "Bowling_Stats": frame_records(bowling_stats)
+    }
+
+# Live deliveries: POSTed rows are appended to a growable columnar copy of the season's deliveries
+# and published to readers as a new season bundle on the next read of that season
+
+DELIVERY_COLUMNS = ['match_id', 'season', 'match_no', 'date', 'venue', 'batting_team', 'bowling_team', 'innings', 'over', 'striker', 'non_striker', 'bowler', 'runs_of_bat', 'extras', 'wide', 'legbyes', 'byes', 'noballs', 'wicket_type', 'player_dismissed', 'fielder']
+# Fields a posted delivery may leave out
+DELIVERY_DEFAULTS = {'wide': 0, 'legbyes': 0, 'byes': 0, 'noballs': 0, 'wicket_type': None, 'player_dismissed': None, 'fielder': None}
+MAX_DELIVERY_BATCH = 5000
+# Innings 1 and 2, then 3 to 6 for up to two super overs of one over each
+MAX_INNINGS = 6
+# Runs off the bat or in extras on one delivery; far above any real ball, far below the int16 derived columns
+MAX_BALL_RUNS = 99
+
+live_deliveries = {}  # season -> {"store": live store, "lock": guards appends and publishing, "matches": match_fields cache, "streams": {match_no: stream}}
+# season -> {match_no: stream}, the matches being watched. Streams can be opened before anything is
+# posted to the season; the season's live entry shares the dict once it exists.
+live_streams = {}
+# Guards creating live entries and adding or removing streams
+live_deliveries_lock = threading.Lock()
+
+
+def match_fields(match):
+    # Delivery fields that follow from the match itself
+    return {
+        'match_id': int(match['match_id']),
+        'season': int(match['season']),
+        'date': pd.to_datetime(match['date'], format='%d-%m-%Y').strftime('%Y-%m-%d'),
+        'venue': f"{match['venue']}, {match['city']}",
+    }
+
+
+def parse_deliveries(season, rows, matches):
+    # Posted deliveries to {column: values} in the ipl_<season>_deliveries.csv schema.
+    # matches caches match_fields by match number.
+    batch = {column: [] for column in DELIVERY_COLUMNS}
+    for number, row in enumerate(rows):
+        if not isinstance(row, dict):
+            abort(400, description=f"Delivery {number} is not an object")
+        match_no = row.get('match_no')
+        if not isinstance(match_no, int) or match_no not in season["match_rows"]:
+            abort(404, description=f"Delivery {number}: match {match_no} not found in season {season['season']}")
+        if match_no not in matches:
+            matches[match_no] = match_fields(season["match_history"].iloc[season["match_rows"][match_no]])
+        if row.get('season', season['season']) != season['season']:
+            abort(400, description=f"Delivery {number} belongs to season {row['season']}, not {season['season']}")
+
+        for column in DELIVERY_COLUMNS:
+            if column in row:
+                value = row[column]
+            elif column in DELIVERY_DEFAULTS:
+                value = DELIVERY_DEFAULTS[column]
+            elif column in matches[match_no]:
+                value = matches[match_no][column]
+            else:
+                abort(400, description=f"Delivery {number} is missing {column}")
+            batch[column].append(value)
+
+    # Numbers must be numbers and names must be strings
+    dtypes = season["ball_by_ball"].dtypes
+    for column, values in batch.items():
+        if isinstance(dtypes[column], pd.CategoricalDtype):
+            if not all(value is None or isinstance(value, str) for value in values):
+                abort(400, description=f"{column} must be a string")
+            continue
+        if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            abort(400, description=f"{column} must be a number")
+        values = np.asarray(values, dtype=float)
+        if pd.api.types.is_integer_dtype(dtypes[column]) and not np.array_equal(values, np.floor(values)):
+            abort(400, description=f"{column} must be a whole number")
+        if pd.api.types.is_integer_dtype(dtypes[column]) and not np.all(np.abs(values) <= np.iinfo(dtypes[column]).max):
+            abort(400, description=f"{column} is out of range")
+        batch[column] = values.astype(dtypes[column])
+    check_delivery_ranges(batch)
+    return batch
+
+
+def check_delivery_ranges(batch):
+    # 400 for the first delivery with a value no real ball has, before the derived columns and the
+    # routes built on them (bincounts by over, int16 run totals) ever see it
+    innings = batch['innings']
+    over = np.asarray(batch['over'], dtype=float)
+    over_no = np.floor(over)
+    ball = np.rint((over - over_no) * 10)
+    extras = batch['extras']
+    checks = [
+        ((innings >= 1) & (innings <= MAX_INNINGS), f"innings must be 1 or 2, or 3 to {MAX_INNINGS} for a super over"),
+        ((over >= 0) & (over < INNINGS_OVERS) & ((innings <= 2) | (over < 1)), f"over must be from 0.1 to {INNINGS_OVERS - 1}.9 (0.1 to 0.9 in a super over)"),
+        (np.isclose(over * 10, np.rint(over * 10)) & (ball >= 1) & (ball <= 9), "over must have a ball digit from 1 to 9, e.g. 3.4"),
+        (np.isin(batch['wide'], [0, 1]), "wide must be 0 or 1"),
+        (np.isin(batch['noballs'], [0, 1]), "noballs must be 0 or 1"),
+        ((batch['runs_of_bat'] >= 0) & (batch['runs_of_bat'] <= MAX_BALL_RUNS), f"runs_of_bat must be from 0 to {MAX_BALL_RUNS}"),
+        ((extras >= 0) & (extras <= MAX_BALL_RUNS), f"extras must be from 0 to {MAX_BALL_RUNS}"),
+        # Byes and leg byes are recorded as the runs taken, which are part of the extras
+        ((batch['byes'] >= 0) & (batch['byes'] <= extras), "byes must be from 0 to the delivery's extras"),
+        ((batch['legbyes'] >= 0) & (batch['legbyes'] <= extras), "legbyes must be from 0 to the delivery's extras"),
+    ]
+    for valid, message in checks:
+        if not valid.all():
+            number = int(np.argmin(valid))
+            abort(400, description=f"Delivery {number}: {message}")
+
+
+def live_store(season):
+    # The season's live store, copied from its deliveries on the first post
+    with live_deliveries_lock:
+        if season["season"] not in live_deliveries:
+            live_deliveries[season["season"]] = {"store": create_store(season["ball_by_ball"]), "lock": threading.Lock(), "matches": {},
+                                                 "streams": live_streams.setdefault(season["season"], {})}
+            # Posted deliveries only live in memory, so the season must stay loaded
+            pin_season(registry, season["season"])
+        return live_deliveries[season["season"]]
+
+
+@app.route('/deliveries', methods=['POST'])
+def post_deliveries():
+    # One delivery or a list of them; they are visible to the next read of the season.
+    # Matches are fed in order, from the last match with deliveries on: for a season loaded from
+    # a CSV whose deliveries run to match 74 (as the bundled 2024 season does), only match 74
+    # and later can be fed. Anything earlier, washed out matches included, gets a 409.
+    season = get_season(registry, requested_season(allow_all=False))
+    payload = request.get_json(silent=True)
+    rows = [payload] if isinstance(payload, dict) else payload
+    if not isinstance(rows, list) or not rows:
+        abort(400, description="Expected a delivery or a non-empty list of deliveries")
+    if len(rows) > MAX_DELIVERY_BATCH:
+        abort(400, description=f"At most {MAX_DELIVERY_BATCH} deliveries per request")
+    # Checked before the store is created, so a rejected batch does not pin the season
+    live = live_deliveries.get(season["season"])
+    batch = parse_deliveries(season, rows, live["matches"] if live is not None else {})
+    live = live_store(season)
+    with live["lock"]:
+        # Each match's deliveries stay one contiguous block, so matches are fed in order
+        store = live["store"]
+        last_match = store["columns"]["match_no"]["data"][store["rows"] - 1] if store["rows"] else 0
+        match_nos = np.r_[last_match, batch['match_no']]
+        if np.any(np.diff(match_nos) < 0):
+            abort(409, description=f"Deliveries must arrive in match order, match {int(last_match)} is already being fed or played")
+        # Derived columns, with the legal ball count carried on from the innings being fed
+        previous = tuple(int(store["columns"][column]["data"][store["rows"] - 1]) for column in ['match_no', 'innings', 'legal_ball_seq']) if store["rows"] else None
+        batch.update(derived_columns(pd.DataFrame(batch), previous))
+        start = store["rows"]
+        total = append_rows(store, batch)
+        advance_streams(live, start)
+    return jsonify({"season": season["season"], "accepted": len(rows), "deliveries": int(total)}), 202
+
+
+# Live match streams: one per match being watched, fed by the deliveries as they are posted. Each
+# delivery is turned into an event once; subscribers only copy the serialized events out.
+
+# Seconds between keep-alive comments on an idle stream
+STREAM_KEEPALIVE = 15
+# Delivery fields sent with every ball
+BALL_FIELDS = ['innings', 'over', 'batting_team', 'bowling_team', 'striker', 'non_striker', 'bowler', 'runs_of_bat', 'extras', 'wide', 'legbyes', 'byes', 'noballs', 'wicket_type', 'player_dismissed', 'fielder']
+
+
+def new_innings_state():
+    return {"batting": {}, "bowling": {}, "over_totals": {}, "runs": 0, "wickets": 0, "balls": 0,
+            "extras": {"total": 0, "wides": 0, "no_balls": 0, "leg_byes": 0, "byes": 0}}
+
+
+def batting_line(innings, batter):
+    return innings["batting"].setdefault(batter, {"batter": batter, "runs": 0, "balls": 0, "fours": 0, "sixes": 0, "dots": 0, "wicket_type": None, "fielder": None})
+
+
+def add_ball(state, ball):
+    # Applies one delivery to a match's running scorecard, with the same rules as build_scorecard,
+    # and returns what changed
+    innings = state.setdefault(ball['innings'], new_innings_state())
+    runs_of_bat, extras = ball['runs_of_bat'], ball['extras']
+    legal_ball = ball['legal_ball']
+    over_no = ball['over_no']
+
+    batter = batting_line(innings, ball['striker'])
+    batter["runs"] += runs_of_bat
+    batter["balls"] += ball['ball_faced']
+    batter["fours"] += runs_of_bat == 4
+    batter["sixes"] += runs_of_bat == 6
+    batter["dots"] += runs_of_bat == 0
+    changed_batters = [batter]
+
+    bowler = innings["bowling"].setdefault(ball['bowler'], {"bowler": ball['bowler'], "overs": 0.0, "balls": 0, "runs": 0, "maidens": 0, "fours": 0, "sixes": 0, "wides": 0, "no_balls": 0, "dots": 0, "wickets": 0})
+    bowler_runs = ball['bowler_runs']
+    bowler["balls"] += legal_ball
+    bowler["overs"] = float(balls_to_overs(bowler["balls"]))
+    bowler["runs"] += bowler_runs
+    bowler["fours"] += runs_of_bat == 4
+    bowler["sixes"] += runs_of_bat == 6
+    bowler["wides"] += ball['wide']
+    bowler["no_balls"] += ball['noballs']
+    bowler["dots"] += runs_of_bat == 0 and extras == 0
+    bowler["wickets"] += ball['is_bowler_wicket']
+
+    # A maiden is a completed over by one bowler with no runs charged to the bowler
+    over_totals = innings["over_totals"].setdefault((ball['bowler'], over_no), [0, 0])
+    was_maiden = over_totals[0] == 6 and over_totals[1] == 0
+    over_totals[0] += legal_ball
+    over_totals[1] += bowler_runs
+    bowler["maidens"] += (over_totals[0] == 6 and over_totals[1] == 0) - was_maiden
+
+    innings["extras"]["total"] += extras
+    innings["extras"]["wides"] += extras * (ball['wide'] == 1)
+    innings["extras"]["no_balls"] += ball['noballs']
+    innings["extras"]["leg_byes"] += (extras - ball['noballs']) * (ball['legbyes'] == 1)
+    innings["extras"]["byes"] += (extras - ball['noballs']) * (ball['byes'] == 1)
+
+    innings["runs"] += ball['total_runs']
+    innings["balls"] += legal_ball
+    ball_number = over_no * 6 + ball['ball_in_over']
+
+    wicket = None
+    if ball['player_dismissed'] is not None:
+        innings["wickets"] += 1
+        dismissed = batting_line(innings, ball['player_dismissed'])
+        dismissed["wicket_type"] = ball['wicket_type'] if ball['wicket_type'] is not None else "not out"
+        dismissed["fielder"] = ball['fielder'] if ball['fielder'] is not None else ""
+        dismissed["bowler"] = ball['bowler']
+        if dismissed is not batter:
+            changed_batters.append(dismissed)
+        wicket = {"player_dismissed": ball['player_dismissed'], "ball": ball_number, "runs_at_wicket_fall": innings["runs"]}
+
+    return {
+        "ball": {**{field: ball[field] for field in BALL_FIELDS}, "ball": ball_number},
+        "batting": [dict(line) for line in changed_batters],
+        "bowling": [{key: value for key, value in bowler.items() if key != "balls"}],
+        "score": {"innings": ball['innings'], "runs": innings["runs"], "wickets": innings["wickets"], "overs": float(balls_to_overs(innings["balls"]))},
+        "wicket": wicket,
+    }
+
+
+def scorecard_snapshot(stream):
+    # The full running scorecard, in the shape of /get-scorecard's innings
+    return {
+        f"innings{number}": {
+            "batting": list(innings["batting"].values()),
+            "bowling": [{key: value for key, value in line.items() if key != "balls"} for line in innings["bowling"].values()],
+            "extras": innings["extras"],
+            "score": {"runs": innings["runs"], "wickets": innings["wickets"], "overs": float(balls_to_overs(innings["balls"]))},
+        }
+        for number, innings in sorted(stream["state"].items())
+    }
+
+
+def sse_event(event, event_id, data):
+    return f"event: {event}\nid: {event_id}\ndata: {app.json.dumps(data)}\n\n".encode('utf-8')
+
+
+def stream_balls(stream, balls):
+    # Turns deliveries into events; called with the live store's lock held
+    with stream["condition"]:
+        for ball in balls:
+            event_id = len(stream["events"]) + 1
+            stream["events"].append(sse_event("delivery", event_id, add_ball(stream["state"], ball)))
+        stream["condition"].notify_all()
+
+
+def advance_streams(live, start):
+    # Feeds rows appended from start on to the streams of their matches
+    store = live["store"]
+    if not live["streams"] or start == store["rows"]:
+        return
+    match_nos = store["columns"]["match_no"]["data"][start:store["rows"]]
+    for match_no, stream in live["streams"].items():
+        rows = np.flatnonzero(match_nos == match_no) + start
+        if len(rows):
+            stream_balls(stream, store_records(store, rows))
+
+
+def match_balls(season, match_no):
+    # Delivery records of one match: from the live store once deliveries have been posted to the
+    # season, else from the loaded season. Called with live_deliveries_lock held.
+    live = live_deliveries.get(season["season"])
+    if live is None:
+        deliveries = get_match(season, match_no)[1]
+        return store_records(create_store(deliveries), np.arange(len(deliveries)))
+    store = live["store"]
+    return store_records(store, np.flatnonzero(store["columns"]["match_no"]["data"][:store["rows"]] == match_no))
+
+
+def open_stream(season, match_no):
+    # The match's stream, started from the deliveries so far when nobody is watching it yet.
+    # Watching creates no live store and does not pin the season; a stream opened before the
+    # first post is fed once a post creates the store.
+    with live_deliveries_lock:
+        live = live_deliveries.get(season["season"])
+        with live["lock"] if live is not None else contextlib.nullcontext():
+            streams = live_streams.setdefault(season["season"], {})
+            stream = streams.get(match_no)
+            if stream is None:
+                stream = {"state": {}, "events": [], "snapshot": None, "subscribers": 0, "condition": threading.Condition()}
+                for ball in match_balls(season, match_no):
+                    add_ball(stream["state"], ball)
+                streams[match_no] = stream
+            stream["subscribers"] += 1
+    return stream
+
+
+def close_stream(season, match_no, stream):
+    with live_deliveries_lock:
+        live = live_deliveries.get(season)
+        with live["lock"] if live is not None else contextlib.nullcontext():
+            stream["subscribers"] -= 1
+            streams = live_streams[season]
+            if stream["subscribers"] == 0 and streams.get(match_no) is stream:
+                del streams[match_no]
+
+
+def stream_events(season, match_no, stream, last_id):
+    # A new subscriber gets the running scorecard first, rendered once per event id and shared
+    try:
+        if last_id is None or last_id > len(stream["events"]):
+            with stream["condition"]:
+                last_id = len(stream["events"])
+                if stream["snapshot"] is None or stream["snapshot"][0] != last_id:
+                    stream["snapshot"] = (last_id, sse_event("scorecard", last_id, scorecard_snapshot(stream)))
+                snapshot = stream["snapshot"][1]
+            yield snapshot
+
+        while True:
+            with stream["condition"]:
+                if len(stream["events"]) == last_id:
+                    stream["condition"].wait(STREAM_KEEPALIVE)
+                events = stream["events"][last_id:]
+            if events:
+                last_id += len(events)
+                yield b"".join(events)
+            else:
+                yield b": keep-alive\n\n"
+    finally:
+        close_stream(season, match_no, stream)
+
+
+@app.route('/stream/<int:match_no>', methods=['GET'])
+def stream_match(match_no):
+    # Server-sent events: a scorecard snapshot, then one event per delivery. Reconnecting clients
+    # send Last-Event-ID and only receive the deliveries they missed.
+    season = get_season(registry, requested_season(allow_all=False))
+    if match_no not in season["match_rows"]:
+        abort(404, description=f"Match {match_no} not found in season {season['season']}")
+    last_id = request.headers.get('Last-Event-ID')
+    last_id = int(last_id) if last_id is not None and last_id.isdigit() else None
+
+    stream = open_stream(season, match_no)
+    return app.response_class(stream_events(season["season"], match_no, stream, last_id), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def fill_innings_scores(matches, match_rows, match_data):
+    # Scores of the matches given deliveries follow those deliveries, whether or not the matches
+    # CSV had scores for them
+    matches = matches.copy()
+    for match_no, deliveries in match_data.items():
+        row = match_rows[match_no]
+        for innings in innings_totals(deliveries).itertuples():
+            if innings.innings in [1, 2]:
+                matches.iat[row, matches.columns.get_loc(f"innings{innings.innings}_score")] = innings.runs
+                matches.iat[row, matches.columns.get_loc(f"innings{innings.innings}_wickets")] = innings.wickets
+    return matches
+
+
+def splice_rows(rows, updated, key):
+    # Leaderboard rows with the updated players' rows swapped in, in name order
+    replaced = {row[key] for row in updated}
+    return sorted([row for row in rows if row[key] not in replaced] + updated, key=lambda row: row[key])
+
+
+def splice_fastest(rows, updated, players):
+    # Fastest innings list with the given players' innings swapped in. Balls_Taken of an innings
+    # never changes once reached, so nothing outside the current top 50 can move into it.
+    rows = [row for row in rows if row['striker'] not in players] + updated
+    rows.sort(key=lambda row: (row['Balls_Taken'], row['match_no'], row['striker'], row['batting_team'], row['bowling_team']))
+    return rows[:50]
+
+
+def update_season_stats(payload, deliveries, delta):
+    # Leaderboards recomputed only for the batters and bowlers in delta, from all their deliveries
+    batters = np.unique(symbol_codes(delta['striker']))
+    bowlers = np.unique(symbol_codes(delta['bowler']))
+    batting = calculate_batting_stats(deliveries[np.isin(symbol_codes(deliveries['striker']), batters)], fastest_limit=None)
+    bowling = calculate_bowling_stats(deliveries[np.isin(symbol_codes(deliveries['bowler']), bowlers)].copy())
+    players = set(decode_symbols(deliveries['striker'].dtype, batters))
+    return {
+        "Batting_Stats": splice_rows(payload["Batting_Stats"], batting["Batting_Stats"], 'striker'),
+        "Top_50_Fastest_50s": splice_fastest(payload["Top_50_Fastest_50s"], batting["Top_50_Fastest_50s"], players),
+        "Top_50_Fastest_100s": splice_fastest(payload["Top_50_Fastest_100s"], batting["Top_50_Fastest_100s"], players),
+        "Bowling_Stats": splice_rows(payload["Bowling_Stats"], bowling["Bowling_Stats"], 'bowler'),
+    }
+
+
+def apply_deliveries(season, store, stop):
+    # A new bundle for the season with the live store's rows up to stop. The work done is
+    # proportional to the matches and players the new deliveries touch, not to the season.
+    start = len(season["ball_by_ball"])
+    ball_by_ball = store_frame(store, stop)
+    delta = ball_by_ball.iloc[start:stop]
+
+    # New rows extend the last match's block of rows or start new blocks
+    ball_offsets = dict(season["ball_offsets"])
+    match_nos = delta['match_no'].to_numpy()
+    for match_no in pd.unique(match_nos).tolist():
+        rows = np.flatnonzero(match_nos == match_no) + start
+        first = ball_offsets.get(match_no, (int(rows[0]), 0))[0]
+        ball_offsets[match_no] = (first, int(rows[-1]) + 1)
+    match_data = {match_no: ball_by_ball.iloc[ball_offsets[match_no][0]:ball_offsets[match_no][1]] for match_no in pd.unique(match_nos).tolist()}
+
+    # Every match that received deliveries is live from now on, its scores recomputed with the rest of its card
+    live_matches = season.get("live_matches", frozenset()) | frozenset(match_data)
+    match_history = fill_innings_scores(season["match_history"], season["match_rows"], match_data)
+
+    # Points only move for league matches with a result
+    points_engine = {key: list(value) if isinstance(value, list) else value for key, value in season["points_engine"].items()}
+    for match_no, deliveries in match_data.items():
+        match = match_history.iloc[season["match_rows"][match_no]]
+        if match['league_stage'] and pd.notna(match['winning_team']):
+            add_match_result(points_engine, match_result(match, innings_totals(deliveries)))
+
+    touched = match_history[match_history['match_no'].isin(match_data)]
+    match_summary = pd.concat([
+        season["match_summary"][~season["match_summary"]['match_no'].isin(match_data)],
+        build_match_summary(pd.concat(match_data.values()), touched),
+    ])
+    match_summary = match_summary.iloc[np.argsort(match_summary['match_no'].map(season["match_rows"]).to_numpy(), kind='stable')].reset_index(drop=True)
+
+    return {
+        **season,
+        "version": hashlib.sha1(f"{season['version']}:{stop}".encode()).hexdigest()[:12],
+        "match_history": match_history,
+        "ball_by_ball": ball_by_ball,
+        "symbols": ball_by_ball['striker'].dtype,
+        "ball_offsets": ball_offsets,
+        "live_matches": live_matches,
+        "points_engine": points_engine,
+        **match_summary_tables(match_summary),
+        "tables": {},
+        # Leaderboards catch up with the new deliveries on their next read
+        "season_stats": dict(season["season_stats"]),
+        "lock": threading.Lock(),
+    }
+
+
+def match_summary_tables(match_summary):
+    # /matches rows, their filter index and the pre-serialized unfiltered list, compact like
+    # jsonify so it is byte for byte the body a filter matching every match returns
+    match_summary_records = frame_records(match_summary)
+    return {
+        "match_summary": match_summary,
+        "match_summary_records": match_summary_records,
+        "match_summary_index": build_match_summary_index(match_summary),
+        "match_summary_json": app.json.dumps(match_summary_records, separators=(',', ':')).encode() + b'\n',
+    }
+
+
+def build_team_tables(season):
+    batter_totals = team_batter_totals(season["ball_by_ball"])
+    bowler_totals = team_bowler_totals(season["ball_by_ball"])
+    return {
+        "batter_totals": batter_totals,
+        "bowler_totals": bowler_totals,
+        "team_analytics": build_team_analytics(season["match_history"], batter_totals, bowler_totals),
+    }
+
+
+def build_venue_tables(season):
+    venue_cube = build_venue_cube(season["match_history"], season["ball_by_ball"])
+    return venue_cube, build_venue_aliases(venue_cube, season["match_history"], season["ball_by_ball"])
+
+
+def build_partnership_table(season):
+    # Every partnership of the season, computed for all matches in one pass
+    partnerships = build_partnerships(season["ball_by_ball"])
+    partnerships.insert(0, 'season', season["season"])
+    return partnerships
+
+
+def build_phase_table(season):
+    # The phase cube of the whole season as frames, names decoded, tagged with the season and
+    # each match's venue id. Super overs are left out: their one over would count as powerplay.
+    balls = season["ball_by_ball"]
+    balls = balls[balls['innings'].isin([1, 2])]
+    symbols = balls['striker'].dtype
+    matches = season["match_history"]
+    match_venue = dict(zip(matches['match_no'].tolist(), matches['venue'].astype(str).map(venue_id)))
+    tables = {}
+    for kind, columns in phase_cube(balls).items():
+        for name in ['batting_team', 'bowling_team', 'batter', 'bowler']:
+            if name in columns:
+                columns[name] = pd.Categorical.from_codes(columns[name], dtype=symbols)
+        table = pd.DataFrame(columns)
+        table.insert(0, 'season', season["season"])
+        table['venue_id'] = table['match_no'].map(match_venue).astype('category')
+        tables[kind] = table
+    return tables
+
+
+# Season tables that are rebuilt from scratch rather than updated as deliveries arrive
+SEASON_TABLES = {"teams": build_team_tables, "venues": build_venue_tables, "partnerships": build_partnership_table, "phases": build_phase_table}
+
+
+def season_table(season, name):
+    # Built once per version of the season and then served from memory
+    with season["lock"]:
+        if name not in season["tables"]:
+            season["tables"][name] = SEASON_TABLES[name](season)
+        return season["tables"][name]
+
+
+def build_season(season, matches_csv, deliveries_csv):
+    # Everything served for one season, built once when the season is first requested
+    # Load the data into memory, from the binary cache next to each CSV when it is up to date
+    with stage(metrics, "season.read"):
+        match_history, matches_checksum = load_table(matches_csv)
+        ball_by_ball, deliveries_checksum = load_table(deliveries_csv)
+
+    # Identifies the loaded data; everything materialized from it is rebuilt when it changes
+    version = hashlib.sha1((matches_checksum + deliveries_checksum).encode()).hexdigest()[:12]
+
+    # Store player, team, venue and dismissal names as codes of one shared symbol table
+    with stage(metrics, "season.encode"):
+        match_history, ball_by_ball, squads, symbols = encode_dataset(match_history, ball_by_ball)
+    match_history["league_stage"] = match_history["match_no"] <= LEAGUE_MATCHES.get(season, DEFAULT_LEAGUE_MATCHES)
+
+    # Keep every match's deliveries in one contiguous block of rows (stable, so ball order is kept)
+    ball_by_ball = ball_by_ball.sort_values('match_no', kind='stable').reset_index(drop=True)
+    ball_offsets, match_rows = build_match_index(ball_by_ball, match_history)
+
+    # Legal balls, overs, phases, bowler runs and wickets as columns every route reads. They are
+    # built here only; tests/test_derived_columns.py checks them against an independent recomputation.
+    with stage(metrics, "season.derive"):
+        ball_by_ball = ball_by_ball.assign(**derived_columns(ball_by_ball))
+
+    data = {
+        "season": season,
+        "version": version,
+        "match_history": match_history,
+        "ball_by_ball": ball_by_ball,
+        "squads": squads,
+        "symbols": symbols,
+        "ball_offsets": ball_offsets,
+        "match_rows": match_rows,
+        "points_engine": build_points_engine(match_history, ball_by_ball),
+        **match_summary_tables(build_match_summary(ball_by_ball, match_history)),
+        "team_players": squad_players(squads),
+        "tables": {},
+        "season_stats": {"version": None, "payload": None, "rows": 0},
+        "lock": threading.Lock(),
     }
+    # Team and venue analytics are precomputed with the season
+    with stage(metrics, "season.tables"):
+        for name in SEASON_TABLES:
+            season_table(data, name)
+    return data
+
+
+def shareable_season(season, matches_csv, deliveries_csv):
+    # The season with its leaderboards computed, minus the per-process lock
+    data = build_season(season, matches_csv, deliveries_csv)
+    get_season_stats(data)
+    del data["lock"]
+    return data
+
+
+def load_season(season, matches_csv, deliveries_csv):
+    if not SHARED_DIR:
+        return build_season(season, matches_csv, deliveries_csv)
+    # Published bundles are keyed by the CSVs and the code that derived the tables from them
+    files = [(os.path.getsize(path), os.stat(path).st_mtime_ns) for path in (matches_csv, deliveries_csv)]
+    name = f"ipl_{season}_{hashlib.sha1(os.path.abspath(matches_csv).encode()).hexdigest()[:8]}"
+    key = hashlib.sha1(repr((files, SHARED_CODE)).encode()).hexdigest()[:16]
+    with stage(metrics, "season.attach"):
+        data = shared_bundle(SHARED_DIR, name, key, lambda: shareable_season(season, matches_csv, deliveries_csv))
+    data["lock"] = threading.Lock()
+    return data
+
+
+# Fingerprint of this application's modules, part of every shared bundle's key
+SHARED_CODE = code_fingerprint([os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+                                for name in os.listdir(os.path.dirname(os.path.abspath(__file__))) if name.endswith('.py')])
+
+
+registry = create_registry(DATA_DIR, load_season, SEASON_MEMORY_MB * 1024 * 1024)
+
+# Load the latest season and warm its leaderboards so the first request does not pay for them
+get_season_stats(get_season(registry, latest_season(registry)))
 
 if __name__ == '__main__':
     # Get the port from the environment variable, default to 5000 if not set
@@ -0,0 +1,162 @@
+# Latency of GET /query against targets, on synthetic seasons (benchmarks/synthetic.py) totalling
+# at least 10M deliveries, queried with ?season=all. Full scans, index-narrowed queries, a single
+# season and repeat (cached) requests are timed separately; exits 1 when a p95 misses its target.
+# Run from the repository root: python benchmarks/query.py [--deliveries 10000000] [--seasons 6] [--requests 20]
+# Results are written as JSON (default benchmarks/results/query-<commit>.json).
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from synthetic import generate
+from routes import ROOT, DATA_ROOT, RESULTS_DIR, latency_stats, git_commit
+
+# Deliveries per match of the real 2024 season, to size the synthetic seasons
+DELIVERIES_PER_MATCH = 17103 / 74
+
+# p95 targets in milliseconds per kind of query
+TARGETS_MS = {
+    "scan": 1500,      # every delivery of every season
+    "narrowed": 250,   # candidate matches found through the team / venue / date indexes
+    "season": 300,     # every delivery of one season
+    "cached": 10,      # a repeat of any of them
+}
+
+# Query name -> (kind, path template); {team}, {opponent}, {venue}, {date_from}, {date_to} and
+# {season} come from the data
+QUERIES = {
+    'batters': ("scan", '/query?group=batter&season=all'),
+    'bowlers-death': ("scan", '/query?group=bowler&phase=death&season=all&min_balls=120'),
+    'teams-by-over': ("scan", '/query?group=team,over&season=all&metrics=runs,balls,wickets,economy'),
+    'venues-bowling': ("scan", '/query?group=venue&side=bowling&season=all'),
+    'matches': ("scan", '/query?group=match&season=all&sort=runs&limit=20'),
+    'batter-vs-opponent': ("narrowed", '/query?group=batter&team={team}&opponent={opponent}&season=all'),
+    'bowlers-at-venue': ("narrowed", '/query?group=bowler&venue={venue}&season=all&sort=economy&order=asc&min_balls=60'),
+    'month-by-phase': ("narrowed", '/query?group=team,phase&date_from={date_from}&date_to={date_to}&season=all'),
+    'team-death-overs': ("narrowed", '/query?group=over&team={team}&over_from=16&innings=2&season=all'),
+    'one-season-batters': ("season", '/query?group=batter,team&season={season}&min_balls=100'),
+}
+
+
+def dataset_dir(deliveries, seasons):
+    # seasons synthetic seasons of equal size, generated once with fixed seeds and reused by later runs
+    data_dir = os.path.join(DATA_ROOT, f'query-{deliveries}-{seasons}')
+    matches = math.ceil(deliveries / seasons / DELIVERIES_PER_MATCH)
+    for i in range(seasons):
+        if not os.path.exists(os.path.join(data_dir, f'ipl_{2025 + i}_deliveries.csv')):
+            start = time.perf_counter()
+            _, written = generate(data_dir, matches=matches, first_season=2025 + i, seed=i)
+            print(f"generated season {2025 + i}: {written} deliveries in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return data_dir
+
+
+def query_values(app):
+    # Two teams, a venue, a month and a season of the data
+    first = app.season_names(app.registry)[0]
+    matches = app.get_season(app.registry, first)["match_history"]
+    teams = sorted(set(matches["team1"].astype(str)))
+    dates = pd.to_datetime(matches["date"], format='%d-%m-%Y').sort_values()
+    return {
+        "team": teams[0],
+        "opponent": teams[1],
+        "venue": app.venue_id(matches["venue"].astype(str).iloc[0]),
+        "date_from": dates.iloc[0].strftime('%Y-%m-%d'),
+        "date_to": (dates.iloc[0] + pd.Timedelta(days=30)).strftime('%Y-%m-%d'),
+        "season": first,
+    }
+
+
+def time_queries(client, urls, requests):
+    results = {}
+    for name, url in urls.items():
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        results[name] = {"groups": response.get_json()["groups"], **latency_stats(timings)}
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--deliveries', type=int, default=10_000_000, help='deliveries across all seasons, at least')
+    parser.add_argument('--seasons', type=int, default=6, help='seasons the deliveries are split into')
+    parser.add_argument('--requests', type=int, default=20, help='requests per query and mode')
+    parser.add_argument('--out', help='result file (default benchmarks/results/query-<commit>.json)')
+    args = parser.parse_args()
+
+    os.environ['IPL_DATA_DIR'] = dataset_dir(args.deliveries, args.seasons)
+    # Every season stays loaded, and a fresh shared directory is removed afterwards
+    os.environ['IPL_SEASON_MEMORY_MB'] = str(1 << 20)
+    shared_dir = os.environ['IPL_SHARED_DIR'] = tempfile.mkdtemp(prefix='ipl-bench-')
+    sys.path.insert(0, ROOT)
+    try:
+        start = time.perf_counter()
+        import app  # noqa: E402
+        seasons = [(season, app.published_season(season)) for season in app.season_names(app.registry)]
+        load_seconds = time.perf_counter() - start
+        deliveries = sum(len(data["ball_by_ball"]) for _, data in seasons)
+
+        values = query_values(app)
+        urls = {name: template.format(**values) for name, (_, template) in QUERIES.items()}
+        client = app.app.test_client()
+
+        # Every request computed from scratch first, then the same requests answered from the caches
+        cache_sizes = app.response_cache["max_bytes"], app.query_cache["max_bytes"]
+        app.response_cache["max_bytes"] = app.query_cache["max_bytes"] = 0
+        uncached = time_queries(client, urls, args.requests)
+        app.response_cache["max_bytes"], app.query_cache["max_bytes"] = cache_sizes
+        # Warmed through the same queries written differently (a default spelled out), so the first timed
+        # request of each is answered from the query cache and the rest from the response cache
+        for url in urls.values():
+            client.get(url + ('&order=desc' if 'order=' not in url else f'&limit={app.QUERY_ROWS}'))
+        cached = time_queries(client, urls, args.requests)
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "seasons": len(seasons),
+        "deliveries": deliveries,
+        "load_seconds": round(load_seconds, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "targets_ms": TARGETS_MS,
+        "uncached": uncached,
+        "cached": cached,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f'query-{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{deliveries} deliveries in {len(seasons)} seasons, loaded in {load_seconds:.1f} s, peak rss {results['peak_rss_mb']:.0f} MB")
+    print(f"{'query':>20} {'kind':>9} {'groups':>7} {'p50 ms':>9} {'p95 ms':>9} {'target':>7} {'cached p95':>11} {'target':>7}")
+    failed = []
+    for name, (kind, _) in QUERIES.items():
+        p95, cached_p95 = uncached[name]["p95_ms"], cached[name]["p95_ms"]
+        if p95 > TARGETS_MS[kind]:
+            failed.append(f"{name} uncached")
+        if cached_p95 > TARGETS_MS["cached"]:
+            failed.append(f"{name} cached")
+        print(f"{name:>20} {kind:>9} {uncached[name]['groups']:>7} {uncached[name]['p50_ms']:>9.1f} {p95:>9.1f} {TARGETS_MS[kind]:>7} "
+              f"{cached_p95:>11.2f} {TARGETS_MS['cached']:>7}")
+    print(f"results written to {out}")
+    if failed:
+        print(f"over target: {', '.join(failed)}")
+        sys.exit(1)
+    print("all queries within target")
@@ -0,0 +1,214 @@
+# Latency percentiles and peak memory of every route, on the real 2024 season and on
+# synthetic seasons (benchmarks/synthetic.py) with 10x, 100x and 1000x its matches.
+# Run from the repository root: python benchmarks/routes.py [--scales 1,10,100] [--requests 200] [--compare old.json]
+# Results are written as JSON (default benchmarks/results/routes-<commit>.json) to compare commits.
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic import generate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Scaled datasets are generated once and reused by later runs, so commits are compared on the same data
+DATA_ROOT = os.path.join(ROOT, 'benchmarks', 'data')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# Route name -> path template; {match_no}, {team} and {venue} cycle through the season's values
+ROUTES = {
+    'points-table': '/points-table',
+    'matches': '/matches',
+    'players': '/players',
+    'get-scorecard': '/get-scorecard/{match_no}',
+    'get-fow': '/get-fow/{match_no}',
+    'get-overs': '/get-overs/{match_no}',
+    'get-partnerships': '/get-partnerships/{match_no}',
+    'get-teams': '/get-teams/{team}',
+    'get-venue': '/get-venue/{venue}',
+    'get-stats': '/get-stats',
+}
+
+
+def dataset_dir(factor):
+    # Scale 1 is the real data; larger scales are one synthetic 2024 season with factor times
+    # as many matches, generated once with a fixed seed
+    if factor == 1:
+        return ROOT
+    data_dir = os.path.join(DATA_ROOT, f'synthetic-{factor}')
+    if not os.path.exists(os.path.join(data_dir, 'ipl_2024_deliveries.csv')):
+        start = time.perf_counter()
+        generate(data_dir, matches=74 * factor, first_season=2024, seed=0)
+        print(f"generated {factor}x dataset in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return data_dir
+
+
+def latency_stats(timings):
+    milliseconds = np.array(timings) * 1000
+    return {
+        "requests": len(timings),
+        "mean_ms": round(float(milliseconds.mean()), 3),
+        "p50_ms": round(float(np.percentile(milliseconds, 50)), 3),
+        "p95_ms": round(float(np.percentile(milliseconds, 95)), 3),
+        "p99_ms": round(float(np.percentile(milliseconds, 99)), 3),
+        "max_ms": round(float(milliseconds.max()), 3),
+    }
+
+
+def drive_routes(client, values, requests, warm=False):
+    # {route: latency stats}; the first request of each route is reported on its own as cold_ms.
+    # With warm=True every URL is requested once before timing starts.
+    results = {}
+    for name, template in ROUTES.items():
+        urls = [template.format(match_no=match_no, team=team, venue=venue)
+                for match_no, team, venue in zip(values["match_no"], values["team"], values["venue"])]
+        if warm:
+            for url in set(urls):
+                client.get(url)
+        timings = []
+        for i in range(requests + 1):
+            start = time.perf_counter()
+            response = client.get(urls[i % len(urls)])
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"{urls[i % len(urls)]} returned {response.status_code}")
+        results[name] = {"cold_ms": round(timings[0] * 1000, 3), **latency_stats(timings[1:])}
+    return results
+
+
+def route_values(season, count):
+    # count values per path parameter, cycling through the season's matches, teams and venues
+    match_history = season["match_history"]
+    match_nos = sorted(season["match_rows"])
+    teams = sorted(set(match_history["team1"].astype(str)))
+    venues = sorted(set(match_history["venue"].astype(str)))
+    return {
+        "match_no": [match_nos[i * 7919 % len(match_nos)] for i in range(count)],
+        "team": [teams[i % len(teams)] for i in range(count)],
+        "venue": [venues[i % len(venues)] for i in range(count)],
+    }
+
+
+def run_worker(factor, requests):
+    # One dataset in a fresh process, so peak memory belongs to that dataset alone
+    os.environ['IPL_DATA_DIR'] = dataset_dir(factor)
+    # A fresh shared directory, so load_seconds covers building and publishing the season
+    # rather than attaching to one published by an earlier run
+    shared_dir = os.environ['IPL_SHARED_DIR'] = tempfile.mkdtemp(prefix='ipl-bench-')
+    sys.path.insert(0, ROOT)
+    start = time.perf_counter()
+    import app  # noqa: E402  Loads and warms the latest season
+    load_seconds = time.perf_counter() - start
+
+    season = app.get_season(app.registry, app.latest_season(app.registry))
+    values = route_values(season, requests + 1)
+    client = app.app.test_client()
+
+    # Every request rendered from scratch first, then the same requests served from a warm response cache
+    cache_size = app.response_cache["max_bytes"]
+    app.response_cache["max_bytes"] = 0
+    uncached = drive_routes(client, values, requests)
+    app.response_cache["max_bytes"] = cache_size
+    cached = drive_routes(client, values, requests, warm=True)
+    shutil.rmtree(shared_dir, ignore_errors=True)
+
+    return {
+        "matches": len(season["match_history"]),
+        "deliveries": len(season["ball_by_ball"]),
+        "load_seconds": round(load_seconds, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "uncached": uncached,
+        "cached": cached,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(baseline, results):
+    # p50 / p95 of every route against an earlier run, as new / old ratios
+    print(f"{'scale':>6} {'mode':>9} {'route':>17} {'p50 old':>9} {'p50 new':>9} {'p95 old':>9} {'p95 new':>9} {'p95 x':>7}")
+    for factor, scale in results["scales"].items():
+        old_scale = baseline["scales"].get(factor)
+        if old_scale is None:
+            continue
+        for mode in ['uncached', 'cached']:
+            for route, new in scale[mode].items():
+                old = old_scale[mode].get(route)
+                if old is None:
+                    continue
+                ratio = new["p95_ms"] / old["p95_ms"] if old["p95_ms"] else float('inf')
+                print(f"{factor:>6} {mode:>9} {route:>17} {old['p50_ms']:>9.2f} {new['p50_ms']:>9.2f} "
+                      f"{old['p95_ms']:>9.2f} {new['p95_ms']:>9.2f} {ratio:>6.2f}x")
+
+
+def summary(results):
+    print(f"{'scale':>6} {'deliveries':>11} {'load s':>7} {'rss MB':>7} {'route':>17} {'uncached p50/p95/p99 ms':>26} {'cached p50/p99 ms':>18}")
+    for factor, scale in results["scales"].items():
+        for route in ROUTES:
+            uncached, cached = scale["uncached"][route], scale["cached"][route]
+            print(f"{factor:>6} {scale['deliveries']:>11} {scale['load_seconds']:>7.1f} {scale['peak_rss_mb']:>7.0f} {route:>17} "
+                  f"{uncached['p50_ms']:>8.2f} {uncached['p95_ms']:>8.2f} {uncached['p99_ms']:>8.2f} "
+                  f"{cached['p50_ms']:>8.2f} {cached['p99_ms']:>8.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', default='1,10,100,1000', help='comma separated delivery multipliers (1 is the real data)')
+    parser.add_argument('--requests', type=int, default=200, help='requests per route and mode')
+    parser.add_argument('--out', help='result file (default benchmarks/results/routes-<commit>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_worker(args.worker, args.requests)))
+        sys.exit(0)
+
+    # Read before running, as the new results may be written over the same file
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "requests": args.requests,
+        "scales": {},
+        "failed": {},
+    }
+    for factor in [int(factor) for factor in args.scales.split(',')]:
+        worker = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', str(factor), '--requests', str(args.requests)],
+                                cwd=ROOT, capture_output=True, text=True)
+        if worker.returncode != 0:
+            # A scale that does not fit this machine (exit code -9: out of memory) is recorded and skipped
+            print(f"{factor}x failed with exit code {worker.returncode}:\n{worker.stderr[-2000:]}", file=sys.stderr)
+            results["failed"][str(factor)] = worker.returncode
+            continue
+        results["scales"][str(factor)] = json.loads(worker.stdout.strip().splitlines()[-1])
+
+    out = args.out or os.path.join(RESULTS_DIR, f'routes-{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    summary(results)
+    if baseline is not None:
+        compare(baseline, results)
+    print(f"results written to {out}")
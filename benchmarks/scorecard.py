@@ -0,0 +1,131 @@
+# Compares the vectorized scorecard engine with the old iterrows loop. The loop follows the
+# counting rules of derived_columns.py (no-balls are balls faced, byes and leg byes are not
+# charged to the bowler, the bowler is credited with every dismissal in BOWLER_WICKET_TYPES).
+# Run from the repository root: python benchmarks/scorecard.py [repeats]
+import math
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import build_scorecard, get_match, get_season, latest_season, registry  # noqa: E402
+from derived_columns import BOWLER_WICKET_TYPES  # noqa: E402
+
+
+def legacy_scorecard(match_data):
+    # The per-ball loop that /get-scorecard used before build_scorecard, with today's rules
+    innings_data = {1: {"batting": {}, "bowling": {}, "extras": {"total": 0, "wides": 0, "no_balls": 0, "leg_byes": 0, "byes": 0}},
+                    2: {"batting": {}, "bowling": {}, "extras": {"total": 0, "wides": 0, "no_balls": 0, "leg_byes": 0, "byes": 0}}}
+
+    for _, ball in match_data.iterrows():
+        innings = ball['innings']
+        striker = ball['striker']
+        bowler = ball['bowler']
+        runs_of_bat = ball['runs_of_bat']
+        extras = ball['extras']
+        wides = ball['wide']
+        no_balls = ball['noballs']
+        wicket_type = ball['wicket_type']
+
+        batting = innings_data[innings]["batting"].setdefault(striker, {
+            "batter": striker, "runs": 0, "balls": 0, "fours": 0, "sixes": 0, "dots": 0, "wicket_type": None, "fielder": None})
+        batting["runs"] += runs_of_bat
+        if wides != 1:
+            batting["balls"] += 1
+        if runs_of_bat == 0:
+            batting["dots"] += 1
+        if runs_of_bat == 4:
+            batting["fours"] += 1
+        if runs_of_bat == 6:
+            batting["sixes"] += 1
+        if not pd.isna(ball['player_dismissed']):
+            dismissed = innings_data[innings]["batting"].setdefault(ball['player_dismissed'], {
+                "batter": ball['player_dismissed'], "runs": 0, "balls": 0, "fours": 0, "sixes": 0, "dots": 0})
+            dismissed["wicket_type"] = wicket_type if not pd.isna(wicket_type) else "not out"
+            dismissed["fielder"] = ball['fielder'] if not pd.isna(ball['fielder']) else ""
+            dismissed["bowler"] = bowler
+
+        bowling = innings_data[innings]["bowling"].setdefault(bowler, {
+            "bowler": bowler, "runs": 0, "overs": 0.0, "maidens": 0, "fours": 0, "sixes": 0, "wides": 0, "no_balls": 0, "dots": 0, "wickets": 0})
+        bowling["runs"] += runs_of_bat + no_balls
+        if wides == 1:
+            bowling["runs"] += extras
+        bowling["wides"] += wides
+        bowling["no_balls"] += no_balls
+        if runs_of_bat == 0 and extras == 0:
+            bowling["dots"] += 1
+        if runs_of_bat == 4:
+            bowling["fours"] += 1
+        if runs_of_bat == 6:
+            bowling["sixes"] += 1
+
+        innings_data[innings]["extras"]["total"] += extras
+        if wides == 1:
+            innings_data[innings]["extras"]["wides"] += extras
+        innings_data[innings]["extras"]["no_balls"] += no_balls
+        if ball['legbyes'] == 1:
+            innings_data[innings]["extras"]["leg_byes"] += extras - no_balls
+        if ball['byes'] == 1:
+            innings_data[innings]["extras"]["byes"] += extras - no_balls
+
+        if no_balls != 1 and wides != 1:
+            current_overs = bowling["overs"]
+            balls_bowled = math.floor(current_overs) * 6 + (current_overs - math.floor(current_overs)) * 10 + 1
+            bowling["overs"] = math.floor(balls_bowled / 6) + (balls_bowled % 6) / 10
+        if wicket_type in BOWLER_WICKET_TYPES:
+            bowling["wickets"] += 1
+
+    return innings_data
+
+
+def same_card(legacy, engine):
+    # Maidens were never counted by the loop, so they are left out of the comparison
+    for innings in [1, 2]:
+        if legacy[innings]["extras"] != engine[innings]["extras"]:
+            return False
+        if list(legacy[innings]["batting"].values()) != engine[innings]["batting"]:
+            return False
+        for old, new in zip(legacy[innings]["bowling"].values(), engine[innings]["bowling"]):
+            old = {**old, "maidens": new["maidens"], "overs": round(old["overs"], 1)}
+            if old != new:
+                return False
+    return True
+
+
+def best_time(function, data, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    total_legacy = 0.0
+    total_engine = 0.0
+    mismatches = []
+    season = get_season(registry, latest_season(registry))
+    match_rows = season["match_rows"]
+
+    print(f"{'match':>5} {'balls':>6} {'loop ms':>9} {'engine ms':>10} {'speedup':>8}")
+    for match_no in sorted(match_rows):
+        _, match_data = get_match(season, match_no)
+        legacy_time = best_time(legacy_scorecard, match_data, repeats)
+        engine_time = best_time(build_scorecard, match_data, repeats)
+        total_legacy += legacy_time
+        total_engine += engine_time
+
+        if not same_card(legacy_scorecard(match_data), build_scorecard(match_data)):
+            mismatches.append(match_no)
+
+        speedup = legacy_time / engine_time if engine_time > 0 else float('inf')
+        print(f"{match_no:>5} {len(match_data):>6} {legacy_time * 1000:>9.2f} {engine_time * 1000:>10.2f} {speedup:>7.1f}x")
+
+    print(f"\nAll {len(match_rows)} matches: loop {total_legacy * 1000:.1f} ms, engine {total_engine * 1000:.1f} ms, "
+          f"speedup {total_legacy / total_engine:.1f}x")
+    print("Outputs identical (except maidens)" if not mismatches else f"Output differs for matches: {mismatches}")
@@ -0,0 +1,84 @@
+# Replays one match delivery by delivery to many clients, polling versus /stream.
+# Run from the repository root: python benchmarks/stream.py [clients] [match_no]
+# Live deliveries arrive in match order, so the match replayed defaults to the final.
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def season_without_match(data_dir, match_no):
+    # The 2024 season with the match's deliveries held back; returns them as posted rows
+    shutil.copy(os.path.join(ROOT, 'ipl_2024_matches.csv'), data_dir)
+    deliveries = pd.read_csv(os.path.join(ROOT, 'ipl_2024_deliveries.csv'))
+    deliveries[deliveries['match_no'] != match_no].to_csv(os.path.join(data_dir, 'ipl_2024_deliveries.csv'), index=False)
+    held_back = deliveries[deliveries['match_no'] == match_no].astype(object)
+    return held_back.where(held_back.notna(), None).to_dict(orient='records')
+
+
+def polling(app, balls, clients, match_no):
+    # Every client fetches the scorecard and the worm after every delivery
+    client = app.test_client()
+    start = time.perf_counter()
+    for ball in balls:
+        client.post('/deliveries', json=ball)
+        for _ in range(clients):
+            client.get(f'/get-scorecard/{match_no}')
+            client.get(f'/get-fow/{match_no}')
+    return time.perf_counter() - start
+
+
+def streaming(app, balls, clients, match_no):
+    # Every client holds one /stream connection; the time runs until all of them saw every delivery
+    received = []
+
+    def subscribe(response):
+        seen = 0
+        for chunk in response.response:
+            seen += chunk.count(b'event: delivery')
+            if seen >= len(balls):
+                break
+        received.append(seen)
+        response.close()
+
+    responses = [app.test_client().get(f'/stream/{match_no}', buffered=False) for _ in range(clients)]
+    threads = [threading.Thread(target=subscribe, args=(response,)) for response in responses]
+    client = app.test_client()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for ball in balls:
+        client.post('/deliveries', json=ball)
+    for thread in threads:
+        thread.join()
+    assert received == [len(balls)] * clients
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    match_no = int(sys.argv[2]) if len(sys.argv) > 2 else 74
+
+    timings = {}
+    for mode in [polling, streaming]:
+        # A fresh app per mode, so both replay the match onto the same starting point
+        with tempfile.TemporaryDirectory() as data_dir:
+            balls = season_without_match(data_dir, match_no)
+            os.environ['IPL_DATA_DIR'] = data_dir
+            sys.modules.pop('app', None)
+            sys.path.insert(0, ROOT)
+            import app  # noqa: E402
+            timings[mode.__name__] = mode(app.app, balls, clients, match_no)
+
+    per_ball = {mode: seconds / len(balls) * 1000 for mode, seconds in timings.items()}
+    print(json.dumps({"clients": clients, "match_no": match_no, "deliveries": len(balls),
+                      "seconds": timings, "ms_per_delivery": per_ball}, indent=2))
+    print(f"{clients} clients, {len(balls)} deliveries: polling {per_ball['polling']:.1f} ms per delivery, "
+          f"streaming {per_ball['streaming']:.2f} ms per delivery ({timings['polling'] / timings['streaming']:.0f}x)")
@@ -0,0 +1,53 @@
+# Memory and groupby time of the deliveries with plain string names versus symbol codes.
+# Run from the repository root: python benchmarks/symbols.py [seasons]
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from symbols import encode_dataset  # noqa: E402
+
+
+def multi_season(matches, deliveries, seasons):
+    # The 2024 season repeated under earlier season numbers
+    match_frames, delivery_frames = [], []
+    for offset in range(seasons):
+        match_frames.append(matches.assign(season=matches['season'] - offset))
+        delivery_frames.append(deliveries.assign(season=deliveries['season'] - offset))
+    return pd.concat(match_frames, ignore_index=True), pd.concat(delivery_frames, ignore_index=True)
+
+
+def best_time(function, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure(deliveries):
+    return {
+        "memory MB": deliveries.memory_usage(deep=True).sum() / 1e6,
+        "groupby bowler ms": best_time(lambda: deliveries.groupby('bowler', observed=True)['runs_of_bat'].sum()) * 1000,
+        "groupby team, striker ms": best_time(lambda: deliveries.groupby(['batting_team', 'striker'], observed=True)['runs_of_bat'].sum()) * 1000,
+        "striker == filter ms": best_time(lambda: deliveries[deliveries['striker'] == 'V Kohli']) * 1000,
+    }
+
+
+if __name__ == '__main__':
+    seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    matches, deliveries = multi_season(pd.read_csv('ipl_2024_matches.csv'), pd.read_csv('ipl_2024_deliveries.csv'), seasons)
+
+    start = time.perf_counter()
+    _, encoded, _, symbols = encode_dataset(matches, deliveries)
+    encode_time = time.perf_counter() - start
+
+    before = measure(deliveries)
+    after = measure(encoded)
+    print(f"{seasons} seasons, {len(deliveries)} deliveries, {len(symbols.categories)} symbols, encoded in {encode_time * 1000:.0f} ms")
+    print(f"{'':<26}{'strings':>10}{'codes':>10}")
+    for key in before:
+        print(f"{key:<26}{before[key]:>10.1f}{after[key]:>10.1f}")
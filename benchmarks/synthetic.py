@@ -0,0 +1,472 @@
+# Synthetic seasons in the exact ipl_<season>_matches.csv / ipl_<season>_deliveries.csv schemas
+# app.py reads. Ball outcomes (per over), line-ups, bowling plans, fixtures, venues and umpires
+# are fitted from the real 2024 files; every innings is simulated ball by ball, vectorized
+# across thousands of innings at once, so scores, wickets and squads agree between the files.
+# Run from the repository root:
+#   python benchmarks/synthetic.py OUT_DIR --seasons 10 [--first-season 2025] [--seed 0]
+#   python benchmarks/synthetic.py OUT_DIR --matches 100000 [--first-season 2025] [--seed 0]
+import argparse
+import os
+import sys
+import time
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OVERS = 20
+MAX_LEGAL_BALLS = OVERS * 6
+MAX_WICKETS = 10
+# Deliveries simulated per innings: 120 legal balls plus room for wides and no-balls.
+# An innings that has not finished by then (vanishingly rare) simply ends there.
+SLOTS = 160
+# Matches simulated together; bounds the memory of the (matches, 2, SLOTS) arrays
+CHUNK_MATCHES = 4000
+# pandas timestamps, which app.py parses match dates into, end in 2262
+LAST_SEASON = 2261
+# Bowler of every over as positions in a five-man attack: four overs each, never two in a row
+DEFAULT_BOWLING_PLAN = [0, 1, 0, 1, 2, 3, 2, 3, 4, 0, 4, 1, 2, 3, 4, 0, 1, 2, 3, 4]
+
+MATCH_COLUMNS = ['match_id', 'season', 'date', 'match_no', 'venue', 'city', 'team1', 'team2', 'toss_winner', 'toss_decision',
+                 'innings1_score', 'innings1_wickets', 'innings2_score', 'innings2_wickets', 'winning_team', 'margin', 'won_by',
+                 'player_of_the_match', 'team1_players', 'team2_players', 'umpire1', 'umpire2', 'umpire3']
+DELIVERY_COLUMNS = ['match_id', 'season', 'match_no', 'date', 'venue', 'batting_team', 'bowling_team', 'innings', 'over', 'striker',
+                    'non_striker', 'bowler', 'runs_of_bat', 'extras', 'wide', 'legbyes', 'byes', 'noballs', 'wicket_type',
+                    'player_dismissed', 'fielder']
+OUTCOME_COLUMNS = ['runs_of_bat', 'extras', 'wide', 'legbyes', 'byes', 'noballs', 'wicket_type']
+# Dismissals credited to a fielder
+FIELDED = {'caught', 'runout', 'stumped'}
+
+
+def csv_field(value):
+    # One value as it appears in a CSV row
+    value = '' if value is None or (isinstance(value, float) and np.isnan(value)) else str(value)
+    if any(char in value for char in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def fit_outcomes(deliveries):
+    # Every distinct (runs, extras, wicket) combination with its probability in each over
+    keys = deliveries[OUTCOME_COLUMNS].fillna({'wicket_type': ''})
+    outcomes = keys.drop_duplicates().reset_index(drop=True)
+    outcome_of_ball = pd.MultiIndex.from_frame(outcomes).get_indexer(pd.MultiIndex.from_frame(keys))
+    over = np.minimum(np.floor(deliveries['over'].to_numpy()).astype(int), OVERS - 1)
+    counts = np.zeros((OVERS, len(outcomes)))
+    np.add.at(counts, (over, outcome_of_ball), 1)
+    cumulative = np.cumsum(counts / counts.sum(axis=1, keepdims=True), axis=1)
+    cumulative[:, -1] = 1.0
+
+    wicket = outcomes['wicket_type'].to_numpy() != ''
+    runouts = deliveries[deliveries['wicket_type'] == 'runout']
+    return {
+        "outcomes": outcomes,
+        "cumulative": cumulative,
+        "legal": ((outcomes['wide'] == 0) & (outcomes['noballs'] == 0)).to_numpy(),
+        "runs": (outcomes['runs_of_bat'] + outcomes['extras']).to_numpy().astype(np.int16),
+        # Runs physically run decide whether the batters swap ends; penalty runs do not
+        "ran": (outcomes['runs_of_bat'] + outcomes['extras'] - outcomes['wide'] - outcomes['noballs']).to_numpy().astype(np.int16),
+        "wicket": wicket,
+        "fielded": outcomes['wicket_type'].isin(FIELDED).to_numpy(),
+        "runout": (outcomes['wicket_type'] == 'runout').to_numpy(),
+        "runout_non_striker": float((runouts['player_dismissed'] != runouts['striker']).mean()) if len(runouts) else 0.0,
+        # Deliveries per slot of six legal balls, to place a simulated delivery in its over
+        "deliveries_per_over": 6 * len(deliveries) / int(((deliveries['wide'] == 0) & (deliveries['noballs'] == 0)).sum()),
+    }
+
+
+def fit_lineups(matches, deliveries, players):
+    # One line-up per team per real match: its squad, batting order, and the bowler of every over
+    codes = {name: code for code, name in enumerate(players)}
+    lineups = {"team": [], "squad": [], "batting": [], "bowling": []}
+    for match in matches.itertuples():
+        match_balls = deliveries[deliveries['match_no'] == match.match_no]
+        for team, squad in [(match.team1, match.team1_players), (match.team2, match.team2_players)]:
+            squad = [] if pd.isna(squad) else [name.strip() for name in squad.split(',')]
+            if len(squad) < 11 or len(match_balls) == 0:
+                continue
+            batting = match_balls[match_balls['batting_team'] == team]
+            # Batters in order of appearance, then the rest of the squad in squad order
+            order = list(dict.fromkeys(name for pair in zip(batting['striker'], batting['non_striker']) for name in pair))
+            order = list(dict.fromkeys(order + squad))[:11]
+
+            bowling = match_balls[match_balls['bowling_team'] == team]
+            overs = bowling.assign(over_no=np.floor(bowling['over']).astype(int)).groupby('over_no', sort=True)['bowler'].first()
+            if len(overs) == OVERS:
+                plan = overs.tolist()
+            else:
+                # Innings cut short: the five bowlers with most deliveries share the full 20 overs
+                attack = bowling['bowler'].value_counts().index.tolist()
+                attack = list(dict.fromkeys(attack + squad[::-1]))[:5]
+                plan = [attack[position] for position in DEFAULT_BOWLING_PLAN]
+
+            lineups["team"].append(team)
+            # Anyone who batted or bowled is listed in the squad, even where the real list missed them
+            lineups["squad"].append(', '.join(dict.fromkeys(squad + order + plan)))
+            lineups["batting"].append([codes[name] for name in order])
+            lineups["bowling"].append([codes[name] for name in plan])
+
+    team = np.array(lineups["team"], dtype=object)
+    by_team = {name: np.flatnonzero(team == name) for name in sorted(set(lineups["team"]))}
+    return {
+        "team": team,
+        "squad": np.array(lineups["squad"], dtype=object),
+        "batting": np.array(lineups["batting"], dtype=np.int32),
+        "bowling": np.array(lineups["bowling"], dtype=np.int32),
+        "by_team": by_team,
+    }
+
+
+def fit_model(matches_csv, deliveries_csv):
+    # Everything the generator samples from, taken from one real season
+    matches = pd.read_csv(matches_csv)
+    deliveries = pd.read_csv(deliveries_csv)
+    squads = matches['team1_players'].dropna().tolist() + matches['team2_players'].dropna().tolist()
+    names = set(deliveries['striker']) | set(deliveries['non_striker']) | set(deliveries['bowler']) | set(deliveries['fielder'].dropna())
+    names |= {name.strip() for squad in squads for name in squad.split(',')}
+    players = np.array(sorted(names), dtype=object)
+
+    # League fixtures keep their pairing, venue and date; playoffs their venue and date
+    league = matches[matches['match_no'] <= 70]
+    playoffs = matches[matches['match_no'] > 70]
+    tossed = matches[matches['toss_decision'].isin(['bat', 'field'])]
+    return {
+        **fit_outcomes(deliveries),
+        "players": players,
+        "lineups": fit_lineups(matches, deliveries, players),
+        "fixtures": league[['team1', 'team2', 'venue', 'city', 'date']].reset_index(drop=True),
+        "playoff_fixtures": playoffs[['venue', 'city', 'date']].reset_index(drop=True),
+        "toss_field": float((tossed['toss_decision'] == 'field').mean()),
+        "umpires": np.array(sorted(set(matches['umpire1'].dropna()) | set(matches['umpire2'].dropna())), dtype=object),
+        "third_umpires": np.array(sorted(set(matches['umpire3'].dropna())), dtype=object),
+        "season": int(matches['season'].iloc[0]),
+    }
+
+
+def simulate_innings(model, rng, batting, bowling, targets=None):
+    # Ball-by-ball state of len(batting) innings as (innings, SLOTS) arrays. batting / bowling are
+    # line-up indices; targets, when given, end a chase as soon as it is passed.
+    count = len(batting)
+    over_of_slot = np.minimum((np.arange(SLOTS) / model["deliveries_per_over"]).astype(int), OVERS - 1)
+    draws = rng.random((count, SLOTS))
+    outcome = np.empty((count, SLOTS), dtype=np.int16)
+    for over in range(OVERS):
+        slots = over_of_slot == over
+        outcome[:, slots] = np.searchsorted(model["cumulative"][over], draws[:, slots], side='right')
+
+    legal = model["legal"][outcome]
+    wicket = model["wicket"][outcome]
+    legal_count = np.cumsum(legal, axis=1, dtype=np.int16)
+    wickets = np.cumsum(wicket, axis=1, dtype=np.int16)
+    total = np.cumsum(model["runs"][outcome], axis=1, dtype=np.int32)
+
+    # An innings ends on its 120th legal ball, its 10th wicket or the winning run
+    ended = (legal_count >= MAX_LEGAL_BALLS) | (wickets >= MAX_WICKETS)
+    if targets is not None:
+        ended |= total > targets[:, None]
+    alive = np.ones((count, SLOTS), dtype=bool)
+    alive[:, 1:] = ~np.logical_or.accumulate(ended, axis=1)[:, :-1]
+
+    # Batters swap ends on an odd number of runs run and at the end of every over
+    legal_before = legal_count - legal
+    flip = (model["ran"][outcome] % 2 == 1) ^ (legal & (legal_before % 6 == 5))
+    strike_end = ((np.cumsum(flip, axis=1, dtype=np.int16) - flip) % 2).astype(np.int8)
+
+    # The next batter takes the dismissed batter's end; batting positions only ever increase, so
+    # the batter at each end is a running maximum of the positions that arrived there
+    non_striker_out = wicket & model["runout"][outcome] & (rng.random((count, SLOTS)) < model["runout_non_striker"])
+    dismissed_end = strike_end ^ non_striker_out
+    at_end = []
+    for end in (0, 1):
+        arrivals = np.where(wicket & (dismissed_end == end), np.minimum(wickets + 1, 10), end).astype(np.int8)
+        arrivals = np.concatenate([np.full((count, 1), end, dtype=np.int8), arrivals[:, :-1]], axis=1)
+        at_end.append(np.maximum.accumulate(arrivals, axis=1))
+    striker = np.where(strike_end == 0, at_end[0], at_end[1])
+    non_striker = np.where(strike_end == 0, at_end[1], at_end[0])
+    dismissed = np.where(dismissed_end == 0, at_end[0], at_end[1])
+
+    lineups = model["lineups"]
+    over = np.minimum(legal_before // 6, OVERS - 1)
+    fielder = lineups["batting"][bowling[:, None], rng.integers(0, 11, (count, SLOTS))]
+    runs = np.where(alive, model["runs"][outcome], 0)
+    return {
+        "alive": alive,
+        "outcome": outcome,
+        "legal_before": legal_before,
+        "striker": lineups["batting"][batting[:, None], striker],
+        "striker_position": striker,
+        "non_striker": lineups["batting"][batting[:, None], non_striker],
+        "bowler": lineups["bowling"][bowling[:, None], over],
+        "dismissed": np.where(wicket, lineups["batting"][batting[:, None], dismissed], -1),
+        "fielder": np.where(model["fielded"][outcome], fielder, -1),
+        "score": runs.sum(axis=1),
+        "wickets": (wicket & alive).sum(axis=1),
+        "legal_balls": (legal & alive).sum(axis=1),
+    }
+
+
+def pick_lineups(model, rng, teams):
+    # A random real line-up of each team
+    by_team = model["lineups"]["by_team"]
+    picks = np.empty(len(teams), dtype=np.int64)
+    for team, options in by_team.items():
+        rows = np.flatnonzero(teams == team)
+        picks[rows] = options[rng.integers(0, len(options), len(rows))]
+    return picks
+
+
+def play(model, rng, fixtures):
+    # Plays the fixtures (season, match_no, team_a, team_b, venue, city, date): toss, two innings,
+    # result. Returns the matches table and the deliveries as CSV text chunks per season.
+    count = len(fixtures)
+    team_a, team_b = fixtures['team_a'].to_numpy(object), fixtures['team_b'].to_numpy(object)
+    toss_winner = np.where(rng.random(count) < 0.5, team_a, team_b)
+    toss_decision = np.where(rng.random(count) < model["toss_field"], 'field', 'bat')
+    other = np.where(toss_winner == team_a, team_b, team_a)
+    team1 = np.where(toss_decision == 'bat', toss_winner, other)
+    team2 = np.where(toss_decision == 'bat', other, toss_winner)
+    lineup1, lineup2 = pick_lineups(model, rng, team1), pick_lineups(model, rng, team2)
+
+    first = simulate_innings(model, rng, lineup1, lineup2)
+    second = simulate_innings(model, rng, lineup2, lineup1, targets=first["score"])
+
+    # Ties are shared, as app.py does for 'TIE'; playoff ties go to a super over
+    score1, score2 = first["score"], second["score"]
+    tie = score1 == score2
+    super_over = tie & fixtures['playoff'].to_numpy()
+    super_over_winner = np.where(rng.random(count) < 0.5, team1, team2)
+    winner = np.where(score1 > score2, team1, np.where(score2 > score1, team2, np.where(super_over, super_over_winner, 'TIE')))
+    margin = pd.array(np.where(score1 > score2, score1 - score2, MAX_WICKETS - second["wickets"]), dtype='Int64')
+    margin[tie] = pd.NA
+    won_by = np.where(score1 > score2, 'runs', np.where(score2 > score1, 'wickets', np.where(super_over, 'super over', None)))
+
+    # Player of the match: the top scorer of the winning side
+    runs_by_position = np.zeros((count, 2, 11))
+    for innings, state in enumerate([first, second]):
+        rows, slots = np.nonzero(state["alive"])
+        bat_runs = model["outcomes"]['runs_of_bat'].to_numpy()[state["outcome"][rows, slots]]
+        np.add.at(runs_by_position, (rows, innings, state["striker_position"][rows, slots]), bat_runs)
+    winning_innings = np.where(winner == team1, 0, 1)
+    winning_lineup = np.where(winner == team1, lineup1, lineup2)
+    best_position = runs_by_position[np.arange(count), winning_innings].argmax(axis=1)
+    best_player = model["players"][model["lineups"]["batting"][winning_lineup, best_position]]
+    player_of_the_match = np.where(winner == 'TIE', None, best_player)
+
+    umpires = rng.choice(model["umpires"], (count, 2), replace=True)
+    same = umpires[:, 0] == umpires[:, 1]
+    umpires[same, 1] = model["umpires"][(np.searchsorted(model["umpires"], umpires[same, 0]) + 1) % len(model["umpires"])]
+    squads = model["lineups"]["squad"]
+    match_table = pd.DataFrame({
+        'match_id': fixtures['match_id'].to_numpy(),
+        'season': fixtures['season'].to_numpy(),
+        'date': fixtures['date'].to_numpy(),
+        'match_no': fixtures['match_no'].to_numpy(),
+        'venue': fixtures['venue'].to_numpy(),
+        'city': fixtures['city'].to_numpy(),
+        'team1': team1, 'team2': team2,
+        'toss_winner': toss_winner, 'toss_decision': toss_decision,
+        'innings1_score': score1, 'innings1_wickets': first["wickets"],
+        'innings2_score': score2, 'innings2_wickets': second["wickets"],
+        'winning_team': winner, 'margin': margin, 'won_by': won_by,
+        'player_of_the_match': player_of_the_match,
+        'team1_players': squads[lineup1], 'team2_players': squads[lineup2],
+        'umpire1': umpires[:, 0], 'umpire2': umpires[:, 1],
+        'umpire3': rng.choice(model["third_umpires"], count),
+    })
+    # Balls faced for net run rate: an all-out side is charged its full 20 overs
+    balls1 = np.where(first["wickets"] == MAX_WICKETS, MAX_LEGAL_BALLS, first["legal_balls"])
+    balls2 = np.where(second["wickets"] == MAX_WICKETS, MAX_LEGAL_BALLS, second["legal_balls"])
+    return match_table, (balls1, balls2), delivery_rows(model, fixtures, team1, team2, first, second)
+
+
+def lookup(table, codes):
+    # table[code] for every code, as a tuple
+    if len(codes) == 0:
+        return ()
+    values = itemgetter(*codes.tolist())(table)
+    return values if len(codes) > 1 else (values,)
+
+
+def delivery_rows(model, fixtures, team1, team2, first, second):
+    # The deliveries as CSV lines, assembled from per-column lookup tables of preformatted fields
+    count = len(fixtures)
+    iso_dates = pd.to_datetime(fixtures['date'], format='%d-%m-%Y').dt.strftime('%Y-%m-%d').to_numpy()
+    prefixes = []
+    for innings, batting, bowling in [(1, team1, team2), (2, team2, team1)]:
+        prefixes.append([
+            ','.join(csv_field(value) for value in row) + ','
+            for row in zip(fixtures['match_id'], fixtures['season'], fixtures['match_no'], iso_dates,
+                           fixtures['venue'] + ', ' + fixtures['city'], batting, bowling, [innings] * count)
+        ])
+    # Innings prefixes interleaved so the rows come out match by match, first innings first
+    prefix = [value for pair in zip(*prefixes) for value in pair]
+
+    stacked = {key: np.stack([first[key], second[key]], axis=1) for key in
+               ["alive", "outcome", "legal_before", "striker", "non_striker", "bowler", "dismissed", "fielder"]}
+    rows, innings, slots = np.nonzero(stacked["alive"])
+    pick = (rows, innings, slots)
+    names = [csv_field(name) + ',' for name in model["players"]] + [',']
+    last_names = [csv_field(name) + '\n' for name in model["players"]] + ['\n']
+    overs = [f'{ball // 6}.{ball % 6 + 1},' for ball in range(MAX_LEGAL_BALLS)]
+    outcomes = [','.join(csv_field(value) for value in row) + ',' for row in model["outcomes"].itertuples(index=False)]
+
+    columns = [
+        (rows * 2 + innings, prefix),
+        (np.minimum(stacked["legal_before"][pick], MAX_LEGAL_BALLS - 1), overs),
+        (stacked["striker"][pick], names),
+        (stacked["non_striker"][pick], names),
+        (stacked["bowler"][pick], names),
+        (stacked["outcome"][pick], outcomes),
+        (stacked["dismissed"][pick], names),
+        (stacked["fielder"][pick], last_names),
+    ]
+    lines = list(map(''.join, zip(*(lookup(table, codes) for codes, table in columns))))
+
+    # Split by season, each keeping the order of its rows
+    season = fixtures['season'].to_numpy()[rows]
+    years = np.unique(season)
+    if len(years) == 1:
+        return {int(years[0]): ''.join(lines)}
+    return {int(year): ''.join(lookup(lines, np.flatnonzero(season == year))) for year in years}
+
+
+def match_ids(seasons, match_nos):
+    # 202401 style ids; wider when a season has 100 or more matches
+    width = max(2, len(str(int(match_nos.max()))))
+    return seasons * 10 ** width + match_nos
+
+
+def league_fixtures(model, seasons, matches_per_season):
+    # The real league fixture list, cycled, for every season
+    fixtures = model["fixtures"]
+    index = np.tile(np.arange(matches_per_season) % len(fixtures), len(seasons))
+    season = np.repeat(seasons, matches_per_season)
+    match_no = np.tile(np.arange(1, matches_per_season + 1), len(seasons))
+    dates = fixtures['date'].to_numpy(object)[index]
+    return pd.DataFrame({
+        'season': season,
+        'match_no': match_no,
+        'match_id': match_ids(season, match_no),
+        'team_a': fixtures['team1'].to_numpy(object)[index],
+        'team_b': fixtures['team2'].to_numpy(object)[index],
+        'venue': fixtures['venue'].to_numpy(object)[index],
+        'city': fixtures['city'].to_numpy(object)[index],
+        # Same day and month as the real fixture, in the generated season's year
+        'date': [date[:6] + str(year) for date, year in zip(dates, season)],
+        'playoff': False,
+    })
+
+
+def standings(match_table, balls):
+    # Top four of every season by points, then net run rate
+    balls1, balls2 = balls
+    rows = []
+    for team_col, other_col, for_runs, for_balls, against_runs, against_balls in [
+            ('team1', 'team2', 'innings1_score', balls1, 'innings2_score', balls2),
+            ('team2', 'team1', 'innings2_score', balls2, 'innings1_score', balls1)]:
+        rows.append(pd.DataFrame({
+            'season': match_table['season'].to_numpy(),
+            'team': match_table[team_col].to_numpy(),
+            'points': np.where(match_table['winning_team'] == match_table[team_col], 2, np.where(match_table['winning_team'] == 'TIE', 1, 0)),
+            'runs_for': match_table[for_runs].to_numpy(), 'balls_for': for_balls,
+            'runs_against': match_table[against_runs].to_numpy(), 'balls_against': against_balls,
+        }))
+    table = pd.concat(rows).groupby(['season', 'team']).sum().reset_index()
+    table['nrr'] = table['runs_for'] / table['balls_for'] * 6 - table['runs_against'] / table['balls_against'] * 6
+    table = table.sort_values(['season', 'points', 'nrr'], ascending=[True, False, False], kind='stable')
+    return {season: group['team'].tolist()[:4] for season, group in table.groupby('season')}
+
+
+def playoff_fixtures(model, seasons, stage, pairs):
+    # stage 0..3: Qualifier 1, Eliminator, Qualifier 2, Final at the real playoff venues and dates
+    venue = model["playoff_fixtures"].iloc[stage]
+    match_no = np.full(len(seasons), len(model["fixtures"]) + stage + 1)
+    return pd.DataFrame({
+        'season': seasons,
+        'match_no': match_no,
+        'match_id': match_ids(np.asarray(seasons), match_no),
+        'team_a': [a for a, _ in pairs],
+        'team_b': [b for _, b in pairs],
+        'venue': venue['venue'],
+        'city': venue['city'],
+        'date': [venue['date'][:6] + str(season) for season in seasons],
+        'playoff': True,
+    })
+
+
+def generate(out_dir, seasons=None, matches=None, first_season=2025, seed=0):
+    # Writes ipl_<season>_*.csv for `seasons` full seasons (league plus playoffs) or for one
+    # season of `matches` league matches. Returns (matches, deliveries) written.
+    model = fit_model(os.path.join(ROOT, 'ipl_2024_matches.csv'), os.path.join(ROOT, 'ipl_2024_deliveries.csv'))
+    rng = np.random.default_rng(seed)
+    years = np.arange(first_season, first_season + (seasons or 1))
+    if years[-1] > LAST_SEASON:
+        raise ValueError(f"Seasons after {LAST_SEASON} do not fit pandas timestamps; use --matches for more data")
+    league_size = len(model["fixtures"]) if seasons else matches
+
+    os.makedirs(out_dir, exist_ok=True)
+    delivery_files = {int(year): open(os.path.join(out_dir, f'ipl_{year}_deliveries.csv.partial'), 'w') for year in years}
+    header = ','.join(DELIVERY_COLUMNS) + '\n'
+    for file in delivery_files.values():
+        file.write(header)
+    deliveries_written = 0
+
+    def play_chunks(fixtures):
+        nonlocal deliveries_written
+        tables, balls = [], ([], [])
+        for start in range(0, len(fixtures), CHUNK_MATCHES):
+            table, (balls1, balls2), chunks = play(model, rng, fixtures.iloc[start:start + CHUNK_MATCHES].reset_index(drop=True))
+            tables.append(table)
+            balls[0].append(balls1)
+            balls[1].append(balls2)
+            for year, text in chunks.items():
+                delivery_files[year].write(text)
+                deliveries_written += text.count('\n')
+        return pd.concat(tables, ignore_index=True), (np.concatenate(balls[0]), np.concatenate(balls[1]))
+
+    # Whole seasons per chunk keep every season's rows in match order
+    chunk_seasons = max(1, CHUNK_MATCHES // league_size)
+    tables = []
+    for start in range(0, len(years), chunk_seasons):
+        chunk_years = years[start:start + chunk_seasons]
+        league, balls = play_chunks(league_fixtures(model, chunk_years, league_size))
+        tables.append(league)
+        if not seasons:
+            continue
+
+        # Playoffs between each season's top four: Qualifier 1 and the Eliminator, then
+        # Qualifier 2 between the loser of the first and winner of the second, then the final
+        top = standings(league, balls)
+        q1, _ = play_chunks(playoff_fixtures(model, chunk_years, 0, [(top[y][0], top[y][1]) for y in chunk_years]))
+        eliminator, _ = play_chunks(playoff_fixtures(model, chunk_years, 1, [(top[y][2], top[y][3]) for y in chunk_years]))
+        q1_loser = np.where(q1['winning_team'] == q1['team1'], q1['team2'], q1['team1'])
+        q2, _ = play_chunks(playoff_fixtures(model, chunk_years, 2, list(zip(q1_loser, eliminator['winning_team']))))
+        final, _ = play_chunks(playoff_fixtures(model, chunk_years, 3, list(zip(q1['winning_team'], q2['winning_team']))))
+        tables += [q1, eliminator, q2, final]
+
+    match_table = pd.concat(tables, ignore_index=True).sort_values(['season', 'match_no'], kind='stable')
+    for year, file in delivery_files.items():
+        file.close()
+        match_table[match_table['season'] == year].to_csv(os.path.join(out_dir, f'ipl_{year}_matches.csv'), columns=MATCH_COLUMNS, index=False)
+        # Renamed once complete, so a half-written season is never picked up by app.py
+        os.replace(file.name, os.path.join(out_dir, f'ipl_{year}_deliveries.csv'))
+    return len(match_table), deliveries_written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('out_dir')
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument('--seasons', type=int, help='full 74-match seasons, one file pair each')
+    size.add_argument('--matches', type=int, help='one season of this many league matches')
+    parser.add_argument('--first-season', type=int, default=2025)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    match_count, delivery_count = generate(args.out_dir, args.seasons, args.matches, args.first_season, args.seed)
+    seconds = time.perf_counter() - start
+    print(f"{match_count} matches, {delivery_count} deliveries in {seconds:.1f} s "
+          f"({delivery_count / seconds / 1e6:.2f}M deliveries/s) -> {args.out_dir}", file=sys.stderr)
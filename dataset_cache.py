@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes so old caches are rebuilt
+CACHE_FORMAT = 1
+
+
+def file_checksum(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def cache_dir(csv_path):
+    # ipl_2024_deliveries.csv -> ipl_2024_deliveries.csv.cache/
+    return csv_path + '.cache'
+
+
+def write_cache(frame, csv_path, checksum):
+    # One .npy array per column. Text columns are stored as int32 codes plus a fixed-width
+    # array of their distinct values so both can be memory-mapped.
+    directory = cache_dir(csv_path)
+    os.makedirs(directory, exist_ok=True)
+    stat = os.stat(csv_path)
+    manifest = {
+        "format": CACHE_FORMAT,
+        "source": os.path.basename(csv_path),
+        "checksum": checksum,
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "rows": len(frame),
+        "columns": [],
+    }
+
+    for i, column in enumerate(frame.columns):
+        values = frame[column]
+        entry = {"name": column, "file": f"col{i}.npy"}
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            entry["kind"] = "numeric"
+            np.save(os.path.join(directory, entry["file"]), values.to_numpy())
+        else:
+            entry["kind"] = "text"
+            entry["values_file"] = f"col{i}_values.npy"
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+            np.save(os.path.join(directory, entry["file"]), codes.astype(np.int32))
+            np.save(os.path.join(directory, entry["values_file"]), np.asarray(uniques, dtype=str))
+        manifest["columns"].append(entry)
+
+    # The manifest is written last, so a half written cache is never picked up
+    with open(os.path.join(directory, 'manifest.json.tmp'), 'w') as file:
+        json.dump(manifest, file)
+    os.replace(os.path.join(directory, 'manifest.json.tmp'), os.path.join(directory, 'manifest.json'))
+
+
+def read_manifest(csv_path):
+    try:
+        with open(os.path.join(cache_dir(csv_path), 'manifest.json')) as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == CACHE_FORMAT else None
+
+
+def cache_is_fresh(manifest, csv_path):
+    # Unchanged size and mtime are trusted; otherwise the CSV's checksum decides
+    stat = os.stat(csv_path)
+    if manifest["size"] == stat.st_size and manifest["mtime"] == stat.st_mtime:
+        return True
+    return manifest["size"] == stat.st_size and manifest["checksum"] == file_checksum(csv_path)
+
+
+def read_cache(csv_path, manifest, mmap=True):
+    directory = cache_dir(csv_path)
+    mode = 'r' if mmap else None
+    columns = {}
+    for entry in manifest["columns"]:
+        data = np.load(os.path.join(directory, entry["file"]), mmap_mode=mode)
+        if entry["kind"] == "numeric":
+            columns[entry["name"]] = data
+        else:
+            # Text stays dictionary encoded; code -1 marks a missing value
+            uniques = np.load(os.path.join(directory, entry["values_file"])).astype(object)
+            columns[entry["name"]] = pd.Categorical.from_codes(data, categories=uniques)
+    return pd.DataFrame(columns)
+
+
+def load_table(csv_path):
+    # Returns (frame, checksum of the CSV). Reads the binary cache when it matches the CSV,
+    # otherwise parses the CSV and refreshes the cache for the next start.
+    manifest = read_manifest(csv_path)
+    if manifest is not None and cache_is_fresh(manifest, csv_path):
+        return read_cache(csv_path, manifest), manifest["checksum"]
+
+    frame = pd.read_csv(csv_path)
+    checksum = file_checksum(csv_path)
+    try:
+        write_cache(frame, csv_path, checksum)
+    except OSError:
+        pass  # Read-only deployments keep working from the CSV
+    return frame, checksum
+
+
+if __name__ == '__main__':
+    # python dataset_cache.py [file.csv ...] converts the CSVs (default: the 2024 season) to binary caches
+    paths = sys.argv[1:] or ['ipl_2024_matches.csv', 'ipl_2024_deliveries.csv']
+    for path in paths:
+        frame = pd.read_csv(path)
+        write_cache(frame, path, file_checksum(path))
+        print(f"{path}: {len(frame)} rows, {len(frame.columns)} columns -> {cache_dir(path)}")
@@ -0,0 +1,137 @@
+# Columns derived from each delivery once, when a season is loaded or deliveries are posted,
+# so every route counts legal balls, bowler runs, wickets and phases by the same rules.
+# python derived_columns.py [deliveries.csv ...] checks them on the given files (default: every season in the app directory)
+import os
+import sys
+import glob
+import numpy as np
+import pandas as pd
+
+# Dismissals credited to the bowler. Run outs (in either spelling), obstructing the field,
+# handled the ball, timed out and retirements are not.
+BOWLER_WICKET_TYPES = ['bowled', 'caught', 'caught and bowled', 'lbw', 'stumped', 'hit wicket']
+OTHER_WICKET_TYPES = ['runout', 'run out', 'obstructing the field', 'handled the ball', 'timed out', 'retired hurt', 'retired out']
+
+# Phase codes of the phase column and the first over (0-based) of each phase; -1 is past the 20th over
+PHASES = ['pp', 'middle', 'death']
+PHASE_FIRST_OVERS = [0, 6, 15]
+INNINGS_OVERS = 20
+
+# Name and dtype of every derived column, in the order they are added
+DERIVED_COLUMNS = {
+    'legal_ball': bool,        # Counts towards the over: neither a wide nor a no-ball
+    'ball_faced': bool,        # Counts as a ball faced by the striker: anything but a wide
+    'legal_ball_seq': np.int16,  # Legal balls of the innings so far, this one included
+    'over_no': np.int16,       # 0-based over, 3.4 -> 3
+    'ball_in_over': np.int8,   # Ball label within the over, 3.4 -> 4 (wides and no-balls repeat the next ball's)
+    'phase': np.int8,          # Index into PHASES
+    'total_runs': np.int16,    # Runs off the bat plus extras
+    'bowler_runs': np.int16,   # Runs charged to the bowler: off the bat, wides and the no-ball penalty
+    'is_bowler_wicket': bool,  # A dismissal credited to the bowler
+}
+
+
+def derived_columns(deliveries, previous=None):
+    # {column: array} of DERIVED_COLUMNS for deliveries, whose innings are contiguous and in ball
+    # order. previous is (match_no, innings, legal_ball_seq) of the delivery before the first one,
+    # so posted batches carry on the innings they extend.
+    match_nos = deliveries['match_no'].to_numpy()
+    innings = deliveries['innings'].to_numpy()
+    over = deliveries['over'].to_numpy(dtype=float)
+    runs_of_bat = deliveries['runs_of_bat'].to_numpy()
+    extras = deliveries['extras'].to_numpy()
+    wide = deliveries['wide'].to_numpy() == 1
+    noball = deliveries['noballs'].to_numpy() == 1
+
+    legal_ball = ~wide & ~noball
+    over_no = over.astype(int)
+
+    # Running count of legal balls restarted at every innings: the previous delivery goes first
+    # with its count standing in for its legal ball, then each row subtracts the total up to its
+    # innings' first row
+    previous = previous or (-1, -1, 0)
+    counts = np.r_[previous[2], legal_ball]
+    first = np.r_[True, (np.r_[previous[0], match_nos][1:] != np.r_[previous[0], match_nos][:-1]) |
+                        (np.r_[previous[1], innings][1:] != np.r_[previous[1], innings][:-1])]
+    cumulative = np.cumsum(counts)
+    start = np.maximum.accumulate(np.where(first, np.arange(len(counts)), 0))
+    legal_ball_seq = (cumulative - cumulative[start] + counts[start])[1:]
+
+    phase = np.searchsorted(PHASE_FIRST_OVERS, over_no, side='right') - 1
+    phase[over_no >= INNINGS_OVERS] = -1
+
+    columns = {
+        'legal_ball': legal_ball,
+        'ball_faced': ~wide,
+        'legal_ball_seq': legal_ball_seq,
+        'over_no': over_no,
+        'ball_in_over': np.rint((over - over_no) * 10),
+        'phase': phase,
+        'total_runs': runs_of_bat + extras,
+        'bowler_runs': runs_of_bat + extras * wide + noball,
+        'is_bowler_wicket': np.asarray(deliveries['wicket_type'].isin(BOWLER_WICKET_TYPES)),
+    }
+    return {name: np.asarray(columns[name]).astype(dtype) for name, dtype in DERIVED_COLUMNS.items()}
+
+
+def add_derived_columns(deliveries):
+    return deliveries.assign(**derived_columns(deliveries))
+
+
+def check_derived_columns(deliveries):
+    # Problems found by recomputing every derived column another way; an empty list when they agree
+    problems = []
+
+    def expect(name, expected):
+        actual = deliveries[name].to_numpy()
+        wrong = np.flatnonzero(actual != np.asarray(expected))
+        if len(wrong):
+            row = wrong[0]
+            problems.append(f"{name}: {len(wrong)} rows differ, first at row {row} (match {deliveries['match_no'].iat[row]}, "
+                            f"over {deliveries['over'].iat[row]}): {actual[row]} instead of {np.asarray(expected)[row]}")
+
+    missing = [name for name in DERIVED_COLUMNS if name not in deliveries]
+    if missing:
+        return [f"missing columns: {', '.join(missing)}"]
+    for name, dtype in DERIVED_COLUMNS.items():
+        if deliveries[name].dtype != np.dtype(dtype):
+            problems.append(f"{name}: dtype {deliveries[name].dtype} instead of {np.dtype(dtype)}")
+
+    # Overs as written, "3.4" -> over 3, ball 4 (split once per distinct over)
+    over_codes, overs = pd.factorize(deliveries['over'])
+    over_parts = pd.Series(overs).map('{:.1f}'.format).str.split('.', expand=True).astype(int).to_numpy()[over_codes]
+    over_parts = pd.DataFrame(over_parts, index=deliveries.index)
+    legal = (deliveries['wide'] == 0) & (deliveries['noballs'] == 0)
+    runs = deliveries['runs_of_bat'] + deliveries['extras']
+    # Byes and leg byes off a no-ball are everything but its one run penalty
+    byes = (deliveries['extras'] - deliveries['noballs']) * ((deliveries['byes'] > 0) | (deliveries['legbyes'] > 0))
+    wicket_types = deliveries['wicket_type'].dropna().astype(str)
+    unknown = sorted(set(wicket_types) - set(BOWLER_WICKET_TYPES) - set(OTHER_WICKET_TYPES))
+    if unknown:
+        problems.append(f"is_bowler_wicket: unknown dismissal types {unknown}")
+
+    expect('legal_ball', legal)
+    expect('ball_faced', deliveries['wide'] == 0)
+    expect('legal_ball_seq', legal.groupby([deliveries['match_no'], deliveries['innings']]).cumsum())
+    expect('over_no', over_parts[0])
+    expect('ball_in_over', over_parts[1])
+    expect('phase', pd.cut(over_parts[0], [-1, 5, 14, 19], labels=False).fillna(-1).astype(int))
+    expect('total_runs', runs)
+    expect('bowler_runs', runs - byes)
+    expect('is_bowler_wicket', deliveries['wicket_type'].isin(BOWLER_WICKET_TYPES) & deliveries['player_dismissed'].notna())
+    return problems
+
+
+if __name__ == '__main__':
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ipl_*_deliveries.csv')))
+    failed = False
+    for path in paths:
+        # In the order seasons are loaded: each match's deliveries together, ball order kept
+        deliveries = pd.read_csv(path).sort_values('match_no', kind='stable').reset_index(drop=True)
+        deliveries = add_derived_columns(deliveries)
+        problems = check_derived_columns(deliveries)
+        failed = failed or bool(problems)
+        print(f"{path}: {len(deliveries)} deliveries, " + ("consistent" if not problems else f"{len(problems)} problems"))
+        for problem in problems:
+            print(f"  {problem}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,40 @@
+# Writes the same export as GET /export to a file or stdout, reporting throughput on stderr.
+# python export.py [--season 2024|2023,2024|all] [--format ndjson|csv] [--table batting] [--views scorecard,fow] [--out FILE]
+import argparse
+import sys
+import time
+
+from werkzeug.exceptions import HTTPException
+
+from app import EXPORT_FORMATS, EXPORT_TABLES, MATCH_VIEWS, export_plan, export_header, export_chunks
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--season', help='season, comma separated seasons or "all" (default: the latest season)')
+    parser.add_argument('--format', default='ndjson', choices=list(EXPORT_FORMATS))
+    parser.add_argument('--table', choices=list(EXPORT_TABLES), help='table to write with --format csv')
+    parser.add_argument('--views', help=f'comma separated views for ndjson (default: {",".join(MATCH_VIEWS)})')
+    parser.add_argument('--out', help='output file (default: stdout)')
+    args = parser.parse_args()
+
+    try:
+        plan = export_plan(args.season, args.format, args.table, args.views)
+    except HTTPException as error:
+        parser.error(error.description)
+
+    start = time.perf_counter()
+    matches = written = 0
+    out = open(args.out, 'wb') if args.out else sys.stdout.buffer
+    try:
+        out.write(export_header(plan))
+        for chunk in export_chunks(plan):
+            out.write(chunk)
+            matches += 1
+            written += len(chunk)
+    finally:
+        if args.out:
+            out.close()
+    seconds = time.perf_counter() - start
+    print(f"{matches} matches from {len(plan['seasons'])} season(s) in {seconds:.2f} s: "
+          f"{matches / seconds:.1f} matches/s, {written / seconds / 2**20:.2f} MB/s", file=sys.stderr)
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# Rows allocated up front for a new store; capacity doubles whenever it runs out
+MIN_CAPACITY = 1024
+
+
+def create_store(frame):
+    # Columnar copy of frame with spare capacity for appends. Categorical columns are kept
+    # as int32 codes next to their dtype; every other column as a plain numpy array.
+    capacity = max(MIN_CAPACITY, 2 * len(frame))
+    columns = {}
+    lookups = {}  # One name -> code dict per dictionary, shared by the columns using it
+    for name in frame.columns:
+        values = frame[name]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            data = np.full(capacity, -1, dtype=np.int32)
+            data[:len(frame)] = values.cat.codes.to_numpy()
+            if values.dtype not in lookups:
+                lookups[values.dtype] = {value: code for code, value in enumerate(values.dtype.categories)}
+            columns[name] = {"dtype": values.dtype, "data": data, "lookup": lookups[values.dtype]}
+        else:
+            data = np.zeros(capacity, dtype=values.dtype)
+            data[:len(frame)] = values.to_numpy()
+            columns[name] = {"dtype": None, "data": data}
+    return {"rows": len(frame), "capacity": capacity, "columns": columns}
+
+
+def grow(store, rows):
+    # New arrays rather than resizing in place, so frames handed out earlier keep their memory
+    capacity = store["capacity"]
+    while capacity < store["rows"] + rows:
+        capacity *= 2
+    if capacity == store["capacity"]:
+        return
+    for column in store["columns"].values():
+        data = np.full(capacity, -1, dtype=column["data"].dtype) if column["dtype"] is not None else np.zeros(capacity, dtype=column["data"].dtype)
+        data[:store["rows"]] = column["data"][:store["rows"]]
+        column["data"] = data
+    store["capacity"] = capacity
+
+
+def extend_categories(store, batch):
+    # Names the store has not seen join their column's dictionary. Dictionaries stay sorted, so
+    # the existing codes are remapped into new arrays (rare: a debutant, a new match date).
+    groups = {}
+    for name, column in store["columns"].items():
+        if column["dtype"] is not None:
+            groups.setdefault(column["dtype"], []).append(name)
+
+    for dtype, names in groups.items():
+        lookup = store["columns"][names[0]]["lookup"]
+        new_names = {value for name in names for value in batch[name] if value is not None and value not in lookup}
+        if not new_names:
+            continue
+        updated = pd.CategoricalDtype(sorted(set(dtype.categories) | new_names))
+        remap = np.append(updated.categories.get_indexer(dtype.categories), -1).astype(np.int32)
+        lookup = {value: code for code, value in enumerate(updated.categories)}
+        for name in names:
+            column = store["columns"][name]
+            column.update(dtype=updated, data=remap[column["data"]], lookup=lookup)
+
+
+def append_rows(store, batch):
+    # batch: {column: list or array of the new rows' values}. Amortized O(rows appended).
+    rows = len(next(iter(batch.values())))
+    extend_categories(store, batch)
+    grow(store, rows)
+    start, stop = store["rows"], store["rows"] + rows
+    for name, column in store["columns"].items():
+        if column["dtype"] is not None:
+            column["data"][start:stop] = [column["lookup"].get(value, -1) for value in batch[name]]
+        else:
+            column["data"][start:stop] = np.asarray(batch[name], dtype=column["data"].dtype)
+    # Readers only look at rows below store["rows"], so the new rows appear all at once
+    store["rows"] = stop
+    return stop
+
+
+def store_frame(store, stop=None):
+    # DataFrame over the first stop rows (default: all of them)
+    stop = store["rows"] if stop is None else stop
+    return pd.DataFrame({
+        name: pd.Categorical.from_codes(column["data"][:stop], dtype=column["dtype"], validate=False)
+        if column["dtype"] is not None else column["data"][:stop]
+        for name, column in store["columns"].items()
+    }, copy=False)
+
+
+def store_records(store, rows):
+    # The given row positions as plain dicts, names decoded and missing names as None
+    records = {}
+    for name, column in store["columns"].items():
+        values = column["data"][rows]
+        if column["dtype"] is not None:
+            values = np.append(np.asarray(column["dtype"].categories, dtype=object), None)[values]
+        records[name] = values.tolist()
+    return [dict(zip(records, values)) for values in zip(*records.values())]
@@ -0,0 +1,132 @@
+import os
+import bisect
+import resource
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Upper bounds, in seconds, of the latency histogram buckets (the Prometheus "le" labels)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def create_metrics(enabled=True):
+    # Request and stage latency histograms plus in-flight and response counters. With
+    # enabled=False nothing is recorded and stage() costs one attribute lookup.
+    return {
+        "enabled": enabled,
+        "lock": threading.Lock(),
+        "requests": {},  # (route, method) -> histogram
+        "responses": {},  # (route, method, status) -> count
+        "stages": {},  # stage name -> histogram
+        "in_flight": 0,
+        "started": time.time(),
+    }
+
+
+def observe(metrics, histograms, key, seconds):
+    index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+    with metrics["lock"]:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = {"buckets": [0] * (len(LATENCY_BUCKETS) + 1), "sum": 0.0}
+        histogram["buckets"][index] += 1
+        histogram["sum"] += seconds
+
+
+def request_started(metrics):
+    with metrics["lock"]:
+        metrics["in_flight"] += 1
+
+
+def request_finished(metrics, route, method, status, seconds):
+    observe(metrics, metrics["requests"], (route, method), seconds)
+    key = (route, method, status)
+    with metrics["lock"]:
+        metrics["responses"][key] = metrics["responses"].get(key, 0) + 1
+
+
+def request_closed(metrics):
+    with metrics["lock"]:
+        metrics["in_flight"] -= 1
+
+
+@contextmanager
+def timed_stage(metrics, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(metrics, metrics["stages"], name, time.perf_counter() - start)
+
+
+def stage(metrics, name):
+    # with stage(metrics, 'overs.aggregate'): ... records the block's duration under that name
+    return timed_stage(metrics, name) if metrics["enabled"] else nullcontext()
+
+
+def resident_memory():
+    # Current resident set size in bytes from /proc where available, otherwise the peak
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def labels(**pairs):
+    return '{' + ','.join(f'{name}="{label_value(value)}"' for name, value in pairs.items()) + '}'
+
+
+def histogram_lines(name, histograms, label_names):
+    lines = []
+    for key, histogram in sorted(histograms.items()):
+        key = key if isinstance(key, tuple) else (key,)
+        base = dict(zip(label_names, key))
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), histogram["buckets"]):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{labels(**base, le=le)} {cumulative}')
+        lines.append(f'{name}_sum{labels(**base)} {histogram["sum"]:.9f}')
+        lines.append(f'{name}_count{labels(**base)} {cumulative}')
+    return lines
+
+
+def render_metrics(metrics, gauges=()):
+    # Prometheus text exposition format (version 0.0.4). gauges: extra (name, help, type, [(labels, value)]).
+    with metrics["lock"]:
+        requests = {key: {"buckets": list(value["buckets"]), "sum": value["sum"]} for key, value in metrics["requests"].items()}
+        stages = {key: {"buckets": list(value["buckets"]), "sum": value["sum"]} for key, value in metrics["stages"].items()}
+        responses = dict(metrics["responses"])
+        in_flight = metrics["in_flight"]
+
+    lines = [
+        '# HELP ipl_request_duration_seconds Time from the start of a request to its response, by route.',
+        '# TYPE ipl_request_duration_seconds histogram',
+        *histogram_lines('ipl_request_duration_seconds', requests, ['route', 'method']),
+        '# HELP ipl_responses_total Responses sent, by route and status.',
+        '# TYPE ipl_responses_total counter',
+        *[f'ipl_responses_total{labels(route=route, method=method, status=status)} {count}'
+          for (route, method, status), count in sorted(responses.items())],
+        '# HELP ipl_stage_duration_seconds Time spent in named stages inside handlers.',
+        '# TYPE ipl_stage_duration_seconds histogram',
+        *histogram_lines('ipl_stage_duration_seconds', stages, ['stage']),
+        '# HELP ipl_requests_in_flight Requests currently being handled.',
+        '# TYPE ipl_requests_in_flight gauge',
+        f'ipl_requests_in_flight {in_flight}',
+        '# HELP ipl_process_resident_memory_bytes Resident memory of this process.',
+        '# TYPE ipl_process_resident_memory_bytes gauge',
+        f'ipl_process_resident_memory_bytes {resident_memory()}',
+        '# HELP ipl_process_start_time_seconds Start time of the process since the Unix epoch.',
+        '# TYPE ipl_process_start_time_seconds gauge',
+        f'ipl_process_start_time_seconds {metrics["started"]:.3f}',
+    ]
+    for name, help_text, kind, samples in gauges:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines += [f'{name}{labels(**sample_labels) if sample_labels else ""} {value}' for sample_labels, value in samples]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,75 @@
+import gzip
+import time
+import numpy as np
+import pandas as pd
+
+# brotli is optional; without it responses are offered as gzip only
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as they are; compression would not pay for itself
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Preferred first when a client accepts several encodings equally
+ENCODINGS = ['br', 'gzip', 'identity']
+
+# Converters for the scalar types the frames hand out, looked up by exact type
+SCALAR_CONVERTERS = {
+    np.int64: int, np.int32: int, np.int16: int, np.int8: int,
+    np.uint64: int, np.uint32: int, np.uint16: int, np.uint8: int,
+    np.float64: float, np.float32: float,
+    np.bool_: bool,
+    pd.Timestamp: lambda value: value.isoformat(),
+}
+
+
+def json_default(value):
+    # Called by the JSON encoder for anything that is not a plain Python value
+    convert = SCALAR_CONVERTERS.get(type(value))
+    if convert is not None:
+        return convert(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if value is pd.NaT or value is pd.NA:
+        return None
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def frame_records(frame):
+    # Same rows as frame.to_dict(orient='records'), but every column is converted to
+    # Python values in one tolist() call instead of boxing each cell separately
+    columns = frame.columns.tolist()
+    return [dict(zip(columns, row)) for row in zip(*(frame[column].tolist() for column in columns))]
+
+
+def encode_body(body):
+    # {encoding: bytes} for a rendered body, plus the seconds spent compressing it
+    start = time.perf_counter()
+    bodies = {"identity": body}
+    if len(body) >= MIN_COMPRESS_BYTES:
+        bodies["gzip"] = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        if brotli is not None:
+            bodies["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return bodies, time.perf_counter() - start
+
+
+def choose_encoding(accept_encodings, bodies):
+    # Highest quality encoding the client accepts among those rendered; identity otherwise
+    best, best_quality = "identity", 0
+    for encoding in ENCODINGS:
+        if encoding in bodies and encoding != "identity":
+            quality = accept_encodings[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+    return best
+
+
+def encoding_tag(etag, encoding):
+    # Each encoding of a response is a different representation and gets its own tag
+    return etag if encoding == "identity" else f"{etag}-{encoding}"
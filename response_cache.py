@@ -0,0 +1,93 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def create_cache(max_bytes):
+    # Rendered responses keyed by (path, query, dataset version), least recently used first
+    return {
+        "entries": OrderedDict(),
+        "bytes": 0,
+        "max_bytes": max_bytes,
+        "lock": threading.Lock(),
+        "counters": {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0, "too_large": 0},
+        "routes": {},  # endpoint -> serialization and payload size totals
+    }
+
+
+def cache_key(path, args, version):
+    # Query parameters in a fixed order so ?a=1&b=2 and ?b=2&a=1 share an entry
+    return path, tuple(sorted(args)), version
+
+
+def entity_tag(key):
+    # The response for a key never changes, so the tag can be derived from the key alone
+    # and a conditional request is answered before anything is computed
+    return hashlib.sha1(repr(key).encode()).hexdigest()[:20]
+
+
+def count(cache, counter):
+    with cache["lock"]:
+        cache["counters"][counter] += 1
+
+
+def cache_get(cache, key):
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry is None:
+            cache["counters"]["misses"] += 1
+            return None
+        cache["entries"].move_to_end(key)
+        cache["counters"]["hits"] += 1
+        return entry
+
+
+def entry_size(entry):
+    return sum(len(body) for body in entry["bodies"].values())
+
+
+def cache_put(cache, key, entry):
+    # entry: {"bodies": {encoding: bytes}, ...}. Entries bigger than the whole cache are not kept.
+    size = entry_size(entry)
+    with cache["lock"]:
+        if size > cache["max_bytes"]:
+            cache["counters"]["too_large"] += 1
+            return
+        previous = cache["entries"].pop(key, None)
+        if previous is not None:
+            cache["bytes"] -= entry_size(previous)
+        cache["entries"][key] = entry
+        cache["bytes"] += size
+        while cache["bytes"] > cache["max_bytes"]:
+            _, evicted = cache["entries"].popitem(last=False)
+            cache["bytes"] -= entry_size(evicted)
+            cache["counters"]["evictions"] += 1
+
+
+def record_render(cache, endpoint, serialize_seconds, compress_seconds, bodies):
+    # Totals for one more response rendered by endpoint; sizes are those of the latest one
+    with cache["lock"]:
+        route = cache["routes"].setdefault(endpoint, {"renders": 0, "serialize_seconds": 0.0, "compress_seconds": 0.0})
+        route["renders"] += 1
+        route["serialize_seconds"] += serialize_seconds
+        route["compress_seconds"] += compress_seconds
+        route["bytes"] = {encoding: len(body) for encoding, body in bodies.items()}
+
+
+def cache_stats(cache):
+    with cache["lock"]:
+        return {
+            "entries": len(cache["entries"]),
+            "bytes": cache["bytes"],
+            "max_bytes": cache["max_bytes"],
+            **cache["counters"],
+            "routes": {
+                endpoint: {
+                    "renders": route["renders"],
+                    "serialize_ms": round(route["serialize_seconds"] / route["renders"] * 1000, 3),
+                    "compress_ms": round(route["compress_seconds"] / route["renders"] * 1000, 3),
+                    "bytes": route["bytes"],
+                }
+                for endpoint, route in cache["routes"].items()
+            },
+        }
@@ -0,0 +1,152 @@
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+# ipl_2024_matches.csv / ipl_2024_deliveries.csv
+SEASON_FILE = re.compile(r'^ipl_(\d{4})_(matches|deliveries)\.csv$')
+
+
+def discover_seasons(data_dir):
+    # {season: (matches_csv, deliveries_csv)} for every season with both files present
+    found = {}
+    for name in os.listdir(data_dir):
+        match = SEASON_FILE.match(name)
+        if match:
+            found.setdefault(int(match.group(1)), {})[match.group(2)] = os.path.join(data_dir, name)
+    return {season: (files["matches"], files["deliveries"]) for season, files in sorted(found.items()) if len(files) == 2}
+
+
+def bundle_memory(bundle):
+    # Bytes held by the frames of a loaded season; the smaller derived tables are not counted
+    total = 0
+    for value in bundle.values():
+        if isinstance(value, pd.DataFrame):
+            total += int(value.memory_usage(index=True, deep=True).sum())
+    return total
+
+
+def create_registry(data_dir, loader, memory_budget):
+    # loader(season, matches_csv, deliveries_csv) builds everything served for one season.
+    # Seasons are loaded on first access and the least recently used ones are dropped once
+    # the loaded seasons together exceed memory_budget bytes.
+    files = discover_seasons(data_dir)
+    if not files:
+        raise RuntimeError(f"No ipl_<season>_matches.csv / ipl_<season>_deliveries.csv pairs found in {data_dir}")
+    return {
+        "files": files,
+        "loader": loader,
+        "memory_budget": memory_budget,
+        "loaded": OrderedDict(),  # season -> (bundle, bytes), least recently used first
+        "pinned": set(),  # Seasons holding data that only lives in memory are never evicted
+        "generation": 0,  # Bumped whenever a loaded season is replaced
+        "lock": threading.RLock(),
+        "loading": {},  # season -> lock held while the season is being loaded
+        "counters": {"hits": 0, "loads": 0, "evictions": 0},
+    }
+
+
+def season_names(registry):
+    return list(registry["files"])
+
+
+def latest_season(registry):
+    return max(registry["files"])
+
+
+def registry_version(registry):
+    # Changes whenever a season file is rewritten or a loaded season is replaced
+    stats = [(season, os.stat(path).st_size, os.stat(path).st_mtime) for season, paths in registry["files"].items() for path in paths]
+    return hashlib.sha1(repr((stats, registry["generation"])).encode()).hexdigest()[:12]
+
+
+def evict(registry, keep):
+    # Drop cold seasons until the budget is met. The season just used and pinned seasons are kept.
+    loaded = registry["loaded"]
+    while sum(size for _, size in loaded.values()) > registry["memory_budget"]:
+        season = next((season for season in loaded if season != keep and season not in registry["pinned"]), None)
+        if season is None:
+            break
+        del loaded[season]
+        registry["counters"]["evictions"] += 1
+
+
+def cached_season(registry, season):
+    # The loaded season's bundle, counted as a use, or None
+    with registry["lock"]:
+        loaded = registry["loaded"]
+        if season not in loaded:
+            return None
+        loaded.move_to_end(season)
+        registry["counters"]["hits"] += 1
+        return loaded[season][0]
+
+
+def get_season(registry, season):
+    bundle = cached_season(registry, season)
+    if bundle is not None:
+        return bundle
+
+    # Loads run outside the registry lock so other seasons are served meanwhile. Callers
+    # asking for the same season wait on its loading lock and then find it loaded.
+    with registry["lock"]:
+        loading = registry["loading"].setdefault(season, threading.Lock())
+    with loading:
+        bundle = cached_season(registry, season)
+        if bundle is not None:
+            return bundle
+        matches_csv, deliveries_csv = registry["files"][season]
+        bundle = None
+        try:
+            bundle = registry["loader"](season, matches_csv, deliveries_csv)
+        finally:
+            # Published and the loading lock dropped together, so no caller starts a second load
+            with registry["lock"]:
+                registry["loading"].pop(season, None)
+                if bundle is not None:
+                    registry["loaded"][season] = (bundle, bundle_memory(bundle))
+                    registry["counters"]["loads"] += 1
+                    evict(registry, keep=season)
+        return bundle
+
+
+def loaded_season(registry, season):
+    # The season's bundle if it is loaded, else None; neither loads it nor counts as a use
+    with registry["lock"]:
+        entry = registry["loaded"].get(season)
+        return entry[0] if entry is not None else None
+
+
+def read_season(registry, season):
+    # Builds a season's bundle for a one-off pass over it without keeping it loaded, so the
+    # seasons being served are not evicted to make room
+    matches_csv, deliveries_csv = registry["files"][season]
+    return registry["loader"](season, matches_csv, deliveries_csv)
+
+
+def replace_season(registry, season, bundle):
+    # Swaps in a new bundle for a loaded season; requests already holding the old one keep it
+    with registry["lock"]:
+        registry["loaded"][season] = (bundle, bundle_memory(bundle))
+        registry["loaded"].move_to_end(season)
+        registry["generation"] += 1
+        evict(registry, keep=season)
+
+
+def pin_season(registry, season):
+    # Keeps a season loaded regardless of the memory budget
+    with registry["lock"]:
+        registry["pinned"].add(season)
+
+
+def registry_status(registry):
+    with registry["lock"]:
+        return {
+            "seasons": season_names(registry),
+            "loaded": {season: size for season, (_, size) in registry["loaded"].items()},
+            "pinned": sorted(registry["pinned"]),
+            "memory_budget": registry["memory_budget"],
+            **registry["counters"],
+        }
@@ -0,0 +1,258 @@
+import os
+import json
+import stat
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+
+# fcntl is POSIX only; without it concurrent workers may each build a season once
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Bump when the on-disk layout changes so old bundles are rebuilt
+SHARED_FORMAT = 2
+
+
+def default_shared_dir():
+    # tmpfs where the system has one, so the mapped pages are shared memory rather than disk
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'ipl-datasets')
+
+
+def private_dir(root):
+    # Creates root readable by this user only, or checks an existing one is. Bundles are only
+    # written to and read from a directory no other user can have planted files in.
+    try:
+        os.makedirs(root, mode=0o700, exist_ok=True)
+        info = os.lstat(root)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.geteuid() or info.st_mode & 0o022:
+        return False
+    if info.st_mode & 0o077:
+        # Ours and never writable by others (e.g. made by an older version): close it to them
+        os.chmod(root, 0o700)
+    return True
+
+
+def code_fingerprint(paths):
+    # Precomputed aggregates depend on the code that built them as much as on the data
+    sha1 = hashlib.sha1()
+    for path in sorted(paths):
+        with open(path, 'rb') as file:
+            sha1.update(file.read())
+    return sha1.hexdigest()[:12]
+
+
+# A bundle is a manifest.json plus one file per array or byte string. Values JSON has no type
+# for are written as {"<tag>": ...} objects: numeric arrays and frame columns as .npy files (read without pickle and
+# memory-mapped), bytes as raw files, everything else (dicts with non-string keys, tuples, numpy
+# scalars, categories) spelled out in the manifest.
+
+def save_array(writer, array):
+    file = f"array{len(writer['files'])}.npy"
+    writer["files"].append(file)
+    np.save(os.path.join(writer["directory"], file), np.ascontiguousarray(array), allow_pickle=False)
+    return file
+
+
+def save_bytes(writer, data):
+    file = f"bytes{len(writer['files'])}.bin"
+    writer["files"].append(file)
+    with open(os.path.join(writer["directory"], file), 'wb') as out:
+        out.write(data)
+    return file
+
+
+def encode_scalar(value):
+    # numpy scalars keep their dtype; dates and durations go as integer counts of their unit
+    if value.dtype.kind in 'Mm':
+        return {"scalar": value.dtype.str, "value": int(value.view('int64'))}
+    return {"scalar": value.dtype.str, "value": value.item()}
+
+
+def plain_json(value):
+    # Whether value is already JSON: scalars, lists and string-keyed dicts of them
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return not isinstance(value, np.generic)
+    if isinstance(value, list):
+        return all(plain_json(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and plain_json(item) for key, item in value.items())
+    return False
+
+
+def encode_value(writer, value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, dict)) and plain_json(value):
+        # Records and rendered payloads go in as they are and come back without a walk
+        return {"json": value}
+    if isinstance(value, list):
+        return [encode_value(writer, item) for item in value]
+    if isinstance(value, tuple):
+        return {"tuple": [encode_value(writer, item) for item in value]}
+    if isinstance(value, dict):
+        return {"dict": [[encode_value(writer, key), encode_value(writer, item)] for key, item in value.items()]}
+    if isinstance(value, bytes):
+        return {"bytes": save_bytes(writer, value)}
+    if isinstance(value, np.generic):
+        return encode_scalar(value)
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in 'biufcMm':
+            return {"array": save_array(writer, value)}
+        return {"items": [encode_value(writer, item) for item in value.tolist()], "dtype": value.dtype.str}
+    if isinstance(value, pd.Timestamp):
+        return {"timestamp": value.isoformat()}
+    if isinstance(value, pd.CategoricalDtype):
+        return {"categories": encode_value(writer, value.categories), "ordered": bool(value.ordered)}
+    if isinstance(value, pd.RangeIndex):
+        return {"range": [value.start, value.stop, value.step], "name": encode_value(writer, value.name)}
+    if isinstance(value, pd.Index):
+        return {"index": encode_value(writer, value.to_numpy()), "name": encode_value(writer, value.name)}
+    if isinstance(value, pd.DataFrame):
+        return {"frame": write_frame(writer, value)}
+    raise TypeError(f"{type(value).__name__} values cannot be shared")
+
+
+def decode_value(directory, value):
+    if isinstance(value, list):
+        return [decode_value(directory, item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "json" in value:
+        return value["json"]
+    if "tuple" in value:
+        return tuple(decode_value(directory, item) for item in value["tuple"])
+    if "dict" in value:
+        return {decode_value(directory, key): decode_value(directory, item) for key, item in value["dict"]}
+    if "bytes" in value:
+        with open(os.path.join(directory, value["bytes"]), 'rb') as data:
+            return data.read()
+    if "scalar" in value:
+        dtype = np.dtype(value["scalar"])
+        if dtype.kind in 'Mm':
+            return np.int64(value["value"]).view(dtype)
+        return dtype.type(value["value"])
+    if "array" in value:
+        # Read-only and shared between processes; np.load never unpickles here
+        return np.load(os.path.join(directory, value["array"]), mmap_mode='r')
+    if "items" in value:
+        items = decode_value(directory, value["items"])
+        array = np.empty(len(items), dtype=np.dtype(value["dtype"]))
+        array[:] = items
+        return array
+    if "timestamp" in value:
+        return pd.Timestamp(value["timestamp"])
+    if "categories" in value:
+        return pd.CategoricalDtype(decode_value(directory, value["categories"]), ordered=value["ordered"])
+    if "range" in value:
+        return pd.RangeIndex(*value["range"], name=decode_value(directory, value["name"]))
+    if "index" in value:
+        return pd.Index(decode_value(directory, value["index"]), name=decode_value(directory, value["name"]))
+    if "frame" in value:
+        return read_frame(directory, value["frame"])
+    raise ValueError(f"Unknown value in bundle manifest: {sorted(value)}")
+
+
+def write_frame(writer, frame):
+    # One .npy file per column; categorical columns are stored as their codes with the
+    # dtype kept in the manifest. Columns numpy cannot store flat go in the manifest instead.
+    columns = []
+    for column in frame.columns:
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            columns.append([column, "categorical", [save_array(writer, values.cat.codes.to_numpy()), encode_value(writer, values.dtype)]])
+        elif values.dtype != object and isinstance(values.dtype, np.dtype):
+            columns.append([column, "array", save_array(writer, values.to_numpy())])
+        else:
+            columns.append([column, "value", encode_value(writer, values.to_numpy())])
+    return {"index": encode_value(writer, frame.index), "columns": columns}
+
+
+def read_frame(directory, layout):
+    # Columns are memory-mapped read-only and wrapped without copying, so every process
+    # attached to the same bundle reads the same physical pages
+    columns = {}
+    for column, kind, payload in layout["columns"]:
+        if kind == "categorical":
+            file, dtype = payload
+            codes = np.load(os.path.join(directory, file), mmap_mode='r')
+            columns[column] = pd.Categorical.from_codes(codes, dtype=decode_value(directory, dtype), validate=False)
+        elif kind == "array":
+            columns[column] = np.load(os.path.join(directory, payload), mmap_mode='r')
+        else:
+            columns[column] = decode_value(directory, payload)
+    return pd.DataFrame(columns, index=decode_value(directory, layout["index"]), copy=False)
+
+
+def write_bundle(directory, bundle):
+    # The bundle goes into the manifest, its arrays and frame columns into files alongside it
+    os.makedirs(directory, mode=0o700)
+    writer = {"directory": directory, "files": []}
+    layout = encode_value(writer, bundle)
+    # The manifest is written last, so a half written bundle is never attached
+    with open(os.path.join(directory, 'manifest.json'), 'w') as file:
+        json.dump({"format": SHARED_FORMAT, "bundle": layout}, file)
+
+
+def read_bundle(directory):
+    # None when the bundle is missing, unfinished or of an older format
+    try:
+        with open(os.path.join(directory, 'manifest.json')) as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != SHARED_FORMAT:
+        return None
+    return decode_value(directory, manifest["bundle"])
+
+
+def remove_stale(root, name, keep):
+    # Bundles of older versions of the same dataset. Processes still mapping them keep
+    # their pages until they exit.
+    for entry in os.listdir(root):
+        if entry.startswith(name + '-') and entry != keep and not entry.endswith('.lock'):
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+
+
+def shared_bundle(root, name, key, build):
+    # Returns the bundle of dataset name at version key, attached from root. The first
+    # process to ask builds it with build() and publishes it; processes starting at the
+    # same time wait on a lock file and then attach instead of building their own copy.
+    # Falls back to the privately built bundle when root cannot be written or is not
+    # private to this user.
+    if not private_dir(root):
+        return build()
+    directory = os.path.join(root, f"{name}-{key}")
+    bundle = read_bundle(directory)
+    if bundle is not None:
+        return bundle
+
+    try:
+        lock = open(os.path.join(root, f"{name}.lock"), 'a')
+    except OSError:
+        return build()
+    with lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        bundle = read_bundle(directory)
+        if bundle is not None:
+            return bundle
+
+        built = build()
+        partial = f"{directory}.partial-{os.getpid()}"
+        try:
+            write_bundle(partial, built)
+            shutil.rmtree(directory, ignore_errors=True)  # An unfinished or outdated bundle
+            os.replace(partial, directory)
+        except (OSError, TypeError):
+            shutil.rmtree(partial, ignore_errors=True)
+            return built
+        remove_stale(root, name, keep=os.path.basename(directory))
+    # Attach to the published copy so the builder does not hold a private one as well
+    return read_bundle(directory)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+# Columns holding names of players, teams, venues and dismissal types
+MATCH_SYMBOL_COLUMNS = ['venue', 'team1', 'team2', 'toss_winner', 'winning_team', 'player_of_the_match']
+DELIVERY_SYMBOL_COLUMNS = ['venue', 'batting_team', 'bowling_team', 'striker', 'non_striker', 'bowler', 'wicket_type', 'player_dismissed', 'fielder']
+SQUAD_COLUMNS = ['team1_players', 'team2_players']
+
+# Placeholders the routes fill in for missing names
+EXTRA_SYMBOLS = ['', 'not out']
+
+
+def split_squad(players):
+    return players.split(", ") if isinstance(players, str) else []
+
+
+def column_values(column):
+    # Distinct non-missing values without decoding an already encoded column
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.categories
+    return column.dropna().unique()
+
+
+def parse_squads(matches):
+    # One row per (match_no, team, player) from the comma separated squad columns
+    rows = []
+    for squad_column, team_column in [('team1_players', 'team1'), ('team2_players', 'team2')]:
+        players = matches[squad_column].astype(object).map(split_squad)
+        squad = pd.DataFrame({'match_no': matches['match_no'], 'team': matches[team_column].astype(object), 'player': players, 'side': squad_column})
+        rows.append(squad.explode('player').dropna(subset=['player']))
+    return pd.concat(rows).sort_values(['match_no', 'side'], kind='stable').drop(columns='side').reset_index(drop=True)
+
+
+def build_symbol_table(matches, deliveries, squads):
+    # One sorted dictionary of every name, shared by all tables so codes compare across columns
+    names = set(EXTRA_SYMBOLS)
+    for column in MATCH_SYMBOL_COLUMNS:
+        names.update(column_values(matches[column]))
+    for column in DELIVERY_SYMBOL_COLUMNS:
+        names.update(column_values(deliveries[column]))
+    names.update(squads['team'].dropna())
+    names.update(squads['player'])
+    return pd.CategoricalDtype(sorted(names))
+
+
+def encode_frame(frame, symbol_columns, symbols):
+    # Name columns get the shared symbol codes; other text columns get their own sorted dictionary
+    frame = frame.copy()
+    for column in frame.columns:
+        values = frame[column]
+        if column in symbol_columns:
+            frame[column] = values.astype(symbols)
+        elif not pd.api.types.is_numeric_dtype(values) or isinstance(values.dtype, pd.CategoricalDtype):
+            frame[column] = values.astype(pd.CategoricalDtype(sorted(column_values(values))))
+    return frame
+
+
+def encode_dataset(matches, deliveries):
+    # Returns (matches, deliveries, squads, symbols) with every name stored as a small integer code
+    squads = parse_squads(matches)
+    symbols = build_symbol_table(matches, deliveries, squads)
+    matches = encode_frame(matches, MATCH_SYMBOL_COLUMNS, symbols)
+    deliveries = encode_frame(deliveries, DELIVERY_SYMBOL_COLUMNS, symbols)
+    squads['team'] = squads['team'].astype(symbols)
+    squads['player'] = squads['player'].astype(symbols)
+    return matches, deliveries, squads, symbols
+
+
+def symbol_codes(column):
+    # Symbol codes of an encoded column, -1 for missing values
+    return column.cat.codes.to_numpy()
+
+
+def decode_symbols(symbols, values):
+    # Symbol codes back to names for JSON output; -1 decodes to None
+    return np.append(np.asarray(symbols.categories, dtype=object), None).take(values)
+
+
+def lookup_symbols(symbols, names):
+    # Codes of the given names; names missing from the table are dropped so they never match
+    found = symbols.categories.get_indexer(names)
+    return found[found >= 0]
@@ -0,0 +1,58 @@
+# The derived delivery columns against an independent recomputation (check_derived_columns), on the
+# bundled seasons and on synthetic ones. Run from the repository root: python -m pytest tests
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from derived_columns import DERIVED_COLUMNS, add_derived_columns, check_derived_columns, derived_columns
+from synthetic import generate
+
+
+def load_deliveries(path):
+    # In the order seasons are loaded: each match's deliveries together, ball order kept
+    return pd.read_csv(path).sort_values('match_no', kind='stable').reset_index(drop=True)
+
+
+@pytest.fixture(scope='module')
+def synthetic_dir(tmp_path_factory):
+    data_dir = str(tmp_path_factory.mktemp('synthetic'))
+    generate(data_dir, seasons=2, first_season=2025, seed=0)
+    return data_dir
+
+
+@pytest.mark.parametrize('path', sorted(glob.glob(os.path.join(ROOT, 'ipl_*_deliveries.csv'))), ids=os.path.basename)
+def test_bundled_season(path):
+    assert check_derived_columns(add_derived_columns(load_deliveries(path))) == []
+
+
+def test_synthetic_seasons(synthetic_dir):
+    paths = sorted(glob.glob(os.path.join(synthetic_dir, 'ipl_*_deliveries.csv')))
+    assert len(paths) == 2
+    for path in paths:
+        assert check_derived_columns(add_derived_columns(load_deliveries(path))) == [], path
+
+
+def test_posted_batches_continue_the_innings():
+    # Deliveries derived in batches, each carrying on from the last row before it, match the whole season
+    deliveries = load_deliveries(os.path.join(ROOT, 'ipl_2024_deliveries.csv'))
+    whole = derived_columns(deliveries)
+    parts, previous = [], None
+    for start in range(0, len(deliveries), 997):
+        batch = deliveries.iloc[start:start + 997]
+        part = derived_columns(batch, previous)
+        parts.append(part)
+        previous = (int(batch['match_no'].iat[-1]), int(batch['innings'].iat[-1]), int(part['legal_ball_seq'][-1]))
+    for name in DERIVED_COLUMNS:
+        assert np.array_equal(np.concatenate([part[name] for part in parts]), whole[name]), name
+
+
+def test_check_reports_problems():
+    deliveries = add_derived_columns(load_deliveries(os.path.join(ROOT, 'ipl_2024_deliveries.csv')))
+    broken = deliveries.assign(bowler_runs=deliveries['bowler_runs'] + (deliveries.index == 10))
+    assert any(problem.startswith('bowler_runs: 1 rows differ') for problem in check_derived_columns(broken))
+    unknown = deliveries.assign(wicket_type=deliveries['wicket_type'].where(deliveries.index != 5, 'timed in'))
+    assert any('unknown dismissal types' in problem for problem in check_derived_columns(unknown))